@@ -0,0 +1,205 @@
+"""Import benchmark for synthetic dictionaries of increasing size.
+
+For each size a synthetic submission is generated (see
+`dictionaria.lib.synthetic`) and imported into a fresh data base, timing
+
+ - reading the submission (`Submission.from_cldfbench`) and parsing its
+   CLDF tables (`Submission.read_records`),
+ - `Submission.add_to_database` including the final commit,
+ - `prime_cache`.
+
+    python benchmarks/import_scaling.py postgresql://postgres@/dictionaria_bench
+
+With `--dictionaries N`, N dictionaries of each size are imported.  With
+`--load-processes P`, they are loaded by P worker processes at the same time
+(see `dictionaria.scripts.initializedb.load_submissions`).
+
+Note: The data base is dropped and re-created for every size!
+
+With `--dry-run`, no data base is needed: `add_to_database` only creates the
+objects (see `dictionaria.lib.cldf.dry_run_submission`), so this measures the
+Python side of the import on its own.
+
+    python benchmarks/import_scaling.py --dry-run
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import transaction
+from clld.cliutil import SessionContext
+from clld.db.meta import DBSession
+from clldutils.db import FreshDB
+
+from dictionaria.lib.cldf import Submission, dry_run_submission
+from dictionaria.lib.synthetic import CONCEPTICON_IDS, SyntheticDictionary
+from dictionaria.models import ComparisonMeaning
+from dictionaria.scripts import initializedb
+
+SIZES = [10000, 100000, 500000]
+
+
+class Timer:
+    """Collect timings of the steps of an import."""
+
+    def __init__(self):
+        """Initialise timer."""
+        self.timings = {}
+
+    def step(self, name, func, *args, **kwargs):
+        """Run `func` and record the time it took."""
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.timings[name] = time.perf_counter() - start
+        return result
+
+
+def add_dictionaries(submissions):
+    """Add the dictionaries and everything they depend on to the data base.
+
+    Return dictionaries, languages and comparison meanings.
+    """
+    comparison_meanings = {
+        str(cid): ComparisonMeaning(id=str(cid), name=f'concept {cid}')
+        for cid in CONCEPTICON_IDS}
+    DBSession.add_all(comparison_meanings.values())
+    languages = initializedb.make_languages(submissions)
+    DBSession.add_all(languages.values())
+    contributors, dictionary_authors = initializedb.make_contributors(
+        submissions)
+    DBSession.add_all(contributors.values())
+    DBSession.flush()
+    dictionaries = initializedb.make_dictionaries(
+        submissions, {sid: {} for sid in submissions}, languages)
+    DBSession.add_all(dictionaries.values())
+    DBSession.flush()
+    DBSession.add_all(initializedb.iter_dictionary_authors(
+        dictionary_authors, contributors, dictionaries))
+    return dictionaries, languages, comparison_meanings
+
+
+def load_submissions(
+    db_url, submissions, loader, fts, chunk_size, load_processes=1,
+):
+    """Load submissions like `initializedb.load_dictionaries` does."""
+    with transaction.manager:
+        dictionaries, languages, comparison_meanings = add_dictionaries(
+            submissions)
+        if fts == 'deferred':
+            initializedb.create_fts_staging()
+        if load_processes <= 1:
+            for submission in submissions.values():
+                submission.add_to_database(
+                    dictionaries[submission.id],
+                    languages[submission.glottocode],
+                    comparison_meanings,
+                    loader=loader,
+                    fts=fts,
+                    chunk_size=chunk_size)
+    if load_processes > 1:
+        errors = initializedb.load_submissions(
+            submissions, db_url, load_processes, loader=loader, fts=fts,
+            chunk_size=chunk_size)
+        if errors:
+            raise next(iter(errors.values()))
+    if fts == 'deferred':
+        with transaction.manager:
+            initializedb.update_fts()
+            initializedb.drop_fts_staging()
+
+
+def run(
+    db_url, data_dir, size, loader, fts, chunk_size, dry_run=False,
+    reader='csvw', dictionaries=1, load_processes=1,
+):
+    """Import `dictionaries` synthetic dictionaries with `size` entries each."""
+    sids = [
+        f'synthetic{size}' if number == 1 else f'synthetic{size}-{number}'
+        for number in range(1, dictionaries + 1)]
+    for seed, sid in enumerate(sids, 1):
+        submission_dir = data_dir / sid
+        if not submission_dir.exists():
+            print(f'generating {sid} ...')
+            SyntheticDictionary(
+                sid=sid, entries=size, seed=seed).write(submission_dir)
+
+    timer = Timer()
+    submissions = timer.step('from_cldfbench', lambda: {
+        sid: Submission.from_cldfbench(sid, data_dir / sid) for sid in sids})
+    timer.step('read_records', lambda: [
+        submission.read_records(reader=reader)
+        for submission in submissions.values()])
+    if dry_run:
+        timer.step('dry_run', lambda: [
+            dry_run_submission(submission, fts=fts, chunk_size=chunk_size)
+            for submission in submissions.values()])
+        return timer.timings
+
+    with FreshDB(db_url), SessionContext(db_url):
+        timer.step(
+            'add_to_database', load_submissions, db_url, submissions,
+            loader, fts, chunk_size, load_processes)
+        with transaction.manager:
+            timer.step(
+                'prime_cache', initializedb.prime_cache, argparse.Namespace())
+    return timer.timings
+
+
+def main(argv=None):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        'db_url', nargs='?', help='URL of a (throw-away) data base')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--loader', choices=['orm', 'copy'], default='orm')
+    parser.add_argument(
+        '--fts', choices=['insert', 'deferred'], default='insert')
+    parser.add_argument(
+        '--chunk-size', type=int, default=None,
+        help='write the dictionary in chunks of this many objects')
+    parser.add_argument(
+        '--reader', choices=['csvw', 'arrow'], default='csvw',
+        help='how to read the csv files of the submission')
+    parser.add_argument(
+        '--dictionaries', type=int, default=1,
+        help='number of dictionaries of each size')
+    parser.add_argument(
+        '--load-processes', type=int, default=1,
+        help='number of worker processes loading the dictionaries')
+    parser.add_argument(
+        '--dry-run', action='store_true', default=False,
+        help='only create the objects, without a data base')
+    parser.add_argument(
+        '--data-dir', type=Path, default=None,
+        help='directory to keep the generated submissions in')
+    parser.add_argument(
+        '--report', type=Path, default=None,
+        help='JSON file to write the timings to')
+    args = parser.parse_args(argv)
+    if not (args.db_url or args.dry_run):
+        parser.error('a data base URL is required unless --dry-run is given')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = args.data_dir or Path(tmp)
+        results = {}
+        for size in args.sizes:
+            results[size] = run(
+                args.db_url, data_dir, size, args.loader, args.fts,
+                args.chunk_size, args.dry_run, args.reader,
+                args.dictionaries, args.load_processes)
+            print(f'{size:>8} entries: ' + ', '.join(
+                f'{step} {seconds:.1f}s'
+                for step, seconds in results[size].items()))
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Micro-benchmark for mapping CLDF rows to labelled records.
+
+Writes a synthetic SenseTable and compares the throughput of mapping every
+cell through `ColumnNameMap.map` (the old `read_table`) to the compiled
+per-table labels used by `read_table` now.  If `pyarrow` is installed, the
+columnar reader from `dictionaria.lib.columnar` is timed, too.
+
+    python benchmarks/read_table.py [ROWS]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pycldf import Dictionary
+
+from dictionaria.lib import columnar
+from dictionaria.lib.cldf import ColumnNameMap, read_table
+
+ROWS = 200000
+
+
+def make_dataset(path, rows):
+    """Write a dictionary with `rows` senses to `path`."""
+    ds = Dictionary.in_dir(path)
+    ds.add_columns(
+        'SenseTable',
+        'alt_translation1', 'Semantic_Domain', 'Comparison_Meaning',
+        {'name': 'Synonym', 'separator': ' ; '},
+        'Scientific_Name')
+    ds.write(
+        EntryTable=[
+            dict(ID=f'e{i}', Language_ID='abcd1234', Headword=f'word{i}')
+            for i in range(rows)],
+        SenseTable=[
+            dict(
+                ID=f's{i}',
+                Entry_ID=f'e{i}',
+                Description=f'meaning {i}',
+                alt_translation1=f'significado {i}',
+                Semantic_Domain='body' if i % 2 else '',
+                Comparison_Meaning='HAND [1277]' if i % 3 == 0 else '',
+                Synonym=[f'e{i - 1}'] if i % 13 == 0 else [],
+                Scientific_Name='')
+            for i in range(rows)])
+    return ds
+
+
+def map_per_cell(colmap, rows):
+    """Map rows the way `read_table` used to."""
+    return [
+        {
+            colmap.map(colname): cell
+            for colname, cell in row.items()
+            if cell != [] and cell != '' and cell is not None}
+        for row in rows]
+
+
+def map_compiled(colmap, rows):
+    """Map rows the way `read_table` does now (minus reading the csv)."""
+    colnames, row_labels = (), ()
+    result = []
+    for row in rows:
+        if tuple(row) != colnames:
+            colnames = tuple(row)
+            row_labels = colmap.compile(colnames)
+        result.append({
+            label: cell
+            for label, cell in zip(row_labels, row.values())
+            if cell is not None and cell != '' and cell != []})
+    return result
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f'{label:<24} {elapsed:7.2f}s {len(result) / elapsed:12,.0f} rows/s')
+    return result
+
+
+def main(rows=ROWS):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f'writing {rows} senses ...')
+        ds = make_dataset(Path(tmp), rows)
+        table = ds['SenseTable']
+        csv_rows = timed('reading csv', list, table)
+        colmap = ColumnNameMap(table, {})
+
+        old = timed('mapping per cell', map_per_cell, colmap, csv_rows)
+        new = timed('mapping compiled', map_compiled, colmap, csv_rows)
+        assert old == new
+        records = timed(
+            'read_table (total)', list, read_table(ds, 'SenseTable', {}))
+        if columnar.pyarrow is not None:
+            assert records == timed(
+                'read_table_columnar',
+                list, columnar.read_table_columnar(ds, 'SenseTable', {}))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,101 @@
+"""Memory benchmark for the records holding parsed CLDF rows.
+
+Compares the peak RSS of holding synthetic sense records as pairs of dicts
+(the old `CldfRecord`) to the shared-schema records used now.  Each variant
+runs in a fresh interpreter, so the numbers don't influence each other.
+
+    python benchmarks/record_memory.py [ROWS]
+"""
+
+import resource
+import subprocess
+import sys
+from collections import namedtuple
+
+from dictionaria.lib.cldf import make_cldf_records
+
+ROWS = 500000
+
+STANDARD_FIELDS = {
+    'id',
+    'description',
+    'entryReference',
+    'alt_translation1',
+    'alt_translation2',
+    'mediaReference',
+    'source',
+    'Semantic_Domain',
+}
+
+DictRecord = namedtuple('DictRecord', 'std free')
+
+
+def make_dict_record(csv_row, standard_fields, custom_order):
+    """Return a record the way `make_cldf_record` used to."""
+    std = {k: v for k, v in csv_row.items() if k in standard_fields}
+    free_fields = {}
+    free_fields.update((k, True) for k in (custom_order or ()))
+    free_fields.update(
+        (k, True)
+        for k in csv_row
+        if k not in standard_fields and k not in free_fields)
+    free = {k: csv_row[k] for k in free_fields if k in csv_row}
+    return DictRecord(std, free)
+
+
+def csv_rows(rows):
+    """Generate sense rows similar to those returned by `read_table`."""
+    for i in range(rows):
+        row = {
+            'id': f's{i}',
+            'entryReference': f'e{i // 2}',
+            'description': f'meaning {i}',
+            'alt_translation1': f'significado {i}',
+        }
+        if i % 2:
+            row['Semantic_Domain'] = 'body'
+        if i % 3 == 0:
+            row['Comparison_Meaning'] = 'HAND [1277]'
+        if i % 5 == 0:
+            row['Scientific_Name'] = f'Species {i}'
+        row['Usage'] = f'usage note {i}'
+        yield row
+
+
+def peak_rss(variant, rows):
+    """Build records of one variant and return peak RSS in MiB."""
+    if variant == 'dicts':
+        records = [
+            make_dict_record(row, STANDARD_FIELDS, None)
+            for row in csv_rows(rows)]
+    else:
+        records = list(
+            make_cldf_records(csv_rows(rows), STANDARD_FIELDS, None))
+    assert len(records) == rows
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(rows=ROWS):
+    baseline = None
+    for variant in ('empty', 'dicts', 'schema'):
+        result = subprocess.run(
+            [
+                sys.executable, __file__,
+                str(0 if variant == 'empty' else rows), variant],
+            check=True, capture_output=True, text=True)
+        rss = float(result.stdout)
+        if baseline is None:
+            baseline = rss
+            print(f'{"interpreter":<12} {rss:8.1f} MiB')
+        else:
+            print(
+                f'{variant:<12} {rss:8.1f} MiB'
+                f'  ({rss - baseline:.1f} MiB for {rows} records)')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2:
+        print(peak_rss(sys.argv[2], int(sys.argv[1])))
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS)
@@ -0,0 +1,171 @@
+"""Reading submissions straight from their zip archives.
+
+Submissions released on Zenodo come as zip archives.  Rather than extracting
+them, all files needed for the import (the CLDF metadata and tables,
+`etc/md.json`, `etc/cdstar.json`, `raw/intro.md`) are read from the archive
+as streams.
+
+The archive usually wraps the submission in a single folder (named after the
+release).  Names of files are given relative to that folder, e.g.
+`cldf/entries.csv`.
+"""
+
+import hashlib
+import io
+import json
+import posixpath
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from csvw.metadata import TableGroup
+from pycldf import Dataset, Sources
+from pycldf.module import get_module_impl
+from pycldf.terms import URL as CLDF_URL
+
+
+def is_archive(path):
+    """Return true iff. `path` is a zip archive (rather than a directory)."""
+    return Path(path).suffix == '.zip' and zipfile.is_zipfile(path)
+
+
+def find_root(names):
+    """Return the (outermost) folder in an archive containing a `cldf` folder."""
+    roots = {
+        ''.join(f'{part}/' for part in parts[:parts.index('cldf')])
+        for parts in (name.split('/') for name in names)
+        if 'cldf' in parts[:-1]}
+    if not roots:
+        raise ValueError('archive does not contain a cldf folder')
+    return min(roots, key=lambda root: (root.count('/'), root))
+
+
+class ArchiveFile(io.TextIOWrapper):
+    """Text stream of a file in an archive.
+
+    csvw's `Table.iterdicts` reads file-like objects, but also checks whether
+    there is a file at the `pathlib.Path` of its argument.  So the stream
+    gets a path, which can't exist on disk.
+    """
+
+    def __init__(self, buffer, path):
+        super().__init__(buffer, encoding='utf-8-sig', newline='')
+        self.path = path
+
+    def __fspath__(self):
+        return str(self.path)
+
+
+class SubmissionArchive:
+    """A submission in a zip archive.
+
+    Only the names of the files in the archive are read up front.  Each file
+    is read from the archive when it is opened.
+    """
+
+    def __init__(self, path):
+        """Read the list of files from the archive at `path`."""
+        self.path = Path(path)
+        with zipfile.ZipFile(self.path) as zipf:
+            names = [name for name in zipf.namelist() if not name.endswith('/')]
+        self.root = find_root(names)
+        self.names = {
+            name[len(self.root):] for name in names if name.startswith(self.root)}
+
+    def exists(self, name):
+        """Return true iff. the file `name` is in the archive."""
+        return name in self.names
+
+    def files(self, folder):
+        """Return the names of all files in a folder (and its subfolders)."""
+        return sorted(
+            (name for name in self.names if name.startswith(f'{folder}/')),
+            key=lambda name: name.split('/'))
+
+    @contextmanager
+    def open(self, name):
+        """Open the file `name` in the archive for reading in binary mode."""
+        with zipfile.ZipFile(self.path) as zipf, zipf.open(self.root + name) as f:
+            yield f
+
+    def read_text(self, name):
+        """Return the contents of a text file or `None` if there is none."""
+        if not self.exists(name):
+            return None
+        with self.open(name) as f:
+            return io.TextIOWrapper(f, encoding='utf-8').read()
+
+    def checksum(self, names):
+        """Return a checksum over the names and contents of some files.
+
+        This is the same as the checksum `dictionaria.lib.cldf.files_checksum`
+        computes for the extracted files.
+        """
+        checksum = hashlib.sha256()
+        for name in names:
+            checksum.update(name.encode('utf-8'))
+            if self.exists(name):
+                checksum.update(b'\x00')
+                with self.open(name) as f:
+                    for chunk in iter(lambda: f.read(2 ** 20), b''):
+                        checksum.update(chunk)
+            else:
+                checksum.update(b'\x01')
+        return checksum.hexdigest()
+
+    def member(self, path):
+        """Return the name of a file from its path within the archive.
+
+        Paths within the archive are what pycldf makes of the file names in
+        the CLDF metadata: they start with the path of the archive itself.
+        """
+        return posixpath.normpath(
+            Path(path).relative_to(self.path / self.root).as_posix())
+
+    def iter_datasets(self, folder='cldf'):
+        """Return the CLDF data sets described by JSON files in `folder`.
+
+        Like `pycldf.iter_datasets`, but only files ending in `.json` are
+        considered.
+        """
+        for name in self.files(folder):
+            if not name.endswith('.json'):
+                continue
+            try:
+                metadata = json.loads(self.read_text(name))
+            except ValueError:
+                continue
+            if not (isinstance(metadata, dict) and str(
+                    metadata.get('dc:conformsTo', '')).startswith(CLDF_URL)):
+                continue
+            tablegroup = TableGroup.from_file(
+                self.path / self.root / name, data=metadata)
+            dataset = (get_module_impl(Dataset, tablegroup) or Dataset)(tablegroup)
+            sources = Sources()
+            bibtex = self.read_text(self.member(dataset.bibpath))
+            if bibtex:
+                sources.add(bibtex)
+            dataset.sources = sources
+            yield dataset
+
+    def table_path(self, table):
+        """Return the path of a table's csv file within the archive."""
+        return Path(table.base) / table.url.string
+
+    def has_table(self, table):
+        """Return true iff. the csv file of a table is in the archive."""
+        return self.exists(self.member(self.table_path(table)))
+
+    @contextmanager
+    def open_table(self, table, binary=False):
+        """Open the csv file of a table.
+
+        Text streams can be passed to csvw's `Table.iterdicts` as `fname`.
+        """
+        path = self.table_path(table)
+        with self.open(self.member(path)) as f:
+            if binary:
+                yield f
+            else:
+                with ArchiveFile(f, path) as text:
+                    yield text
@@ -0,0 +1,209 @@
+"""Bulk loading of data base objects using PostgreSQL's `COPY`.
+
+The ORM keeps track of every object added to the session, which is way more
+than we need for the hundreds of thousands of association objects (data
+points, cross-references, etc.) created by a large dictionary.  The functions
+in here take the very same (transient) ORM objects and stream their column
+values directly into the tables instead.
+"""
+
+import io
+from collections import defaultdict
+from itertools import groupby
+
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.sql import functions
+from sqlalchemy.types import TypeDecorator
+
+from clld.db.meta import DBSession
+
+COPY_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\n': '\\n',
+    '\r': '\\r',
+    '\t': '\\t',
+})
+
+
+def copy_value(value):
+    """Format a Python value for the text format of `COPY`."""
+    if value is None:
+        return '\\N'
+    elif value is True:
+        return 't'
+    elif value is False:
+        return 'f'
+    else:
+        return str(value).translate(COPY_ESCAPES)
+
+
+class LineReader(io.TextIOBase):
+    """Read-only file object serving lines from an iterator.
+
+    psycopg2 pulls the data for `COPY ... FROM STDIN` out of a file object,
+    so this lets us stream rows into the data base without ever holding all
+    of them in memory.
+    """
+
+    def __init__(self, lines):
+        """Initialise reader with an iterator of newline-terminated strings."""
+        self._lines = iter(lines)
+        self._buffer = ''
+
+    def readable(self):
+        """Confirm that this is, in fact, a file one can read from."""
+        return True
+
+    def read(self, size=-1):
+        """Return up to `size` characters (or everything, if `size` < 0)."""
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+        data = ''.join(chunks)
+        if size < 0:
+            self._buffer = ''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def reserve_pks(table, count, session=DBSession):
+    """Return `count` fresh primary keys from the sequence of `table`."""
+    if count <= 0:
+        return []
+    return [
+        row[0]
+        for row in session.execute(
+            text(
+                'SELECT nextval(pg_get_serial_sequence(:table, \'pk\')) '
+                'FROM generate_series(1, :count)'),
+            {'table': table.name, 'count': count})]
+
+
+class FakePks:
+    """Stand-in for `reserve_pks` making up primary keys without a data base.
+
+    Keys simply count up from 1 for each table.  Meant for dry runs of the
+    import.
+    """
+
+    def __init__(self):
+        """Initialise counters."""
+        self.last_pks = defaultdict(int)
+
+    def __call__(self, table, count, session=None):
+        """Return `count` fresh primary keys for `table`."""
+        first = self.last_pks[table.name] + 1
+        self.last_pks[table.name] += max(count, 0)
+        return list(range(first, first + count))
+
+
+def assign_pks(objects, session=DBSession, reserve=reserve_pks):
+    """Give transient ORM objects primary keys from their table's sequence.
+
+    This way other objects can refer to them before they are flushed, so
+    everything can be added to the session (or copied) in one go.  `reserve`
+    hands out the keys (see `reserve_pks` and `FakePks`).
+    """
+    for model, group in groupby(objects, type):
+        group = list(group)
+        table = inspect(model).base_mapper.local_table
+        for obj, pk in zip(group, reserve(table, len(group), session)):
+            obj.pk = pk
+
+
+def _column_getters(mapper, columns, dialect, now):
+    """Return one function per column extracting its value from an object.
+
+    Column defaults other than constants and `func.now()` (i.e. the time
+    `now` of the transaction) are only computed by the data base driver, so
+    objects with such columns can't be copied.
+    """
+    def getter(column):
+        prop = mapper.get_property_by_column(column)
+        default = column.default
+        if default is None:
+            fallback = None
+        elif default.is_scalar:
+            fallback = default.arg
+        elif default.is_clause_element and isinstance(default.arg, functions.now):
+            fallback = now
+        else:
+            raise ValueError(
+                f'cannot copy default of {column.table.name}.{column.name}: '
+                f'{default.arg!r}')
+        if column is mapper.polymorphic_on:
+            fallback = mapper.polymorphic_identity
+        bind = (
+            column.type.process_bind_param
+            if isinstance(column.type, TypeDecorator)
+            else None)
+
+        def get(obj):
+            value = getattr(obj, prop.key)
+            if value is None:
+                value = fallback
+            if bind:
+                value = bind(value, dialect)
+            return value
+        return get
+
+    return [getter(column) for column in columns]
+
+
+def _copy_table(cursor, mapper, table, columns, objects, dialect, now):
+    getters = _column_getters(mapper, columns, dialect, now)
+    lines = (
+        '\t'.join(copy_value(get(obj)) for get in getters) + '\n'
+        for obj in objects)
+    cursor.copy_expert(
+        'COPY {} ({}) FROM STDIN'.format(
+            table.name, ', '.join(c.name for c in columns)),
+        LineReader(lines))
+
+
+def copy_objects(objects, session=DBSession):
+    """Write transient ORM objects to the data base using `COPY`.
+
+    The objects are *not* added to the session, i.e. they don't get primary
+    keys and the ORM won't know about them.  Thus, this is meant for objects
+    nobody needs to refer to later on.
+
+    Consecutive objects of the same class are sent using a single `COPY`
+    statement per table.  For classes using joined table inheritance (e.g.
+    `Counterpart`) primary keys are reserved up front, so the rows in the
+    base table and the derived table can be matched up.
+
+    The session is flushed first, since the copied rows may refer to objects
+    which are still pending.
+    """
+    session.flush()
+    connection = session.connection()
+    dialect = connection.dialect
+    now = session.execute(select(func.now())).scalar()
+    cursor = connection.connection.cursor()
+    try:
+        for model, group in groupby(objects, type):
+            mapper = inspect(model)
+            tables = [m.local_table for m in reversed(list(mapper.iterate_to_root()))]
+            if len(tables) == 1:
+                # leave the primary key to the table's sequence
+                table = tables[0]
+                columns = [c for c in table.columns if not c.primary_key]
+                _copy_table(
+                    cursor, mapper, table, columns, group, dialect, now)
+            else:
+                group = list(group)
+                for obj, pk in zip(group, reserve_pks(tables[0], len(group), session)):
+                    obj.pk = pk
+                for table in tables:
+                    _copy_table(
+                        cursor, mapper, table, list(table.columns), group,
+                        dialect, now)
+    finally:
+        cursor.close()
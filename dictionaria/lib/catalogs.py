@@ -0,0 +1,190 @@
+"""Cached snapshots of the reference catalogs used by the import.
+
+Reading the full Concepticon and Glottolog clones takes a good while, even
+though the import only needs a tiny part of them.  So the relevant data is
+stored in small JSON files, named after the git commit of the clone it was
+read from.  As long as the clone stays at the same commit, the catalog itself
+is never touched.
+"""
+
+import itertools
+import json
+from collections import namedtuple
+
+import git
+from clld.cliutil import add_language_codes
+from clld.db.meta import DBSession
+from clld.db.models.common import Identifier, IdentifierType
+from clld.web.icon import ORDERED_ICONS
+from clld_glottologfamily_plugin.models import Family
+from clld_glottologfamily_plugin.util import ISOLATES_ICON
+
+ConceptSet = namedtuple('ConceptSet', 'id gloss definition')
+ConceptSet.__doc__ = """The parts of a Concepticon concept set used for
+comparison meanings."""
+
+Languoid = namedtuple(
+    'Languoid',
+    'id iso name latitude longitude macroarea family_id family_name')
+Languoid.__doc__ = """The parts of a Glottolog languoid used for languages.
+
+family_id and family_name are `None` for isolates.
+"""
+
+
+def repo_commit(path):
+    """Return the commit a git clone is at or `None` if it's not a clone."""
+    try:
+        return git.Repo(path).head.commit.hexsha
+    except (git.InvalidGitRepositoryError, git.NoSuchPathError, ValueError):
+        return None
+
+
+def snapshot_path(cache_dir, catalog, commit):
+    """Return path of the snapshot of a catalog at a specific commit."""
+    return cache_dir / f'{catalog}-{commit}.json'
+
+
+def load_snapshot(cache_dir, catalog, commit):
+    """Return data from a catalog snapshot or `None` if there is none."""
+    if not commit:
+        return None
+    path = snapshot_path(cache_dir, catalog, commit)
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_snapshot(cache_dir, catalog, commit, data):
+    """Write data to a catalog snapshot, replacing snapshots of old commits."""
+    if not commit:
+        return
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_path(cache_dir, catalog, commit)
+    for old_path in cache_dir.glob(f'{catalog}-*.json'):
+        if old_path != path:
+            old_path.unlink()
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    tmp_path.replace(path)
+
+
+def read_concepticon_conceptsets(concepticon_path, cache_dir):
+    """Return all concept sets from a Concepticon clone.
+
+    The concept sets are read from a snapshot if one exists for the clone's
+    current commit; pyconcepticon is only used to create a new snapshot.
+    """
+    commit = repo_commit(concepticon_path)
+    data = load_snapshot(cache_dir, 'concepticon', commit)
+    if data is None:
+        from pyconcepticon.api import Concepticon
+
+        data = [
+            [conceptset.id, conceptset.gloss, conceptset.definition]
+            for conceptset in Concepticon(concepticon_path).conceptsets.values()]
+        save_snapshot(cache_dir, 'concepticon', commit, data)
+    return [ConceptSet(*row) for row in data]
+
+
+def make_languoid(languoid, family_level):
+    """Return the relevant parts of a pyglottolog languoid."""
+    if languoid.lineage:
+        family_name, family_id, _ = languoid.lineage[0]
+    elif languoid.level.id == family_level.id:
+        # top-level families are not isolates
+        family_name, family_id = languoid.name, languoid.id
+    else:
+        family_name, family_id = None, None
+    return Languoid(
+        id=languoid.id,
+        iso=languoid.iso,
+        name=languoid.name,
+        latitude=languoid.latitude,
+        longitude=languoid.longitude,
+        macroarea=(
+            languoid.macroareas[0].name if languoid.macroareas else None),
+        family_id=family_id,
+        family_name=family_name)
+
+
+def read_glottolog_languoids(glottolog_path, cache_dir, glottocodes):
+    """Return languoids from a Glottolog clone mapped to their glottocodes.
+
+    Languoids are read from the snapshot for the clone's current commit.
+    Only glottocodes missing from the snapshot are looked up in the clone
+    itself and then added to the snapshot.  Glottocodes not found in Glottolog
+    are left out.
+    """
+    commit = repo_commit(glottolog_path)
+    data = load_snapshot(cache_dir, 'glottolog', commit) or {}
+    if (missing := set(glottocodes).difference(data)):
+        from pyglottolog.api import Glottolog
+
+        api = Glottolog(glottolog_path)
+        for languoid in api.languoids(ids=missing):
+            data[languoid.id] = list(make_languoid(
+                languoid, api.languoid_levels.family))
+        save_snapshot(cache_dir, 'glottolog', commit, data)
+    return {
+        glottocode: Languoid(*data[glottocode])
+        for glottocode in glottocodes
+        if glottocode in data}
+
+
+def load_families(data, languages, glottolog_path, cache_dir, strict=True):
+    """Add Glottolog information to languages.
+
+    This does the same as `clld_glottologfamily_plugin.util.load_families`,
+    but gets the languoids from `read_glottolog_languoids`.  `languages` must
+    have glottocodes as ids.  Families already in the data base are reused
+    and new families get icons none of them uses yet (as long as there are
+    any left).
+    """
+    languages = list(languages)
+    languoids = read_glottolog_languoids(
+        glottolog_path, cache_dir, [language.id for language in languages])
+    family_ids = {
+        languoid.family_id
+        for languoid in languoids.values()
+        if languoid.family_id}
+    for family in DBSession.query(Family).filter(Family.id.in_(family_ids)):
+        data['Family'][family.id] = family
+
+    used_icons = {
+        (jsondata or {}).get('icon')
+        for jsondata, in DBSession.query(Family.jsondata)}
+    icons = [
+        getattr(icon, 'name', icon)
+        for icon in ORDERED_ICONS
+        if getattr(icon, 'name', icon) != ISOLATES_ICON]
+    icons = itertools.cycle(
+        [icon for icon in icons if icon not in used_icons] or icons)
+    for language in languages:
+        languoid = languoids.get(language.id)
+        if not languoid:
+            if strict:
+                raise KeyError(language.id)
+            continue
+        language.macroarea = languoid.macroarea
+        add_language_codes(
+            data, language, languoid.iso, glottocode=languoid.id)
+        for attr in 'latitude', 'longitude', 'name':
+            if getattr(language, attr) is None:
+                setattr(language, attr, getattr(languoid, attr))
+
+        if languoid.family_id:
+            family = data['Family'].get(languoid.family_id)
+            if not family:
+                family = data.add(
+                    Family,
+                    languoid.family_id,
+                    id=languoid.family_id,
+                    name=languoid.family_name,
+                    description=Identifier(
+                        name=languoid.family_id,
+                        type=IdentifierType.glottolog.value).url(),
+                    jsondata=dict(icon=next(icons)))
+            language.family = family
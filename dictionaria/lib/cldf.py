@@ -1,8 +1,12 @@
 """Helper functions for dictionaria."""
+import hashlib
 import json
+import pickle
 import re
-from collections import Counter, defaultdict, namedtuple
-from itertools import chain
+from collections import Counter, defaultdict, deque, namedtuple
+from contextlib import nullcontext
+from functools import partial
+from itertools import chain, islice
 
 from clld.cliutil import bibtex2source
 from clld.db.fts import tsvector
@@ -10,8 +14,27 @@ from clld.db.meta import DBSession
 from clld.db.models import common
 from clld.lib import bibtex
 from pycldf import Sources, iter_datasets
+from sqlalchemy import Column, Integer, MetaData, Table, Unicode
 
 from dictionaria import models
+from dictionaria.lib.archive import SubmissionArchive, is_archive
+from dictionaria.lib.bulkload import (
+    FakePks, assign_pks, copy_objects, reserve_pks,
+)
+from dictionaria.lib.profiling import NO_PROFILER
+
+LOADERS = ('orm', 'copy')
+FTS_MODES = ('insert', 'deferred')
+# Text of the entries whose full-text search vectors are computed once they
+# are loaded.  The table isn't part of the data model: It only exists while
+# an import with deferred full-text search is running.
+FTS_STAGING = Table(
+    'word_fts_staging', MetaData(),
+    Column('word_pk', Integer, primary_key=True),
+    Column('text', Unicode))
+READERS = ('csvw', 'arrow')
+# number of association objects added to the session before flushing
+BATCH_SIZE = 50000
 
 
 def shorten_url(property_url):
@@ -68,49 +91,269 @@ class ColumnNameMap:
             or self.labels.get(colname, colname))
         return self.titles.get(label, label)
 
+    def compile(self, colnames):
+        """Return the human readable labels for a sequence of CLDF columns."""
+        return tuple(self.map(colname) for colname in colnames)
 
-def read_table(cldf, table_name, labels):
+
+def read_table(cldf, table_name, labels, archive=None):
     """Iterate over rows of a table in a CLDF data set.
 
-    This maps .
+    This maps column names to human readable labels and drops empty cells.
+    If the data set is read from a `SubmissionArchive`, the table is read
+    from the `archive`, too.
     """
     table = cldf.get(table_name)
     if not table:
         return
     colmap = ColumnNameMap(table, labels)
-    for row in table:
-        yield {
-            colmap.map(colname): cell
-            for colname, cell in row.items()
-            if cell != [] and cell != '' and cell is not None}
+    colnames, row_labels = (), ()
+    with archive.open_table(table) if archive else nullcontext() as f:
+        for row in table.iterdicts(fname=f):
+            # All rows of a table normally share the same columns, so the
+            # labels are only looked up again if the columns do change.
+            if tuple(row) != colnames:
+                colnames = tuple(row)
+                row_labels = colmap.compile(colnames)
+            yield {
+                label: cell
+                for label, cell in zip(row_labels, row.values())
+                if cell is not None and cell != '' and cell != []}
+
+
+def get_table_reader(reader='csvw'):
+    """Return the function reading the rows of a CLDF table.
+
+    `'csvw'` reads tables through pycldf, `'arrow'` uses the (much faster)
+    columnar reader from `dictionaria.lib.columnar`, which needs `pyarrow`.
+    Both return the very same rows.
+    """
+    if reader not in READERS:
+        raise ValueError(f'unknown reader: {reader}')
+    if reader == 'csvw':
+        return read_table
+    # imported here, as the columnar reader itself builds on this module
+    from dictionaria.lib import columnar
+    if columnar.pyarrow is None:
+        raise ValueError('the arrow reader needs pyarrow to be installed')
+    return columnar.read_table_columnar
+
+
+class RecordSchema:
+    """Field layout shared by all records of a table.
+
+    Records store the values of all fields of the table, each at a fixed
+    position, with `None` for empty cells.  The schema knows which fields
+    are 'standard' fields and in what order the 'free' fields are to be
+    shown.
+    """
 
+    __slots__ = ('std', 'free')
 
-CldfRecord = namedtuple('CldfRecord', 'std free')
-CldfRecord.__doc__ = """A single record from a CLDF table.
+    def __init__(self, fields, standard_fields, custom_order):
+        """Construct a schema from field names mapped to their positions.
 
-std:  dictionary of 'standard' fields that are handled explicitly.
-free: dictionary of 'free' fields that are dumped into *_data objects.
-"""
+        `fields` are expected in the order of the csv columns.
+        """
+        self.std = {
+            field: index
+            for field, index in fields.items()
+            if field in standard_fields}
+        free = {
+            field: fields[field]
+            for field in (custom_order or ())
+            if field in fields}
+        free.update(
+            (field, index)
+            for field, index in fields.items()
+            if field not in standard_fields and field not in free)
+        self.free = free
+
+    def __getstate__(self):
+        return self.std, self.free
+
+    def __setstate__(self, state):
+        self.std, self.free = state
+
+
+class RecordFields:
+    """Read-only dictionary view on some of the fields of a record.
+
+    Fields without a value (i.e. `None`) don't count as fields of the record.
+    """
 
+    __slots__ = ('_indices', '_values')
 
-def make_cldf_record(csv_row, standard_fields, custom_order):
-    """Return a cldf record from a bare dictionary.
+    def __init__(self, indices, values):
+        """Construct view from a map of field names to indices in `values`."""
+        self._indices = indices
+        self._values = values
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        return dict(self.items()) == dict(other.items())
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, key, default=None):
+        """Return value of field `key` or `default` if there is none."""
+        index = self._indices.get(key)
+        if index is None or self._values[index] is None:
+            return default
+        return self._values[index]
+
+    def keys(self):
+        """Return field names."""
+        return [key for key, _ in self.items()]
+
+    def values(self):
+        """Return field values."""
+        return [value for _, value in self.items()]
+
+    def items(self):
+        """Return pairs of field names and values."""
+        values = self._values
+        return [
+            (key, values[index])
+            for key, index in self._indices.items()
+            if values[index] is not None]
+
+
+class CldfRecord:
+    """A single record from a CLDF table.
+
+    std:  dictionary of 'standard' fields that are handled explicitly.
+    free: dictionary of 'free' fields that are dumped into *_data objects.
+
+    Both are views on a single tuple of values, with the field names stored
+    once in a `RecordSchema` shared between all records of a table.  The
+    views are created on first access.
+    """
+
+    __slots__ = ('schema', 'values', '_std', '_free')
+
+    def __init__(self, schema, values):
+        """Construct record from a schema and the values of its fields."""
+        self.schema = schema
+        self.values = values
+
+    @property
+    def std(self):
+        """Return 'standard' fields of the record."""
+        try:
+            return self._std
+        except AttributeError:
+            self._std = RecordFields(self.schema.std, self.values)
+            return self._std
+
+    @property
+    def free(self):
+        """Return 'free' fields of the record."""
+        try:
+            return self._free
+        except AttributeError:
+            self._free = RecordFields(self.schema.free, self.values)
+            return self._free
+
+    def __eq__(self, other):
+        if not isinstance(other, CldfRecord):
+            return NotImplemented
+        return (self.std, self.free) == (other.std, other.free)
+
+    def __repr__(self):
+        return f'CldfRecord(std={self.std!r}, free={self.free!r})'
+
+    def __getstate__(self):
+        return self.schema, self.values
+
+    def __setstate__(self, state):
+        self.schema, self.values = state
+
+
+def column_order(field_lists):
+    """Return all fields in an order consistent with each of `field_lists`.
 
-    This sorts the elements of `csv_row` in to the `std` and `free` attributes
-    of the record according to `standard_fields`.
+    Each list holds the (non-empty) fields of some row in the order of the
+    csv columns, so together they tell the order of all columns.  The order
+    of fields which never appear in the same row doesn't matter.
     """
-    std = {k: v for k, v in csv_row.items() if k in standard_fields}
-    free_fields = {}
-    free_fields.update((k, True) for k in (custom_order or ()))
-    free_fields.update(
-        (k, True)
-        for k in csv_row
-        if k not in standard_fields and k not in free_fields)
-    free = {k: csv_row[k] for k in free_fields if k in csv_row}
-    return CldfRecord(std, free)
-
-
-def read_cldf_entries(cldf, labels, custom_order):
+    successors = defaultdict(set)
+    predecessors = Counter()
+    fields = {}
+    for field_list in field_lists:
+        fields.update(dict.fromkeys(field_list))
+        for before, after in zip(field_list, field_list[1:]):
+            if after not in successors[before]:
+                successors[before].add(after)
+                predecessors[after] += 1
+    rank = {field: index for index, field in enumerate(fields)}
+    order = []
+    ready = deque(field for field in fields if not predecessors[field])
+    while ready:
+        field = ready.popleft()
+        order.append(field)
+        for after in sorted(successors[field], key=rank.get):
+            predecessors[after] -= 1
+            if not predecessors[after]:
+                ready.append(after)
+    return order
+
+
+def make_cldf_records(csv_rows, standard_fields, custom_order):
+    """Return a list of cldf records from bare dictionaries.
+
+    This sorts the elements of each csv row in to the `std` and `free`
+    attributes of the record according to `standard_fields`.  All records
+    share the same schema.
+    """
+    # positions of the fields in the values of the records
+    positions = {}
+    # positions of the values of rows with the same fields
+    layouts = {}
+    rows = []
+    for csv_row in csv_rows:
+        fields = tuple(csv_row)
+        layout = layouts.get(fields)
+        if layout is None:
+            layout = layouts[fields] = [
+                positions.setdefault(field, len(positions))
+                for field in fields]
+        values = [None] * len(positions)
+        for position, value in zip(layout, csv_row.values()):
+            values[position] = value
+        rows.append(tuple(values))
+    schema = RecordSchema(
+        {field: positions[field] for field in column_order(layouts)},
+        standard_fields,
+        custom_order)
+    # rows read before the last field turned up lack its value
+    padding = (None,) * len(positions)
+    return [
+        CldfRecord(schema, values + padding[len(values):])
+        for values in rows]
+
+
+def make_cldf_record(csv_row, standard_fields, custom_order):
+    """Return a cldf record from a bare dictionary."""
+    return make_cldf_records([csv_row], standard_fields, custom_order)[0]
+
+
+def read_cldf_entries(cldf, labels, custom_order, read_rows=read_table):
     """Return entry records from a cldf data set."""
     standard_fields = {
         'id',
@@ -120,13 +363,16 @@ def read_cldf_entries(cldf, labels, custom_order):
         'mediaReference',
         'source',
     }
-    return [
-        make_cldf_record(entry, standard_fields, custom_order)
-        for entry in read_table(cldf, 'EntryTable', labels)
-        if entry.get('headword')]
+    return make_cldf_records(
+        (
+            entry
+            for entry in read_rows(cldf, 'EntryTable', labels)
+            if entry.get('headword')),
+        standard_fields,
+        custom_order)
 
 
-def read_cldf_senses(cldf, labels, custom_order):
+def read_cldf_senses(cldf, labels, custom_order, read_rows=read_table):
     """Return sense records from a cldf data set."""
     standard_fields = {
         'id',
@@ -138,12 +384,11 @@ def read_cldf_senses(cldf, labels, custom_order):
         'source',
         'Semantic_Domain',
     }
-    return [
-        make_cldf_record(sense, standard_fields, custom_order)
-        for sense in read_table(cldf, 'SenseTable', labels)]
+    return make_cldf_records(
+        read_rows(cldf, 'SenseTable', labels), standard_fields, custom_order)
 
 
-def read_cldf_examples(cldf, labels, custom_order):
+def read_cldf_examples(cldf, labels, custom_order, read_rows=read_table):
     """Return example records from a cldf data set."""
     standard_fields = {
         'id',
@@ -162,9 +407,10 @@ def read_cldf_examples(cldf, labels, custom_order):
         'Corpus_Reference',
         'source',
     }
-    return [
-        make_cldf_record(example, standard_fields, custom_order)
-        for example in read_table(cldf, 'ExampleTable', labels)]
+    return make_cldf_records(
+        read_rows(cldf, 'ExampleTable', labels),
+        standard_fields,
+        custom_order)
 
 
 def _fix_media_fields(kvpair):
@@ -178,7 +424,7 @@ def fix_media_fields(piece_of_media):
     return dict(map(_fix_media_fields, piece_of_media.items()))
 
 
-def read_cldf_media(cldf):
+def read_cldf_media(cldf, read_rows=read_table):
     """Return media file information from a cldf data set.
 
     Note that unlike the functions above, this just returns the records as
@@ -187,7 +433,21 @@ def read_cldf_media(cldf):
     table_name = 'MediaTable' if 'MediaTable' in cldf else 'media.csv'
     return {
         piece_of_media['id']: fix_media_fields(piece_of_media)
-        for piece_of_media in read_table(cldf, table_name, {})}
+        for piece_of_media in read_rows(cldf, table_name, {})}
+
+
+SourceRecord = namedtuple('SourceRecord', 'genre id fields')
+SourceRecord.__doc__ = """A single entry from a CLDF data set's bibliography.
+
+Unlike pycldf's own source objects, these can be pickled.
+"""
+
+
+def read_cldf_sources(cldf):
+    """Return the bibliography of a cldf data set."""
+    return [
+        SourceRecord(source.genre, source.id, dict(source))
+        for source in cldf.sources]
 
 
 def make_sources(cldf_sources, dictionary):
@@ -197,7 +457,7 @@ def make_sources(cldf_sources, dictionary):
     print('loading sources ...')
     sources = {}
     for record in cldf_sources:
-        bibrecord = bibtex.Record(record.genre, record.id, **record)
+        bibrecord = bibtex.Record(record.genre, record.id, **record.fields)
         source = bibtex2source(bibrecord, models.DictionarySource)
         source.dictionary_pk = dictionary.pk
         original_id = source.id
@@ -221,11 +481,86 @@ def get_crossref_fields(cldf, table_name, labels):
         and len(fk.columnReference) == 1]
 
 
-def collect_full_entries(cldf_entries, cldf_senses, cldf_examples):
+def _crossrefs(cldf_record, crossref_fields):
+    return [
+        (key, ref)
+        for key, refs in chain(cldf_record.std.items(), cldf_record.free.items())
+        if key in crossref_fields
+        for ref in (refs if isinstance(refs, list) else [refs])]
+
+
+class SubmissionIndex:
+    """Lookups between the records of a submission.
+
+    The index is built in one pass over the records and then shared between
+    all the functions creating ORM objects, so they don't need to group the
+    records over and over again.
+
+    sense2word:       entry ids mapped to sense ids.
+    entry_senses:     sense records mapped to entry ids.
+    example_senses:   sense ids mapped to example ids.
+    entry_examples:   positions of example records mapped to entry ids.
+    entry_media:      ids of media files mapped to entry ids.
+    entry_crossrefs:  (column, entry id) pairs mapped to entry ids.
+    sense_crossrefs:  (column, entry id) pairs mapped to sense ids.
+    """
+
+    def __init__(self, records):
+        """Build index from a submission's records."""
+        self.sense2word = {}
+        self.entry_senses = defaultdict(list)
+        self.sense_crossrefs = {}
+        sense_crossref_fields = set(records.sense_crossrefs)
+        sense_crossref_fields.discard('entryReference')
+        for cldf_sense in records.senses:
+            sense_id = cldf_sense.std['id']
+            entry_id = cldf_sense.std['entryReference']
+            self.sense2word[sense_id] = entry_id
+            self.entry_senses[entry_id].append(cldf_sense)
+            if (crossrefs := _crossrefs(cldf_sense, sense_crossref_fields)):
+                self.sense_crossrefs[sense_id] = crossrefs
+
+        self.entry_media = {}
+        self.entry_crossrefs = {}
+        entry_crossref_fields = set(records.entry_crossrefs)
+        for cldf_entry in records.entries:
+            entry_id = cldf_entry.std['id']
+            self.entry_media[entry_id] = (
+                cldf_entry.std.get('mediaReference') or ())
+            if (crossrefs := _crossrefs(cldf_entry, entry_crossref_fields)):
+                self.entry_crossrefs[entry_id] = crossrefs
+
+        self.example_senses = {}
+        self.entry_examples = defaultdict(list)
+        for position, cldf_example in enumerate(records.examples):
+            sense_ids = list(example_sense_ids(cldf_example))
+            self.example_senses[cldf_example.std['id']] = sense_ids
+            entry_ids = {
+                entry_id
+                for sense_id in sense_ids
+                if (entry_id := self.sense2word.get(sense_id))}
+            for entry_id in entry_ids:
+                self.entry_examples[entry_id].append(position)
+
+
+def entry_chunk_records(cldf_entries, cldf_examples, index):
+    """Return the sense and example records belonging to some entries.
+
+    Examples keep the order they have in the submission.
+    """
+    cldf_senses = [
+        cldf_sense
+        for cldf_entry in cldf_entries
+        for cldf_sense in index.entry_senses.get(cldf_entry.std['id'], ())]
+    positions = {
+        position
+        for cldf_entry in cldf_entries
+        for position in index.entry_examples.get(cldf_entry.std['id'], ())}
+    return cldf_senses, [cldf_examples[i] for i in sorted(positions)]
+
+
+def collect_full_entries(cldf_entries, cldf_senses, cldf_examples, index):
     """Return contents of all fields for all entries for full-text search."""
-    sense2word = {
-        cldf_sense.std['id']: cldf_sense.std['entryReference']
-        for cldf_sense in cldf_senses}
     fullentries = defaultdict(list)
     for cldf_entry in cldf_entries:
         fullentries[cldf_entry.std['id']].extend(chain(
@@ -239,8 +574,8 @@ def collect_full_entries(cldf_entries, cldf_senses, cldf_examples):
         exdata = list(chain(
             cldf_example.std.items(),
             cldf_example.free.items()))
-        for mid in example_sense_ids(cldf_example):
-            if (entry_id := sense2word.get(mid)):
+        for mid in index.example_senses[cldf_example.std['id']]:
+            if (entry_id := index.sense2word.get(mid)):
                 fullentries[entry_id].extend(exdata)
     return fullentries
 
@@ -303,24 +638,34 @@ class HomonymCounter:
 
 
 def make_entries(
-    cldf_entries, cldf_senses, cldf_examples, language, dictionary,
-    custom_fields, second_tab, metalanguages,
+    cldf_entries, cldf_senses, cldf_examples, index, language, dictionary,
+    custom_fields, second_tab, metalanguages, fts_texts=None, homonyms=None,
 ):
     """Create ORM entries from entry records.
 
     Entries are mapped to their original ids for future reference.
+
+    If `fts_texts` is given, the text for the full-text search of each entry
+    is only put in there (mapped to the entry id), and `Word.fts` has to be
+    computed later on.
+
+    `homonyms` is the `HomonymCounter` to use when the entries are created in
+    several chunks; by default one is created for `cldf_entries`.
     """
-    fullentries = collect_full_entries(cldf_entries, cldf_senses, cldf_examples)
+    fullentries = collect_full_entries(
+        cldf_entries, cldf_senses, cldf_examples, index)
+    entry_senses = index.entry_senses
 
-    entry_senses = defaultdict(list)
-    descriptions = defaultdict(list)
-    semantic_domains = defaultdict(set)
-    for cldf_sense in cldf_senses:
-        entry_id = cldf_sense.std['entryReference']
-        entry_senses[entry_id].append(cldf_sense)
-        descriptions[entry_id].append(cldf_sense.std.get('description', ''))
-        if (semdom := cldf_sense.std.get('Semantic_Domain')):
-            semantic_domains[entry_id].add(semdom)
+    def description(entry_id):
+        return ' / '.join(
+            cldf_sense.std.get('description', '')
+            for cldf_sense in entry_senses.get(entry_id, ()))
+
+    def semantic_domain(entry_id):
+        return ' ; '.join(sorted({
+            semdom
+            for cldf_sense in entry_senses.get(entry_id, ())
+            if (semdom := cldf_sense.std.get('Semantic_Domain'))}))
 
     # NOTE(johannes): An older version of the code assumed that custom fields
     # are handled *way* later than they are now so the json file works on the
@@ -340,21 +685,30 @@ def make_entries(
         else:
             return None
 
-    homonym_counter = HomonymCounter(
+    homonym_counter = homonyms or HomonymCounter(
         cldf_entry.std['headword'] for cldf_entry in cldf_entries)
 
+    def full_text(entry_id):
+        return '; '.join(
+            f'{k}: {v}'
+            for k, v in fullentries.get(entry_id, ())
+            if v)
+
+    def fts(entry_id):
+        if fts_texts is None:
+            return tsvector(full_text(entry_id))
+        fts_texts[entry_id] = full_text(entry_id)
+        return None
+
     return {
         cldf_entry.std['id']: models.Word(
             id='{}-{}'.format(dictionary.id, (eid := cldf_entry.std['id'])),
             name=cldf_entry.std['headword'],
             pos=cldf_entry.std.get('partOfSpeech'),
             number=homonym_counter.homonym_no(cldf_entry.std['headword']),
-            description=' / '.join(descriptions.get(eid) or ()),
-            semantic_domain=' ; '.join(sorted(semantic_domains.get(eid) or ())),
-            fts=tsvector('; '.join(
-                f'{k}: {v}'
-                for k, v in fullentries.get(cldf_entry.std['id'], ())
-                if v)),
+            description=description(eid),
+            semantic_domain=semantic_domain(eid),
+            fts=fts(eid),
             language_pk=language.pk,
             dictionary_pk=dictionary.pk,
             custom_field1=get_tab_value(eid, tab1_data, custom_fields, 0),
@@ -365,13 +719,46 @@ def make_entries(
         for cldf_entry in cldf_entries}
 
 
-def entry_id_exists(entries, eid):
+class MissingReferences:
+    """Collection of references to entries and media files which don't exist.
+
+    Each missing entry or file is listed once, along with the number of
+    references to it.
+    """
+
+    def __init__(self):
+        """Initialise empty collection."""
+        self.entries = Counter()
+        # media type -> checksum -> number of references
+        self.media = defaultdict(Counter)
+
+    def __bool__(self):
+        """Return true iff. anything is missing."""
+        return bool(self.entries or self.media)
+
+    def report(self):
+        """Return lines describing all missing references."""
+        lines = [
+            f"missing entry ID: '{eid}' ({count}x)"
+            for eid, count in sorted(self.entries.items())]
+        lines.extend(
+            f'{type_} file missing: {md5} ({count}x)'
+            for type_, md5s in sorted(self.media.items())
+            for md5, count in sorted(md5s.items()))
+        return lines
+
+
+def entry_id_exists(entries, eid, missing=None):
     """Return true iff. an entry exists.
 
-    Prints an error message if it doesn't.
+    If it doesn't, it's added to `missing` (a `MissingReferences` object) or,
+    without `missing`, an error message is printed.
     """
     if eid in entries:
         return True
+    elif missing is not None:
+        missing.entries[eid] += 1
+        return False
     else:
         print(f"missing entry ID: '{eid}'")
         return False
@@ -445,6 +832,7 @@ def make_example(
 
 def make_examples(
     cldf_examples, language, dictionary, metalanguages, custom_fields,
+    first_number=1,
 ):
     """Return ORM examples for example records.
 
@@ -454,16 +842,20 @@ def make_examples(
         cldf_example.std['id']: make_example(
             cldf_example, language, dictionary, metalanguages, number,
             custom_fields)
-        for number, cldf_example in enumerate(cldf_examples, 1)}
+        for number, cldf_example in enumerate(cldf_examples, first_number)}
 
 
-def md5_in_cdstar(md5, cdstar, type_):
+def md5_in_cdstar(md5, cdstar, type_, missing=None):
     """Return true if checksum is found in cdstar.
 
-    Print error message if it doesn't.
+    If it isn't, it's added to `missing` (a `MissingReferences` object) or,
+    without `missing`, an error message is printed.
     """
     if md5 in cdstar:
         return True
+    elif missing is not None:
+        missing.media[type_][md5] += 1
+        return False
     else:
         print(type_, 'file missing:', md5)
         return False
@@ -482,15 +874,18 @@ def make_entry_file(entry, md5, piece_of_media, fileinfo):
         jsondata=jsondata)
 
 
-def iter_entry_files(cldf_entries, cldf_media, entries, cdstar, media_order_by):
+def iter_entry_files(
+    index, cldf_media, entries, cdstar, media_order_by, missing=None,
+):
     """Return ORM objects associating media files with dictionary entries."""
     entry_media_ids = {
-        entry.std['id']: sorted(
+        entry_id: sorted(
             {md5
-             for md5 in set(entry.std.get('mediaReference') or ())
-             if md5_in_cdstar(md5, cdstar, 'Entry')},
+             for md5 in set(media_ids)
+             if md5_in_cdstar(md5, cdstar, 'Entry', missing)},
             key=lambda md5: cldf_media[md5].get(media_order_by) or '')
-        for entry in cldf_entries}
+        for entry_id in entries
+        if (media_ids := index.entry_media.get(entry_id))}
     return (
         make_entry_file(entries[eid], md5, cldf_media[md5], cdstar[md5])
         for eid, media_ids in entry_media_ids.items()
@@ -544,7 +939,7 @@ def iter_entry_data(
             blacklist, labels_with_links))
 
 
-def iter_entry_alttranslations(cldf_senses, entries, metalanguages):
+def iter_entry_alttranslations(index, entries, metalanguages):
     """Return ORM objects for non-English translations of entries.
 
     Non-English translations are added to the Unit_data table along with other
@@ -552,24 +947,23 @@ def iter_entry_alttranslations(cldf_senses, entries, metalanguages):
     """
     altlang1 = metalanguages.get('gxx')
     altlang2 = metalanguages.get('gxy')
-    entry_alttrans1 = defaultdict(list)
-    entry_alttrans2 = defaultdict(list)
-    for cldf_sense in cldf_senses:
-        entry_id = cldf_sense.std['entryReference']
-        alttrans1 = cldf_sense.std.get('alt_translation1')
-        alttrans2 = cldf_sense.std.get('alt_translation2')
-        if alttrans1 and altlang1:
-            entry_alttrans1[entry_id].append(alttrans1)
-        if alttrans2 and altlang2:
-            entry_alttrans2[entry_id].append(alttrans2)
 
     for entry_id, entry in entries.items():
-        if (alttrans1 := entry_alttrans1.get(entry_id)):
+        cldf_senses = index.entry_senses.get(entry_id, ())
+        alttrans1 = altlang1 and [
+            alttrans
+            for cldf_sense in cldf_senses
+            if (alttrans := cldf_sense.std.get('alt_translation1'))]
+        alttrans2 = altlang2 and [
+            alttrans
+            for cldf_sense in cldf_senses
+            if (alttrans := cldf_sense.std.get('alt_translation2'))]
+        if alttrans1:
             yield common.Unit_data(
                 object_pk=entry.pk,
                 key=f'lang-{altlang1}',
                 value=' ; '.join(alttrans1))
-        if (alttrans2 := entry_alttrans2.get(entry_id)):
+        if alttrans2:
             yield common.Unit_data(
                 object_pk=entry.pk,
                 key=f'lang-{altlang2}',
@@ -581,17 +975,16 @@ def seealso_label(column_name):
     return 'See also' if column_name == 'entryReference' else column_name.replace('_', ' ')
 
 
-def iter_entry_seealso(cldf_entries, entries, entry_crossrefs):
+def iter_entry_seealso(index, entries, missing=None):
     """Return ORM objects associating entries with each other."""
     return (
         models.SeeAlso(
-            source_pk=entries[cldf_entry.std['id']].pk,
+            source_pk=entries[entry_id].pk,
             target_pk=entries[ref].pk,
             description=seealso_label(key))
-        for cldf_entry in cldf_entries
-        for key, refs in chain(cldf_entry.std.items(), cldf_entry.free.items())
-        for ref in (refs if isinstance(refs, list) else [refs])
-        if key in entry_crossrefs and entry_id_exists(entries, ref))
+        for entry_id, crossrefs in index.entry_crossrefs.items()
+        for key, ref in crossrefs
+        if entry_id_exists(entries, ref, missing))
 
 
 def make_example_file(example, md5, fileinfo):
@@ -604,13 +997,13 @@ def make_example_file(example, md5, fileinfo):
         jsondata=fileinfo)
 
 
-def iter_example_files(cldf_examples, examples, cdstar):
+def iter_example_files(cldf_examples, examples, cdstar, missing=None):
     """Return ORM objects associating media files with examples."""
     example_media_ids = {
         ex.std['id']: sorted({
             md5
             for md5 in set(ex.std.get('mediaReference') or ())
-            if md5_in_cdstar(md5, cdstar, 'Example')})
+            if md5_in_cdstar(md5, cdstar, 'Example', missing)})
         for ex in cldf_examples}
     return (
         make_example_file(examples[ex_id], md5, cdstar[md5])
@@ -678,14 +1071,18 @@ def make_meaning(cldf_sense, entry, dictionary, metalanguages, number):
         alt_translation2=alttrans2 if altlang2 else None)
 
 
-def make_meanings(cldf_senses, entries, dictionary, metalanguages):
+def make_meanings(
+    cldf_senses, entries, dictionary, metalanguages, first_number=0,
+    missing=None,
+):
     """Return ORM objects for meaning descriptions."""
     return {
         cldf_sense.std['id']: make_meaning(
             cldf_sense, entries[cldf_sense.std['entryReference']], dictionary,
             metalanguages, number)
-        for number, cldf_sense in enumerate(cldf_senses)
-        if entry_id_exists(entries, cldf_sense.std['entryReference'])}
+        for number, cldf_sense in enumerate(cldf_senses, first_number)
+        if entry_id_exists(
+            entries, cldf_sense.std['entryReference'], missing)}
 
 
 def make_meaning_file(meaning, md5, piece_of_media, fileinfo):
@@ -702,14 +1099,14 @@ def make_meaning_file(meaning, md5, piece_of_media, fileinfo):
 
 
 def iter_meaning_files(
-    cldf_senses, meanings, cldf_media, cdstar, media_order_by,
+    cldf_senses, meanings, cldf_media, cdstar, media_order_by, missing=None,
 ):
     """Return ORM objects associating media files with meaning descriptions."""
     sense_media_ids = {
         cldf_sense.std['id']: sorted(
             {md5
              for md5 in set(cldf_sense.std.get('mediaReference') or ())
-             if md5_in_cdstar(md5, cdstar, 'Sense')},
+             if md5_in_cdstar(md5, cdstar, 'Sense', missing)},
             key=lambda md5: cldf_media[md5].get(media_order_by) or '')
         for cldf_sense in cldf_senses}
     return (
@@ -768,19 +1165,16 @@ def iter_meaning_data(
             blacklist, labels_with_links))
 
 
-def iter_meaning_nyms(cldf_senses, meanings, entries, sense_crossrefs):
+def iter_meaning_nyms(index, meanings, entries, missing=None):
     """Return ORM objects associating meaning descriptions with dictionary entries."""
     return (
         models.Nym(
-            source_pk=meanings[cldf_sense.std['id']].pk,
+            source_pk=meanings[sense_id].pk,
             target_pk=entries[ref].pk,
             description=key.replace('_', ' '))
-        for cldf_sense in cldf_senses
-        for key, refs in chain(cldf_sense.std.items(), cldf_sense.free.items())
-        for ref in (refs if isinstance(refs, list) else [refs])
-        if key in sense_crossrefs
-        and key != 'entryReference'
-        and entry_id_exists(entries, ref))
+        for sense_id, crossrefs in index.sense_crossrefs.items()
+        for key, ref in crossrefs
+        if entry_id_exists(entries, ref, missing))
 
 
 def example_sense_ids(cldf_example):
@@ -799,14 +1193,14 @@ def example_sense_ids(cldf_example):
         raise TypeError('sense id must be string or list')
 
 
-def iter_example_assocs(cldf_examples, examples, meanings):
+def iter_example_assocs(index, examples, meanings):
     """Return ORM objects associating examples to meaning descriptions."""
     return (
         models.MeaningSentence(
             meaning_pk=meaning.pk,
-            sentence_pk=examples[cldf_example.std['id']].pk)
-        for cldf_example in cldf_examples
-        for mid in example_sense_ids(cldf_example)
+            sentence_pk=examples[example_id].pk)
+        for example_id, sense_ids in index.example_senses.items()
+        for mid in sense_ids
         if (meaning := meanings.get(mid)))
 
 
@@ -860,32 +1254,279 @@ def iter_values(concepticon_ids, valuesets, entries, sense2word):
         if (valueset := valuesets.get(concept_id)))
 
 
+def files_checksum(paths, base_dir):
+    """Return a checksum over the names and contents of some files.
+
+    Missing files are fine; they just contribute differently to the checksum
+    than empty ones.
+    """
+    checksum = hashlib.sha256()
+    for path in paths:
+        checksum.update(path.relative_to(base_dir).as_posix().encode('utf-8'))
+        if path.exists():
+            checksum.update(b'\x00')
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(2 ** 20), b''):
+                    checksum.update(chunk)
+        else:
+            checksum.update(b'\x01')
+    return checksum.hexdigest()
+
+
+def cldf_files(data_dir):
+    """Return paths to all files in a submission's `cldf` directory."""
+    return sorted(p for p in (data_dir / 'cldf').rglob('*') if p.is_file())
+
+
+# Files outside of the `cldf` directory a submission is loaded from.
+SUBMISSION_FILES = ['etc/md.json', 'etc/cdstar.json', 'raw/intro.md']
+
+
+def submission_fingerprint(data_dir):
+    """Return a checksum over all files a submission is loaded from.
+
+    That is the `cldf/` directory, the meta data in `etc/` and the
+    introduction text.  For a zip archive of the submission, the checksum is
+    the same as for the extracted files.
+    """
+    if is_archive(data_dir):
+        archive = SubmissionArchive(data_dir)
+        return archive.checksum(archive.files('cldf') + SUBMISSION_FILES)
+    paths = cldf_files(data_dir)
+    paths.extend(data_dir / name for name in SUBMISSION_FILES)
+    return files_checksum(paths, data_dir)
+
+
+SubmissionRecords = namedtuple(
+    'SubmissionRecords',
+    'entries senses examples media sources entry_crossrefs sense_crossrefs')
+SubmissionRecords.__doc__ = """All records parsed from a submission's CLDF data.
+
+entries, senses, examples:  lists of CldfRecord objects.
+media:                      media records mapped to their ids.
+sources:                    list of SourceRecord objects.
+entry_crossrefs, sense_crossrefs:
+    names of the columns in the entry and sense table that refer to entries.
+"""
+
+
+def read_submission_records(
+    cldf, props, profiler=NO_PROFILER, sid=None, reader='csvw', archive=None,
+):
+    """Parse all tables of a cldf data set relevant to the import.
+
+    `reader` selects how the csv files are read (see `get_table_reader`).
+    If the data set was loaded from a `SubmissionArchive`, the csv files are
+    read from the `archive`.
+    """
+    read_rows = get_table_reader(reader)
+    if archive:
+        read_rows = partial(read_rows, archive=archive)
+    entry_labels = get_labels(props, 'entry_map')
+    sense_labels = get_labels(props, 'sense_map')
+
+    def read(reader, *args):
+        with profiler.phase(reader.__name__, sid) as phase:
+            records = reader(*args)
+            phase.rows = len(records)
+        return records
+
+    return SubmissionRecords(
+        entries=read(
+            read_cldf_entries,
+            cldf, entry_labels, props.get('entry_custom_order'), read_rows),
+        senses=read(
+            read_cldf_senses,
+            cldf, sense_labels, props.get('sense_custom_order'), read_rows),
+        examples=read(
+            read_cldf_examples,
+            cldf, get_labels(props, 'example_map'),
+            props.get('example_custom_order'), read_rows),
+        media=read(read_cldf_media, cldf, read_rows),
+        sources=read(read_cldf_sources, cldf),
+        entry_crossrefs=get_crossref_fields(cldf, 'EntryTable', entry_labels),
+        sense_crossrefs=get_crossref_fields(cldf, 'SenseTable', sense_labels))
+
+
+# Bump this whenever the output of `read_submission_records` changes, so
+# records cached by older versions of the code are not used anymore.
+RECORD_CACHE_VERSION = 3
+
+
+def records_cache_key(fingerprint):
+    """Return the key identifying the parsed records of a submission.
+
+    `fingerprint` is the checksum over the submission's files (see
+    `submission_fingerprint`), which include the label maps and custom
+    orders in `md.json`.
+    """
+    return f'{RECORD_CACHE_VERSION}-{fingerprint}'
+
+
+def load_cached_records(path, key):
+    """Return records from a cache file or `None` if there are none for `key`."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'rb') as f:
+            if pickle.load(f) != key:
+                return None
+            return pickle.load(f)
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        print('WARNING: ignoring broken record cache:', path)
+        return None
+
+
+def save_cached_records(path, key, records):
+    """Write records to a cache file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.dump(records, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp_path.replace(path)
+
+
+def parse_submission(
+    sid, data_dir, cache_dir=None, profiler=NO_PROFILER, reader='csvw',
+    fingerprint=None,
+):
+    """Read a submission from disk and parse all of its records.
+
+    If `cache_dir` is given, parsed records are cached in there, so the cldf
+    data doesn't have to be parsed again as long as none of the submission's
+    files change.  If the `fingerprint` of the files was computed before
+    (see `submission_fingerprint`), it can be passed in, so they needn't be
+    read again.
+
+    Phases measured by `profiler` are returned in the submission's `phases`
+    attribute.  `reader` selects how the csv files are read (see
+    `get_table_reader`).
+
+    This is a module-level function, so it can be sent to worker processes.
+    """
+    submission = Submission.from_cldfbench(sid, data_dir, fingerprint)
+    if cache_dir:
+        cache_path = cache_dir / f'{sid}.pickle'
+        key = records_cache_key(submission.fingerprint)
+        with profiler.phase('load_cached_records', sid):
+            submission.records = load_cached_records(cache_path, key)
+        if submission.records is None:
+            records = submission.read_records(profiler, reader)
+            with profiler.phase('save_cached_records', sid):
+                save_cached_records(cache_path, key, records)
+        else:
+            print(f'{sid}: using cached records')
+    else:
+        submission.read_records(profiler, reader)
+    submission.phases = list(profiler.phases)
+    return submission
+
+
+StoredObject = namedtuple('StoredObject', 'pk name')
+StoredObject.__doc__ = """What is kept of an ORM object after it was written
+to the data base and removed from the session."""
+
+
+def iter_chunks(records, size=None):
+    """Split a list of records into chunks of `size` records.
+
+    Yields the position of the first record of each chunk along with the
+    chunk.  If `size` is not given, all records end up in a single chunk.
+    """
+    size = size or len(records) or 1
+    for offset in range(0, len(records), size):
+        yield offset, records[offset:offset + size]
+
+
+def consume(objects):
+    """Exhaust an iterable, throwing away its items."""
+    deque(objects, maxlen=0)
+
+
+def iter_batches(objects, size):
+    """Split an iterable into lists of (at most) `size` objects."""
+    objects = iter(objects)
+    while (batch := list(islice(objects, size))):
+        yield batch
+
+
+def find_dictionary(datasets):
+    """Return the one CLDF dictionary among the data sets of a submission."""
+    cldf_dictionaries = [ds for ds in datasets if ds.module == 'Dictionary']
+    assert cldf_dictionaries, 'submission must have a cldf dictionary'
+    assert len(cldf_dictionaries) == 1, 'no more than 1 dictionary per submission'
+    return cldf_dictionaries[0]
+
+
+def prepare_metadata(md):
+    """Fill in the properties of a submission's `md.json` the webapp needs."""
+    props = md.get('properties', {})
+    props['metalanguage_styles'] = {}
+    for v, s in zip(
+        props.get('metalanguages', {}).values(),
+        ['success', 'info', 'warning', 'important'],
+    ):
+        props['metalanguage_styles'][v] = s
+    props['custom_fields'] = [
+        f'lang-{field}' if field in props['metalanguage_styles'] else field
+        for field in props.get('custom_fields', ())]
+    if 'second_tab' in props:
+        props['second_tab'] = [
+            f'lang-{field}' if field in props['metalanguage_styles'] else field
+            for field in props['second_tab']]
+    props.setdefault('choices', {})
+    md['properties'] = props
+    return md
+
+
 class Submission:
     """Object for loading a submission into the data base."""
 
-    def __init__(self, sid, cldf, md, intro, cdstar):
+    def __init__(
+        self, sid, cldf, md, intro, cdstar, fingerprint=None, archive=None,
+    ):
         """Create submission.
 
-        This constructor is usually called from `from_cldfbench`.
+        This constructor is usually called from `from_cldfbench`.  `archive`
+        is the `SubmissionArchive` the submission is read from, if any.
         """
         self.id = sid
+        self.fingerprint = fingerprint
+        self.archive = archive
         self.md = md
         self.props = self.md['properties']
         self.cdstar = cdstar
         self.description = intro
         self.cldf = cldf
         self.glottocode = md['language']['glottocode']
+        self.records = None
+        # measurements taken while parsing the submission
+        self.phases = []
+
+    def __getstate__(self):
+        """Return picklable state of the submission.
+
+        The pycldf data set itself is left behind, so submissions can only be
+        pickled *after* their records have been read.
+        """
+        assert self.records is not None, 'read records before pickling'
+        state = self.__dict__.copy()
+        state['cldf'] = None
+        return state
 
     @classmethod
-    def from_cldfbench(cls, sid, data_dir):
-        """Read submission information from disk."""
-        cldf_dictionaries = [
-            ds
-            for ds in iter_datasets(data_dir / 'cldf')
-            if ds.module == 'Dictionary']
-        assert cldf_dictionaries, 'submission must have a cldf dictionary'
-        assert len(cldf_dictionaries) == 1, 'no more than 1 dictionary per submission'
-        cldf = cldf_dictionaries[0]
+    def from_cldfbench(cls, sid, data_dir, fingerprint=None):
+        """Read submission information from disk.
+
+        `data_dir` may also be a zip archive of the submission, which is read
+        without extracting it (see `from_archive`).  The `fingerprint` of the
+        submission's files is computed unless it is given.
+        """
+        if is_archive(data_dir):
+            return cls.from_archive(sid, data_dir, fingerprint)
+
+        cldf = find_dictionary(iter_datasets(data_dir / 'cldf'))
 
         with open(data_dir / 'etc' / 'md.json', encoding='utf-8') as f:
             md = json.load(f)
@@ -905,122 +1546,293 @@ class Submission:
         else:
             cdstar = {}
 
-        props = md.get('properties', {})
-        props['metalanguage_styles'] = {}
-        for v, s in zip(
-            props.get('metalanguages', {}).values(),
-            ['success', 'info', 'warning', 'important'],
-        ):
-            props['metalanguage_styles'][v] = s
-        props['custom_fields'] = [
-            f'lang-{field}' if field in props['metalanguage_styles'] else field
-            for field in props.get('custom_fields', ())]
-        if 'second_tab' in props:
-            props['second_tab'] = [
-                f'lang-{field}' if field in props['metalanguage_styles'] else field
-                for field in props['second_tab']]
-        props.setdefault('choices', {})
-        md['properties'] = props
-
-        return cls(sid, cldf, md, intro, cdstar)
-
-    def add_to_database(self, dictionary, language, comparison_meanings):
-        """Add tables from the dictionary to the data base."""
+        return cls(
+            sid, cldf, prepare_metadata(md), intro, cdstar,
+            fingerprint=fingerprint or submission_fingerprint(data_dir))
+
+    @classmethod
+    def from_archive(cls, sid, path, fingerprint=None):
+        """Read submission information from a zip archive.
+
+        Only the file names and the metadata are read right away; the csv
+        files are streamed from the archive when the records are read.  The
+        `fingerprint` of the submission's files is computed unless it is
+        given.
+        """
+        archive = SubmissionArchive(path)
+        cdstar = archive.read_text('etc/cdstar.json')
+        return cls(
+            sid,
+            find_dictionary(archive.iter_datasets('cldf')),
+            prepare_metadata(json.loads(archive.read_text('etc/md.json'))),
+            archive.read_text('raw/intro.md'),
+            json.loads(cdstar) if cdstar is not None else {},
+            fingerprint=fingerprint or submission_fingerprint(path),
+            archive=archive)
+
+    def read_records(self, profiler=NO_PROFILER, reader='csvw'):
+        """Parse the submission's cldf data (unless that already happened)."""
+        if self.records is None:
+            self.records = read_submission_records(
+                self.cldf, self.props, profiler, self.id, reader, self.archive)
+        return self.records
+
+    def add_to_database(
+        self, dictionary, language, comparison_meanings, loader='orm',
+        fts='insert', chunk_size=None, profiler=NO_PROFILER, dry_run=False,
+    ):
+        """Add tables from the dictionary to the data base.
+
+        `loader` determines how the high-volume association tables are
+        written: `'orm'` adds them to the session like everything else,
+        `'copy'` streams them into the data base using `COPY`.
+
+        `fts` determines when the full-text search vectors of the entries are
+        computed: `'insert'` computes them while inserting the entries,
+        `'deferred'` only stores their text in `FTS_STAGING` (which must
+        exist) and leaves computing the vectors to the caller.
+
+        If `chunk_size` is given, entries, examples, senses and association
+        objects are written in chunks of (at most) that many objects.  Once a
+        chunk is flushed, its ORM objects are removed from the session and
+        only their primary keys (and names) are kept around, so memory usage
+        doesn't grow with the size of the dictionary.
+
+        Primary keys are reserved up front for all objects other objects refer
+        to, so the session never has to be flushed just to get at primary
+        keys.  It is only flushed to keep the number of pending objects down.
+
+        With `dry_run`, all objects are created just the same, but the data
+        base is never touched: primary keys are made up (see `FakePks`) and
+        the objects are thrown away right after they were created.  This
+        makes for a quick check of a submission (`dictionary`, `language` and
+        `comparison_meanings` need primary keys, but needn't be stored
+        anywhere; see `dry_run_submission`) and for benchmarking the creation
+        of objects on its own.
+
+        Return the references to missing entries and media files (which are
+        also printed).
+        """
+        if loader not in LOADERS:
+            raise ValueError(f'unknown loader: {loader}')
+        if fts not in FTS_MODES:
+            raise ValueError(f'unknown fts mode: {fts}')
+        if dry_run:
+            reserve = FakePks()
+            session_add = bulk_add = consume
+        else:
+            reserve = reserve_pks
+            session_add = DBSession.add_all
+            bulk_add = copy_objects if loader == 'copy' else session_add
+        missing = MissingReferences()
+        # objects added to the session since the last flush
+        pending = []
+
+        def track(objects):
+            for obj in objects:
+                if chunk_size and not dry_run:
+                    pending.append(obj)
+                yield obj
+
+        def make(func, *args, **kwargs):
+            with profiler.phase(func.__name__, self.id) as phase:
+                objects = func(*args, **kwargs)
+                phase.rows = len(objects)
+                assign_pks(objects.values(), reserve=reserve)
+                session_add(track(objects.values()))
+            return objects
+
+        def flush(name):
+            if dry_run:
+                return
+            with profiler.phase(name, self.id):
+                DBSession.flush()
+            for obj in pending:
+                DBSession.expunge(obj)
+            pending.clear()
+
+        def add(objects, name, add_all=bulk_add):
+            # Pending objects are kept alive by the session, so they are
+            # flushed right away, to let go of them as soon as possible.
+            if add_all != session_add:
+                with profiler.phase(name, self.id) as phase:
+                    add_all(phase.count(objects))
+                return
+            batch_size = chunk_size or BATCH_SIZE
+            for batch in iter_batches(track(objects), batch_size):
+                with profiler.phase(name, self.id) as phase:
+                    add_all(phase.count(batch))
+                flush(f'flush {name}')
+
+        def stage_fts(fts_texts, entries):
+            if not fts_texts:
+                return
+            if not dry_run:
+                with profiler.phase('stage_fts', self.id):
+                    DBSession.execute(FTS_STAGING.insert(), [
+                        {'word_pk': entries[eid].pk, 'text': text}
+                        for eid, text in fts_texts.items()])
+            fts_texts.clear()
+
+        def store(objects):
+            if not chunk_size:
+                return objects
+            return {
+                key: StoredObject(obj.pk, obj.name)
+                for key, obj in objects.items()}
+
         # read cldf data
 
-        entry_labels = get_labels(self.props, 'entry_map')
-        sense_labels = get_labels(self.props, 'sense_map')
-
-        entry_crossrefs = get_crossref_fields(
-            self.cldf, 'EntryTable', entry_labels)
-        sense_crossrefs = get_crossref_fields(
-            self.cldf, 'SenseTable', sense_labels)
-
-        cldf_entries = read_cldf_entries(
-            self.cldf, entry_labels,
-            self.props.get('entry_custom_order'))
-        cldf_senses = read_cldf_senses(
-            self.cldf, sense_labels,
-            self.props.get('sense_custom_order'))
-        cldf_examples = read_cldf_examples(
-            self.cldf, get_labels(self.props, 'example_map'),
-            self.props.get('example_custom_order'))
-        cldf_media = read_cldf_media(self.cldf)
+        records = self.read_records(profiler)
+        cldf_entries = records.entries
+        cldf_senses = records.senses
+        cldf_examples = records.examples
+        cldf_media = records.media
+        entry_crossrefs = records.entry_crossrefs
+        sense_crossrefs = records.sense_crossrefs
+        with profiler.phase('SubmissionIndex', self.id):
+            index = SubmissionIndex(records)
+        metalanguages = self.props.get('metalanguages') or {}
+        media_order_by = self.props.get('media_order') or 'description'
+        labels_with_links = self.props.get('process_links_in_labels') or ()
 
         # create database objects
 
-        sources = make_sources(self.cldf.sources, dictionary)
-        DBSession.add_all(sources.values())
-
-        entries = make_entries(
-            cldf_entries, cldf_senses, cldf_examples, language, dictionary,
-            self.props.get('custom_fields', ()),
-            self.props.get('second_tab', ()),
-            self.props.get('metalanguages', {}))
-        DBSession.add_all(entries.values())
-
-        examples = make_examples(
-            cldf_examples, language, dictionary,
-            self.props.get('metalanguages') or {},
-            self.props.get('custom_example_fields') or {})
-        DBSession.add_all(examples.values())
-
-        DBSession.flush()
-
-        DBSession.add_all(iter_entry_files(
-            cldf_entries, cldf_media, entries, self.cdstar,
-            self.props.get('media_order') or 'description'))
-        DBSession.add_all(iter_entry_refs(
-            cldf_entries, entries, sources))
-
-        DBSession.add_all(iter_entry_data(
-            cldf_entries, entries, self.props.get('entry_custom_order'),
-            entry_crossrefs, self.props.get('process_links_in_labels') or ()))
-        DBSession.add_all(iter_entry_alttranslations(
-            cldf_senses, entries,
-            self.props.get('metalanguages') or {}))
-        DBSession.add_all(iter_entry_seealso(
-            cldf_entries, entries, entry_crossrefs))
-
-        DBSession.add_all(iter_example_files(
-            cldf_examples, examples, self.cdstar))
-        DBSession.add_all(iter_example_data(
-            cldf_examples, examples, self.props.get('example_custom_order') or ()))
-        DBSession.add_all(iter_example_refs(
-            cldf_examples, examples, sources))
-
-        meanings = make_meanings(
-            cldf_senses, entries, dictionary,
-            self.props.get('metalanguages') or {})
-        DBSession.add_all(meanings.values())
-
-        DBSession.flush()
-
-        DBSession.add_all(iter_meaning_files(
-            cldf_senses, meanings, cldf_media, self.cdstar,
-            self.props.get('media_order') or 'description'))
-        DBSession.add_all(iter_meaning_refs(
-            cldf_senses, meanings, sources))
-        DBSession.add_all(iter_meaning_data(
-            cldf_senses, meanings, self.props.get('sense_custom_order'),
-            sense_crossrefs, self.props.get('process_links_in_labels') or ()))
-        DBSession.add_all(iter_meaning_nyms(
-            cldf_senses, meanings, entries, sense_crossrefs))
-
-        DBSession.add_all(iter_example_assocs(
-            cldf_examples, examples, meanings))
+        sources = make(make_sources, records.sources, dictionary)
+
+        homonyms = HomonymCounter(
+            cldf_entry.std['headword'] for cldf_entry in cldf_entries)
+        entries = {}
+        fts_texts = {} if fts == 'deferred' else None
+        for _, chunk in iter_chunks(cldf_entries, chunk_size):
+            chunk_senses, chunk_examples = entry_chunk_records(
+                chunk, cldf_examples, index)
+            new_entries = make(
+                make_entries,
+                chunk, chunk_senses, chunk_examples, index, language,
+                dictionary,
+                self.props.get('custom_fields', ()),
+                self.props.get('second_tab', ()),
+                self.props.get('metalanguages', {}),
+                fts_texts=fts_texts,
+                homonyms=homonyms)
+            stage_fts(fts_texts, new_entries)
+            add(
+                iter_entry_files(
+                    index, cldf_media, new_entries, self.cdstar,
+                    media_order_by, missing),
+                'iter_entry_files', session_add)
+            add(
+                iter_entry_refs(chunk, new_entries, sources),
+                'iter_entry_refs')
+            add(
+                iter_entry_data(
+                    chunk, new_entries,
+                    self.props.get('entry_custom_order'), entry_crossrefs,
+                    labels_with_links),
+                'iter_entry_data')
+            add(
+                iter_entry_alttranslations(index, new_entries, metalanguages),
+                'iter_entry_alttranslations')
+            entries.update(store(new_entries))
+            if chunk_size:
+                flush('flush entries')
+
+        examples = {}
+        for offset, chunk in iter_chunks(cldf_examples, chunk_size):
+            new_examples = make(
+                make_examples,
+                chunk, language, dictionary, metalanguages,
+                self.props.get('custom_example_fields') or {},
+                first_number=offset + 1)
+            add(
+                iter_example_files(
+                    chunk, new_examples, self.cdstar, missing),
+                'iter_example_files', session_add)
+            add(
+                iter_example_data(
+                    chunk, new_examples,
+                    self.props.get('example_custom_order') or ()),
+                'iter_example_data')
+            add(
+                iter_example_refs(chunk, new_examples, sources),
+                'iter_example_refs', session_add)
+            examples.update(store(new_examples))
+            if chunk_size:
+                flush('flush examples')
+
+        add(
+            iter_entry_seealso(index, entries, missing),
+            'iter_entry_seealso')
+
+        meanings = {}
+        for offset, chunk in iter_chunks(cldf_senses, chunk_size):
+            new_meanings = make(
+                make_meanings,
+                chunk, entries, dictionary, metalanguages,
+                first_number=offset, missing=missing)
+            add(
+                iter_meaning_files(
+                    chunk, new_meanings, cldf_media, self.cdstar,
+                    media_order_by, missing),
+                'iter_meaning_files', session_add)
+            add(
+                iter_meaning_refs(chunk, new_meanings, sources),
+                'iter_meaning_refs', session_add)
+            add(
+                iter_meaning_data(
+                    chunk, new_meanings,
+                    self.props.get('sense_custom_order'), sense_crossrefs,
+                    labels_with_links),
+                'iter_meaning_data')
+            meanings.update(store(new_meanings))
+            if chunk_size:
+                flush('flush meanings')
+
+        add(
+            iter_meaning_nyms(index, meanings, entries, missing),
+            'iter_meaning_nyms')
+
+        add(
+            iter_example_assocs(index, examples, meanings),
+            'iter_example_assocs')
 
         concepticon_ids = get_concepticon_ids(cldf_senses, meanings)
-        valuesets = make_value_sets(
+        valuesets = make(
+            make_value_sets,
             concepticon_ids, comparison_meanings, language, dictionary)
-        DBSession.add_all(valuesets.values())
+        add(
+            iter_values(concepticon_ids, valuesets, entries, index.sense2word),
+            'iter_values')
+
+        flush('flush')
 
-        DBSession.flush()
+        for line in missing.report():
+            print(line)
+        return missing
 
-        sense2word = {
-            cldf_sense.std['id']: cldf_sense.std['entryReference']
-            for cldf_sense in cldf_senses}
-        DBSession.add_all(iter_values(
-            concepticon_ids, valuesets, entries, sense2word))
 
-        DBSession.flush()
+def dry_run_submission(
+    submission, fts='insert', chunk_size=None, profiler=NO_PROFILER,
+):
+    """Run the import of a submission without a data base.
+
+    The dictionary, its language and the comparison meanings are made up;
+    every Concepticon id referenced by a sense counts as comparison meaning.
+    Return the references to missing entries and media files.
+    """
+    records = submission.read_records(profiler)
+    concept_ids = set().union(*(
+        get_sense_concepticon_ids(cldf_sense)
+        for cldf_sense in records.senses))
+    comparison_meanings = {
+        concept_id: models.ComparisonMeaning(id=concept_id, pk=pk)
+        for pk, concept_id in enumerate(sorted(concept_ids), 1)}
+    return submission.add_to_database(
+        models.Dictionary(id=submission.id, pk=1),
+        models.Variety(id=submission.glottocode, pk=1),
+        comparison_meanings,
+        fts=fts,
+        chunk_size=chunk_size,
+        profiler=profiler,
+        dry_run=True)
@@ -0,0 +1,162 @@
+"""Columnar reader for the CLDF tables of large submissions.
+
+csvw reads tables row by row, converting each cell on its own.  This reader
+loads a table into Arrow column arrays instead and converts whole columns at
+once: null values, defaults and separators are handled by Arrow's compute
+functions.  Only columns with datatypes other than plain strings are still
+converted cell by cell (using csvw's own `Column.read`).
+
+The result is the very same as the one of `dictionaria.lib.cldf.read_table`.
+Tables which need csvw features not covered in here (dialects other than the
+default, comment lines, zipped data files, columns missing from the metadata)
+are handed over to `read_table`.
+
+Requires `pyarrow`, which is an optional dependency.
+"""
+
+import csv
+
+from csvw.dsv_dialects import Dialect
+
+from dictionaria.lib.cldf import ColumnNameMap, read_table
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+def open_table(table, archive=None, binary=False):
+    """Open the csv file of a table (in the `archive` if given)."""
+    if archive:
+        return archive.open_table(table, binary)
+    path = table.url.resolve(table.base)
+    if binary:
+        return open(path, 'rb')
+    return open(path, encoding='utf-8-sig', newline='')
+
+
+def read_header(table, archive=None):
+    """Return the column names from the header row of a table's csv file."""
+    with open_table(table, archive) as f:
+        return next(csv.reader(f), [])
+
+
+def is_plain_string(datatype):
+    """Return true iff. a datatype only accepts strings, up to a `format`."""
+    return datatype is None or (
+        datatype.base == 'string'
+        and datatype.length is None
+        and datatype.minLength is None
+        and datatype.maxLength is None)
+
+
+def check_format(array, column):
+    """Raise `ValueError` if a value doesn't match the column's `format`.
+
+    Return false if the format can't be checked by Arrow, though.
+    """
+    datatype = column.inherit('datatype')
+    if datatype is None or not datatype.format:
+        return True
+    try:
+        matches = pc.match_substring_regex(array, f'^({datatype.format})$')
+    except pyarrow.ArrowInvalid:
+        return False
+    if pc.any(pc.invert(matches)).as_py():
+        raise ValueError(f'invalid value in column {column.name}')
+    return True
+
+
+def convert_column(array, column):
+    """Convert the string values of a csv column to their Python values.
+
+    This follows `csvw.metadata.Column.read` to the letter, except that empty
+    lists and `None` are not told apart: they both mean there is no value.
+    """
+    null = column.inherit_null()
+    default = column.inherit('default')
+    separator = column.inherit('separator')
+    if not is_plain_string(column.inherit('datatype')):
+        return [column.read(value) for value in array.to_pylist()]
+
+    if default:
+        array = pc.if_else(pc.equal(array, ''), default, array)
+    missing = pc.is_in(array, value_set=pyarrow.array(null, pyarrow.string()))
+    if column.inherit('required') and pc.any(missing).as_py():
+        raise ValueError('required column value is missing')
+    if separator:
+        # an empty string is an empty list, whether it is a null value or not
+        missing = pc.or_(missing, pc.equal(array, ''))
+    array = pc.if_else(missing, pyarrow.scalar(None, pyarrow.string()), array)
+    if separator:
+        lists = pc.split_pattern(array, pattern=separator)
+        items = pc.list_flatten(lists)
+        if default:
+            items = pc.if_else(pc.equal(items, ''), default, items)
+        items = pc.if_else(
+            pc.is_in(items, value_set=pyarrow.array(null, pyarrow.string())),
+            pyarrow.scalar(None, pyarrow.string()),
+            items)
+        if not check_format(items, column):
+            return [column.read(value) for value in array.to_pylist()]
+        # `items` only has a single chunk, so `lists` needs one, too
+        lists = lists.combine_chunks()
+        array = pyarrow.ListArray.from_arrays(
+            lists.offsets, items.combine_chunks(), mask=lists.is_null())
+    elif not check_format(pc.drop_null(array), column):
+        return [column.read(value) for value in array.to_pylist()]
+    return array.to_pylist()
+
+
+def read_table_columnar(cldf, table_name, labels, archive=None):
+    """Iterate over rows of a table in a CLDF data set.
+
+    Drop-in replacement for `dictionaria.lib.cldf.read_table`.
+    """
+    table = cldf.get(table_name)
+    if not table:
+        return
+    if archive:
+        exists = archive.has_table(table)
+    else:
+        exists = table.url.resolve(table.base).exists()
+    dialect = table._get_dialect()
+    # comment lines are checked for below
+    default_dialect = Dialect(commentPrefix=dialect.commentPrefix)
+    if not exists or (
+            dialect.asdict(omit_defaults=False)
+            != default_dialect.asdict(omit_defaults=False)):
+        yield from read_table(cldf, table_name, labels, archive)
+        return
+
+    columns = {column.header: column for column in table.tableSchema.columns}
+    header = read_header(table, archive)
+    if len(set(header)) != len(header) or set(header) != set(columns):
+        yield from read_table(cldf, table_name, labels, archive)
+        return
+
+    with open_table(table, archive, binary=True) as f:
+        data = pa_csv.read_csv(
+            f,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pyarrow.string() for name in header},
+                strings_can_be_null=False))
+    if dialect.commentPrefix and data.num_rows and pc.any(pc.starts_with(
+        data.column(0), dialect.commentPrefix),
+    ).as_py():
+        yield from read_table(cldf, table_name, labels, archive)
+        return
+
+    colnames = tuple(columns[name].name for name in header)
+    row_labels = ColumnNameMap(table, labels).compile(colnames)
+    values = [
+        convert_column(data.column(name), columns[name]) for name in header]
+    for row in zip(*values):
+        yield {
+            label: cell
+            for label, cell in zip(row_labels, row)
+            if cell is not None and cell != '' and cell != []}
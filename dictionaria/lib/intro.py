@@ -0,0 +1,98 @@
+"""Rendering of the introduction texts of dictionaries.
+
+Introductions are written in markdown and may link to entries and sources of
+the dictionary, e.g. `[e1](entry)` or `[Doe2000](source)`.  When rendered to
+HTML, these links point to the respective pages and get the headword or the
+name of the source as label.
+
+Rendering is cached: As long as neither the markdown nor the links change, the
+HTML and the table of contents are read from a small JSON file.
+"""
+
+import hashlib
+import json
+
+from bs4 import BeautifulSoup
+from markdown import markdown
+
+from dictionaria.util import toc
+
+# Link targets used in introductions mapped to the routes they point to.
+LINK_ROUTES = {'entry': 'unit', 'source': 'source'}
+
+
+def intro_key(text):
+    """Return the hash identifying an introduction text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def parse_intro(text):
+    """Render markdown to HTML and return the parse tree."""
+    return BeautifulSoup(markdown(text, extensions=['tables']), 'html.parser')
+
+
+def iter_links(soup):
+    """Return all links to entries or sources in a parsed introduction."""
+    for a in soup.find_all('a', href=True):
+        if a['href'] in LINK_ROUTES and a.string:
+            yield a
+
+
+def link_targets(soup):
+    """Return the ids of all entries and sources linked from an introduction.
+
+    The ids are mapped to the link type, i.e. `entry` or `source`.
+    """
+    targets = {kind: set() for kind in LINK_ROUTES}
+    for a in iter_links(soup):
+        targets[a['href']].add(str(a.string))
+    return {kind: sorted(ids) for kind, ids in targets.items()}
+
+
+def format_intro(soup, links):
+    """Rewrite links *destructively* and return HTML and table of contents.
+
+    `links` maps link types and object ids to pairs of URL and label.  Links
+    to objects missing from `links` are left alone.
+    """
+    for a in iter_links(soup):
+        kind = a['href']
+        if a.string in links[kind]:
+            a['href'], a.string = links[kind][a.string]
+            if kind == 'entry':
+                a['class'] = 'lemma'
+    description, toc_ = toc(soup)
+    return description, str(toc_)
+
+
+def load_cached_intro(path, key):
+    """Return a cached introduction or `None` if there is none for `key`.
+
+    The cache entry is a dict with the link targets and the links the HTML
+    was rendered with, the HTML and the table of contents.
+    """
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            cached = json.load(f)
+    except ValueError:
+        print('WARNING: ignoring broken intro cache:', path)
+        return None
+    return cached if cached.get('key') == key else None
+
+
+def save_cached_intro(path, key, targets, links, description, toc_):
+    """Write a rendered introduction to a cache file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            dict(
+                key=key,
+                targets=targets,
+                links=links,
+                description=description,
+                toc=toc_),
+            f)
+    tmp_path.replace(path)
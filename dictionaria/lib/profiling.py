@@ -0,0 +1,135 @@
+"""Instrumentation showing where the import spends its time and memory.
+
+The import is split into phases (reading a table, creating the entries of a
+dictionary, flushing the session, ...).  For each phase the profiler records
+wall time, the number of rows produced and, optionally, the peak of the
+memory traced by `tracemalloc`.
+"""
+
+import json
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Phase:
+    """Measurements for a single phase of the import."""
+
+    def __init__(self, name, dictionary=None):
+        """Initialise measurements for phase `name` of an import."""
+        self.name = name
+        self.dictionary = dictionary
+        self.seconds = None
+        self.rows = None
+        self.peak_memory = None
+
+    def count(self, objects):
+        """Pass through `objects`, counting them as rows of the phase."""
+        self.rows = self.rows or 0
+        for obj in objects:
+            self.rows += 1
+            yield obj
+
+    def as_json(self):
+        """Return measurements as a JSON-serialisable dictionary."""
+        return {
+            'dictionary': self.dictionary,
+            'phase': self.name,
+            'seconds': self.seconds,
+            'rows': self.rows,
+            'peak_memory': self.peak_memory,
+        }
+
+
+class ImportProfiler:
+    """Object collecting measurements for the phases of an import.
+
+    Phases are not meant to be nested: the memory peak is reset at the
+    beginning of each phase.
+    """
+
+    def __init__(self, trace_memory=True):
+        """Initialise profiler, optionally tracing memory allocations.
+
+        Note that tracing memory slows down the import considerably.
+        """
+        self.trace_memory = trace_memory
+        self.phases = []
+
+    def child(self):
+        """Return an empty profiler with the same settings.
+
+        Meant for measuring work done in another process, which can be added
+        to this profiler later on using `merge`.
+        """
+        return ImportProfiler(self.trace_memory)
+
+    def merge(self, phases):
+        """Add phases measured by another profiler."""
+        self.phases.extend(phases)
+
+    @contextmanager
+    def phase(self, name, dictionary=None):
+        """Measure the code in the `with` block as a phase of the import."""
+        phase = Phase(name, dictionary)
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.seconds = time.perf_counter() - start
+            if self.trace_memory:
+                _, phase.peak_memory = tracemalloc.get_traced_memory()
+            self.phases.append(phase)
+
+    def report(self):
+        """Return all measurements along with the total time per dictionary."""
+        totals = defaultdict(float)
+        for phase in self.phases:
+            totals[phase.dictionary] += phase.seconds
+        return {
+            'phases': [phase.as_json() for phase in self.phases],
+            'dictionaries': {
+                dictionary: seconds
+                for dictionary, seconds in totals.items()
+                if dictionary is not None},
+            'seconds': sum(totals.values()),
+        }
+
+    def write_report(self, path):
+        """Write measurements to a JSON file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+class _NullPhase:
+    def count(self, objects):
+        return objects
+
+
+class NullProfiler:
+    """Profiler which doesn't measure anything."""
+
+    phases = ()
+
+    def child(self):
+        """Return the profiler itself."""
+        return self
+
+    def merge(self, phases):
+        """Ignore measurements from other profilers."""
+
+    @contextmanager
+    def phase(self, name, dictionary=None):
+        """Don't measure anything."""
+        yield _NullPhase()
+
+    def write_report(self, path):
+        """Don't write anything."""
+
+
+NO_PROFILER = NullProfiler()
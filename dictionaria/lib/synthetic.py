@@ -0,0 +1,349 @@
+"""Generator for synthetic dictionary submissions.
+
+The generated submissions have the same layout as the ones in the
+dictionaria-intern repository (`cldf/`, `etc/md.json`, `etc/cdstar.json`,
+`raw/intro.md`) and use most of the features of real submissions: media
+files, sources, cross-references between entries, custom fields and
+translations into additional meta languages.  This makes them useful for
+testing and benchmarking the import with dictionaries of arbitrary size.
+
+    python -m dictionaria.lib.synthetic OUTPUT_DIR [ENTRIES]
+"""
+
+import argparse
+import hashlib
+import json
+import random
+from pathlib import Path
+
+from pycldf import Dictionary, Source
+
+SYLLABLES = ['ka', 'po', 'li', 'mu', 'ta', 'ne', 'so', 'ri', 'wa', 'ge']
+PARTS_OF_SPEECH = ['n', 'v', 'adj', 'adv']
+SEMANTIC_DOMAINS = ['body', 'nature', 'kinship', 'food', 'motion']
+DIALECTS = ['north', 'south', '']
+
+# keys of the meta languages in `etc/md.json`, in the order of the
+# `alt_translation<n>` columns
+METALANGUAGE_IDS = ['gxx', 'gxy']
+
+# Concepticon ids used in the `Comparison_Meaning` column
+CONCEPTICON_IDS = list(range(1277, 1327))
+
+MEDIA_REFERENCE = 'http://cldf.clld.org/v1.0/terms.rdf#mediaReference'
+SOURCE = 'http://cldf.clld.org/v1.0/terms.rdf#source'
+
+
+def media_id(name):
+    """Return the (fake) checksum of a media file."""
+    return hashlib.md5(name.encode('utf-8')).hexdigest()
+
+
+def entry_media(i, media_every):
+    """Return names of the media files of entry `i`."""
+    return [f'entry{i}.wav'] if media_every and i % media_every == 0 else []
+
+
+def sense_media(i, media_every):
+    """Return names of the media files of the senses of entry `i`."""
+    return (
+        [f'sense{i}.jpg']
+        if media_every and i % (media_every * 3) == 0
+        else [])
+
+
+def example_media(i, media_every):
+    """Return names of the media files of the examples of entry `i`."""
+    return (
+        [f'example{i}.wav']
+        if media_every and i % (media_every * 5) == 0
+        else [])
+
+
+def iter_media_names(entries, media_every):
+    """Return names of all media files of a submission."""
+    for i in range(1, entries + 1):
+        yield from entry_media(i, media_every)
+        yield from sense_media(i, media_every)
+        yield from example_media(i, media_every)
+
+
+def mimetype(name):
+    """Return mime type of a media file."""
+    return 'image/jpeg' if name.endswith('.jpg') else 'audio/x-wav'
+
+
+class SyntheticDictionary:
+    """Description of a synthetic dictionary submission.
+
+    Every entry has `senses` senses and `examples` examples.  Every
+    `media_every`-th entry has a sound file (senses and examples have media
+    files less often), every `crossref_every`-th entry refers to the previous
+    entry and to a random synonym.  Senses and examples are translated into
+    (up to two) `metalanguages`.  `custom_fields` are the fields shown in the
+    list of entries, i.e. names of columns or meta languages.
+    """
+
+    def __init__(
+        self, sid='synthetic', entries=1000, senses=2, examples=1,
+        media_every=5, crossref_every=11, glottocode='abcd1234', seed=1,
+        custom_fields=('Etymology', 'Spanish'),
+        metalanguages=('Spanish', 'French'),
+    ):
+        """Initialise submission parameters."""
+        if len(metalanguages) > len(METALANGUAGE_IDS):
+            raise ValueError(
+                f'at most {len(METALANGUAGE_IDS)} meta languages are supported')
+        self.sid = sid
+        self.entries = entries
+        self.senses = senses
+        self.examples = examples
+        self.media_every = media_every
+        self.crossref_every = crossref_every
+        self.glottocode = glottocode
+        self.seed = seed
+        self.custom_fields = list(custom_fields)
+        self.metalanguages = list(metalanguages)
+
+    def translation(self, number, text):
+        """Return `text` translated into the `number`-th meta language."""
+        if number > len(self.metalanguages):
+            return ''
+        return f'{self.metalanguages[number - 1].lower()} {text}'
+
+    def iter_entries(self):
+        """Generate rows for the entry table."""
+        rnd = random.Random(self.seed)
+        for i in range(1, self.entries + 1):
+            yield {
+                'ID': f'e{i}',
+                'Language_ID': self.glottocode,
+                'Headword': ''.join(
+                    rnd.choice(SYLLABLES) for _ in range(rnd.randint(1, 3))),
+                'Part_Of_Speech': rnd.choice(PARTS_OF_SPEECH),
+                'Media_IDs': [
+                    media_id(name)
+                    for name in entry_media(i, self.media_every)],
+                'Source': ['Doe2000[12]'] if i % 7 == 0 else [],
+                'Main_Entry': (
+                    [f'e{i - 1}']
+                    if self.crossref_every and i > 1
+                    and i % self.crossref_every == 0
+                    else []),
+                'Etymology': f'from proto-form {i}' if i % 3 == 0 else '',
+                'Dialect': rnd.choice(DIALECTS),
+            }
+
+    def iter_senses(self):
+        """Generate rows for the sense table."""
+        rnd = random.Random(self.seed + 1)
+        for i in range(1, self.entries + 1):
+            for j in range(1, self.senses + 1):
+                concept_id = CONCEPTICON_IDS[i % len(CONCEPTICON_IDS)]
+                yield {
+                    'ID': f's{i}-{j}',
+                    'Entry_ID': f'e{i}',
+                    'Description': f'meaning {i}.{j}',
+                    'alt_translation1': self.translation(1, f'{i}.{j}'),
+                    'alt_translation2': (
+                        self.translation(2, f'{i}.{j}') if j == 1 else ''),
+                    'Semantic_Domain': rnd.choice(SEMANTIC_DOMAINS),
+                    'Comparison_Meaning': (
+                        f'CONCEPT [{concept_id}]' if j == 1 else ''),
+                    'Synonym': (
+                        [f'e{rnd.randint(1, self.entries)}']
+                        if self.crossref_every
+                        and i % (self.crossref_every + 2) == 0
+                        else []),
+                    'Media_IDs': (
+                        [
+                            media_id(name)
+                            for name in sense_media(i, self.media_every)]
+                        if j == 1 else []),
+                    'Source': ['Doe2000'] if i % 19 == 0 else [],
+                    'Scientific_Name': (
+                        f'Species {i}' if i % 23 == 0 else ''),
+                }
+
+    def iter_examples(self):
+        """Generate rows for the example table."""
+        for i in range(1, self.entries + 1):
+            for k in range(self.examples):
+                sense_ids = [f's{i}-1']
+                if i > 1:
+                    sense_ids.append(f's{i - 1}-1')
+                yield {
+                    'ID': f'x{i}-{k}',
+                    'Language_ID': self.glottocode,
+                    'Primary_Text': f'ka po li {i}',
+                    'Analyzed_Word': ['ka', 'po', 'li'],
+                    'Gloss': ['$sg', 'go', 'DEM'],
+                    'Translated_Text': f'I go there {i}',
+                    'Meta_Language_ID': 'eng',
+                    'Sense_IDs': ' ; '.join(sense_ids),
+                    'alt_translation1': self.translation(1, f'there {i}'),
+                    'Corpus_Reference': 'corpus',
+                    'Speaker': 'AB',
+                    'Comment': 'a comment' if k else '',
+                    'Media_IDs': (
+                        [
+                            media_id(name)
+                            for name in example_media(i, self.media_every)]
+                        if k == 0 else []),
+                    'Source': ['Doe2000[3]'] if i % 31 == 0 else [],
+                }
+
+    def iter_media(self):
+        """Generate rows for the media table."""
+        for number, name in enumerate(
+            iter_media_names(self.entries, self.media_every), 1,
+        ):
+            md5 = media_id(name)
+            yield {
+                'ID': md5,
+                'Name': name,
+                'Description': f'file {number}',
+                'Media_Type': mimetype(name),
+                'Download_URL': f'https://example.org/{md5}',
+            }
+
+    def cdstar(self):
+        """Return the contents of `etc/cdstar.json`."""
+        return {
+            media_id(name): {
+                'original': name,
+                'mimetype': mimetype(name),
+                'size': 1024,
+                'url': f'https://example.org/{media_id(name)}',
+            }
+            for name in iter_media_names(self.entries, self.media_every)}
+
+    def metadata(self):
+        """Return the contents of `etc/md.json`."""
+        return {
+            'language': {'name': 'Synthetic', 'glottocode': self.glottocode},
+            'authors': [
+                'Jane Roe', {'name': 'John Doe', 'affiliation': 'Nowhere'}],
+            'properties': {
+                'title': f'A synthetic dictionary ({self.sid})',
+                'metalanguages': dict(zip(METALANGUAGE_IDS, self.metalanguages)),
+                'custom_fields': self.custom_fields,
+                'second_tab': ['Dialect', 'Scientific_Name'],
+                'entry_custom_order': ['Etymology', 'Dialect'],
+                'labels': {'et': 'Etymology', 'dl': 'Dialect'},
+                'entry_map': {'et': 'Etymology', 'dl': 'Dialect'},
+            },
+        }
+
+    def intro(self):
+        """Return the contents of `raw/intro.md`."""
+        return (
+            '# Introduction\n\n'
+            'A synthetic dictionary; see e.g. [e1](entry) and '
+            '[Doe2000](source).\n\n'
+            '## Sources\n\n'
+            'Doe, John. 2000. A grammar.\n')
+
+    def write(self, path):
+        """Write the submission to directory `path`."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        cldf = Dictionary.in_dir(path / 'cldf')
+        cldf.add_component('LanguageTable')
+        cldf.add_component('ExampleTable')
+        cldf.add_component('MediaTable')
+        cldf.add_columns(
+            'EntryTable',
+            {'name': 'Media_IDs', 'separator': ' ; ', 'propertyUrl': MEDIA_REFERENCE},
+            {'name': 'Source', 'separator': ';', 'propertyUrl': SOURCE},
+            {'name': 'Main_Entry', 'separator': ' ; '},
+            'Etymology',
+            'Dialect')
+        cldf.add_foreign_key('EntryTable', 'Main_Entry', 'EntryTable', 'ID')
+        cldf.add_columns(
+            'SenseTable',
+            'alt_translation1',
+            'alt_translation2',
+            'Semantic_Domain',
+            'Comparison_Meaning',
+            {'name': 'Synonym', 'separator': ' ; '},
+            {'name': 'Media_IDs', 'separator': ' ; ', 'propertyUrl': MEDIA_REFERENCE},
+            {'name': 'Source', 'separator': ';', 'propertyUrl': SOURCE},
+            'Scientific_Name')
+        cldf.add_foreign_key('SenseTable', 'Synonym', 'EntryTable', 'ID')
+        cldf.add_columns(
+            'ExampleTable',
+            'Sense_IDs',
+            'alt_translation1',
+            'Corpus_Reference',
+            'Speaker',
+            {'name': 'Media_IDs', 'separator': ' ; ', 'propertyUrl': MEDIA_REFERENCE},
+            {'name': 'Source', 'separator': ';', 'propertyUrl': SOURCE})
+        cldf.add_sources(Source(
+            'book', 'Doe2000',
+            author='Doe, John', title='A grammar', year='2000'))
+        cldf.write(
+            LanguageTable=[
+                {
+                    'ID': self.glottocode,
+                    'Name': 'Synthetic',
+                    'Glottocode': self.glottocode,
+                },
+                {'ID': 'eng', 'Name': 'English'},
+                {'ID': 'spa', 'Name': 'Spanish'},
+                {'ID': 'fra', 'Name': 'French'},
+            ],
+            EntryTable=self.iter_entries(),
+            SenseTable=self.iter_senses(),
+            ExampleTable=self.iter_examples(),
+            MediaTable=self.iter_media())
+
+        path.joinpath('etc').mkdir(exist_ok=True)
+        with open(path / 'etc' / 'md.json', 'w', encoding='utf-8') as f:
+            json.dump(self.metadata(), f, indent=2)
+        with open(path / 'etc' / 'cdstar.json', 'w', encoding='utf-8') as f:
+            json.dump(self.cdstar(), f, indent=2)
+        path.joinpath('raw').mkdir(exist_ok=True)
+        with open(path / 'raw' / 'intro.md', 'w', encoding='utf-8') as f:
+            f.write(self.intro())
+        return path
+
+
+def main(argv=None):
+    """Write a synthetic submission to disk."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('output_dir', type=Path)
+    parser.add_argument('entries', type=int, nargs='?', default=1000)
+    parser.add_argument('--senses', type=int, default=2)
+    parser.add_argument('--examples', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument(
+        '--media-every', type=int, default=5,
+        help='every n-th entry has a media file (0: no media files)')
+    parser.add_argument(
+        '--crossref-every', type=int, default=11,
+        help='every n-th entry refers to other entries (0: no references)')
+    parser.add_argument(
+        '--custom-fields', nargs='*', default=['Etymology', 'Spanish'],
+        help='fields shown in the list of entries')
+    parser.add_argument(
+        '--metalanguages', nargs='*', default=['Spanish', 'French'],
+        help='up to two meta languages senses and examples are translated into')
+    args = parser.parse_args(argv)
+    SyntheticDictionary(
+        sid=args.output_dir.name,
+        entries=args.entries,
+        senses=args.senses,
+        examples=args.examples,
+        media_every=args.media_every,
+        crossref_every=args.crossref_every,
+        seed=args.seed,
+        custom_fields=args.custom_fields,
+        metalanguages=args.metalanguages,
+    ).write(args.output_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,19 +1,26 @@
 """Data base initialisation."""
 
 import datetime
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+import shutil
+import time
+import urllib.parse
+import urllib.request
 from collections import defaultdict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from itertools import chain
 from pathlib import Path
 
 import git
-from bs4 import BeautifulSoup
-from markdown import markdown
+import transaction
 from nameparser import HumanName
-from pyconcepticon.api import Concepticon
-from sqlalchemy import not_
-from sqlalchemy.orm import joinedload
+from pyramid.settings import asbool
+from sqlalchemy import create_engine, literal, select, union_all
+from zope.sqlalchemy import mark_changed
 
 import cldfcatalog
 from clld.cliutil import Data
@@ -21,17 +28,22 @@ from clld.db import fts
 from clld.db.meta import DBSession
 from clld.db.models import common
 from clld.util import LGR_ABBRS
-from clld_glottologfamily_plugin.util import load_families
 from clldutils.misc import slug
-from pycldf.ext.discovery import get_dataset
 
 import dictionaria
-from dictionaria.lib.cldf import Submission
+from dictionaria.lib.catalogs import (
+    load_families, read_concepticon_conceptsets,
+)
+from dictionaria.lib.cldf import FTS_STAGING, parse_submission
+from dictionaria.lib.intro import (
+    LINK_ROUTES, format_intro, intro_key, link_targets, load_cached_intro,
+    parse_intro, save_cached_intro,
+)
+from dictionaria.lib.profiling import NO_PROFILER, ImportProfiler
 from dictionaria.models import (
-    ComparisonMeaning, Dictionary, Example, Meaning, Meaning_files, Variety,
-    Word,
+    ComparisonMeaning, Dictionary, DictionarySource, Variety, Word,
 )
-from dictionaria.util import join, toc
+from dictionaria.util import join, split
 
 Ed = namedtuple('Ed', 'id name')
 
@@ -44,32 +56,122 @@ DICTIONARIA_EDITORS = [
 WEBAPP_REPO = Path(dictionaria.__file__).parent
 INTERNAL_REPO = WEBAPP_REPO.joinpath('..', '..', 'dictionaria-intern')
 
+DOI_RESOLVER = 'https://doi.org'
+
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_TIMEOUT = 600
+DOWNLOAD_RETRIES = 2
+
+PARSE_PROCESSES = os.cpu_count() or 1
+RECORD_CACHE = INTERNAL_REPO / 'datasets' / '.records'
+CATALOG_CACHE = INTERNAL_REPO / 'datasets' / '.catalogs'
+INTRO_CACHE = INTERNAL_REPO / 'datasets' / '.intros'
+
+
+def time_left(deadline):
+    """Return the seconds left until `deadline` (`None` for no deadline).
+
+    Raise `TimeoutError` once the deadline has passed.
+    """
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise TimeoutError('download timed out')
+    return left
+
+
+def make_deadline(timeout):
+    """Return the deadline `timeout` seconds from now (`None` for no limit)."""
+    return None if timeout is None else time.monotonic() + timeout
 
-def zenodo_download(sid, contrib_md, cache_dir):
-    """Download a contribution from Zenodo."""
+
+def fetch_zenodo_archive(url, path, timeout=None):
+    """Save the zip archive of the Zenodo record a DOI URL resolves to.
+
+    The DOI resolver redirects to the record's page, and the record's meta
+    data comes from the API of the same site.  Like `cldfzenodo`, this
+    prefers the release on GitHub the record was made from, so as not to run
+    into Zenodo's rate limit.  `timeout` limits the whole download (in
+    seconds).
+    """
+    # cldfzenodo is only needed for submissions released on Zenodo
+    from cldfzenodo.record import Record
+
+    deadline = make_deadline(timeout)
+    with urllib.request.urlopen(url, timeout=time_left(deadline)) as response:
+        record_url = urllib.parse.urlsplit(response.geturl())
+    match = re.fullmatch(r'/records?/([0-9]+)', record_url.path)
+    if not match:
+        raise ValueError(f'{url} does not resolve to a Zenodo record')
+    api_url = urllib.parse.urlunsplit(
+        (record_url.scheme, record_url.netloc,
+         f'/api/records/{match.group(1)}', '', ''))
+    with urllib.request.urlopen(api_url, timeout=time_left(deadline)) as response:
+        record = Record.from_dict(json.load(response))
+    if record.github_repos and record.github_repos.release_url:
+        archive_url = record.github_repos.release_url
+    else:
+        archive_urls = [
+            download_url
+            for download_url in (
+                re.sub(r'/content$', '', u) for u in record.download_urls)
+            if download_url.endswith('.zip')]
+        if not archive_urls:
+            raise ValueError(f'no zip archive in Zenodo record {record.doi}')
+        archive_url = archive_urls[0]
+    with urllib.request.urlopen(archive_url, timeout=time_left(deadline)) as response, \
+            open(path, 'wb') as f:
+        for chunk in iter(lambda: response.read(2 ** 20), b''):
+            f.write(chunk)
+            time_left(deadline)
+
+
+def zenodo_download(
+    sid, contrib_md, cache_dir, timeout=None,
+    fetch_archive=fetch_zenodo_archive,
+):
+    """Download a contribution from Zenodo.
+
+    The zip archive is kept as it is; submissions are read straight from the
+    archive (see `dictionaria.lib.archive`).  It is downloaded to a
+    `.partial` file first, so an aborted download is never mistaken for a
+    complete one.  `timeout` limits the download (in seconds).
+    """
     doi = contrib_md['doi']
-    path = cache_dir / f'{sid}-{slug(doi)}'
+    path = cache_dir / f'{sid}-{slug(doi)}.zip'
     if not path.exists():
         print(' * downloading dataset from Zenodo; doi:', doi)
-        _ = get_dataset(f'https://doi.org/{doi}', path)
+        partial = path.with_name(f'{path.name}.partial')
+        try:
+            fetch_archive(f'{DOI_RESOLVER}/{doi}', partial, timeout)
+        except Exception:
+            partial.unlink(missing_ok=True)
+            raise
+        partial.rename(path)
         print('   done.')
-    if not (path / 'cldf').exists():
-        for subpath in path.glob('*'):
-            if (subpath / 'cldf').exists():
-                path = subpath
-                break
     return path
 
 
-def git_download(sid, contrib_md, cache_dir):
-    """Download a contribution using git."""
+def git_download(sid, contrib_md, cache_dir, timeout=None):
+    """Download a contribution using git.
+
+    `timeout` limits the run time (in seconds) of all git commands together.
+    """
+    deadline = make_deadline(timeout)
     origin = contrib_md.get('repo')
     checkout = contrib_md.get('checkout')
     path = (cache_dir / sid).resolve()
 
     if not path.exists():
         print(' * cloning', origin, 'into', path)
-        git.Git().clone(origin, path)
+        try:
+            git.Git().clone(
+                origin, path, kill_after_timeout=time_left(deadline))
+        except git.exc.GitCommandError:
+            # don't leave half-cloned repos lying around
+            shutil.rmtree(path, ignore_errors=True)
+            raise
     if not path.exists():
         raise ValueError(f'Could not clone {origin}')
 
@@ -80,7 +182,7 @@ def git_download(sid, contrib_md, cache_dir):
         return path
 
     for remote in repo.remotes:
-        remote.fetch()
+        remote.fetch(kill_after_timeout=time_left(deadline))
 
     if checkout:
         for branch in repo.branches:
@@ -109,17 +211,294 @@ def git_download(sid, contrib_md, cache_dir):
     return path
 
 
-def download_data(sid, contrib_md, cache_dir):
-    """Download data of a contribution to `cache_dir`."""
+def download_data(
+    sid, contrib_md, cache_dir, timeout=None,
+    fetch_archive=fetch_zenodo_archive,
+):
+    """Download data of a contribution to `cache_dir`.
+
+    `timeout` limits the download (in seconds).
+    """
     if contrib_md.get('doi'):
-        return zenodo_download(sid, contrib_md, cache_dir)
+        return zenodo_download(
+            sid, contrib_md, cache_dir, timeout, fetch_archive)
     elif contrib_md.get('repo'):
-        return git_download(sid, contrib_md, cache_dir)
+        return git_download(sid, contrib_md, cache_dir, timeout)
     else:
         assert (cache_dir / sid).is_dir(), 'dataset folder must exist'
         return cache_dir / sid
 
 
+def download_with_retries(
+    sid, contrib_md, cache_dir, timeout, retries,
+    fetch_archive=fetch_zenodo_archive,
+):
+    """Download a contribution, trying again up to `retries` times on failure.
+
+    All attempts together must finish within `timeout` seconds.
+    """
+    deadline = make_deadline(timeout)
+    attempt = 0
+    while True:
+        try:
+            return download_data(
+                sid, contrib_md, cache_dir, time_left(deadline), fetch_archive)
+        except Exception as e:
+            if attempt >= retries or (
+                    deadline is not None and time.monotonic() >= deadline):
+                raise
+            attempt += 1
+            print(f'WARNING: {sid}: download failed ({e}); retrying ...')
+
+
+def download_submissions(
+    submission_info, cache_dir,
+    workers=DOWNLOAD_WORKERS, timeout=DOWNLOAD_TIMEOUT,
+    retries=DOWNLOAD_RETRIES, fetch_archive=fetch_zenodo_archive,
+):
+    """Download all contributions concurrently.
+
+    Downloads are distributed over a pool of `workers` threads.  Each
+    dictionary gets up to `retries` additional attempts, which must all be
+    done within its own `timeout` (in seconds).
+
+    Return a pair `(data_dirs, errors)`, mapping submission ids to their data
+    directories (or zip archives, for submissions from Zenodo) and to the
+    exception raised by their last attempt, respectively.  `data_dirs` keeps
+    the order of `submission_info`.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            sid: pool.submit(
+                download_with_retries,
+                sid, sinfo, cache_dir, timeout, retries, fetch_archive)
+            for sid, sinfo in submission_info.items()}
+        data_dirs, errors = {}, {}
+        for sid, future in futures.items():
+            try:
+                data_dirs[sid] = future.result()
+            except Exception as e:
+                errors[sid] = e
+    return data_dirs, errors
+
+
+def parse_submissions(
+    data_dirs, processes=PARSE_PROCESSES, cache_dir=None, profiler=NO_PROFILER,
+    reader='csvw', fingerprints=None,
+):
+    """Read and parse all submissions, distributed over worker processes.
+
+    Return submissions mapped to their ids, with all of their records already
+    parsed, so the main process only has to load them into the data base.
+    Parsed records are cached in `cache_dir` if given.  `fingerprints` maps
+    submission ids to the fingerprints of their files, as far as they are
+    known already.
+    """
+    fingerprints = fingerprints or {}
+    if processes <= 1 or len(data_dirs) <= 1:
+        submissions = {
+            sid: parse_submission(
+                sid, data_dir, cache_dir, profiler.child(), reader,
+                fingerprints.get(sid))
+            for sid, data_dir in data_dirs.items()}
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = {
+                sid: pool.submit(
+                    parse_submission, sid, data_dir, cache_dir,
+                    profiler.child(), reader, fingerprints.get(sid))
+                for sid, data_dir in data_dirs.items()}
+            submissions = {
+                sid: future.result() for sid, future in futures.items()}
+    for submission in submissions.values():
+        profiler.merge(submission.phases)
+    return submissions
+
+
+def load_submission(
+    db_url, submission, loader='orm', fts='insert', chunk_size=None,
+    profiler=NO_PROFILER,
+):
+    """Add a submission to the data base using a connection of its own.
+
+    The submission's dictionary and language as well as the comparison
+    meanings must already be committed to the data base.  Everything else is
+    added in a transaction of its own.  Primary keys come straight from the
+    tables' sequences, so any number of submissions can be loaded like this
+    at the same time.
+
+    Return the phases measured by `profiler`.
+
+    This is a module-level function, so it can be sent to worker processes
+    (which must not share the data base connection of their parent).
+    """
+    engine = create_engine(db_url)
+    DBSession.remove()
+    DBSession.configure(bind=engine)
+    try:
+        with transaction.manager:
+            dictionary = DBSession.query(Dictionary)\
+                .filter(Dictionary.id == submission.id)\
+                .one()
+            language = DBSession.query(Variety)\
+                .filter(Variety.id == submission.glottocode)\
+                .one()
+            comparison_meanings = {
+                concept.id: concept
+                for concept in DBSession.query(ComparisonMeaning)}
+            submission.add_to_database(
+                dictionary, language, comparison_meanings, loader=loader,
+                fts=fts, chunk_size=chunk_size, profiler=profiler)
+    finally:
+        DBSession.remove()
+        engine.dispose()
+    return profiler.phases
+
+
+def load_submissions(
+    submissions, db_url, processes, loader='orm', fts='insert',
+    chunk_size=None, profiler=NO_PROFILER,
+):
+    """Load submissions into the data base, distributed over worker processes.
+
+    Each worker loads a submission using its own connection and transaction
+    (see `load_submission`), so everything the dictionaries depend on must be
+    committed beforehand.  Workers are spawned rather than forked, so they
+    don't inherit the connections of the main process.
+
+    Return the exceptions raised by failed workers mapped to the submission
+    ids.
+    """
+    context = multiprocessing.get_context('spawn')
+    errors = {}
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        futures = {
+            sid: pool.submit(
+                load_submission, db_url, submission, loader, fts, chunk_size,
+                profiler.child())
+            for sid, submission in submissions.items()}
+        for sid, future in futures.items():
+            try:
+                profiler.merge(future.result())
+            except Exception as e:
+                errors[sid] = e
+            else:
+                print('...', sid, 'done')
+    return errors
+
+
+def read_submission_info():
+    """Return meta data of all submissions from the internal repo."""
+    with open(INTERNAL_REPO / 'contributions.json', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def download_datasets(args, submission_info):
+    """Download all submissions listed in `submission_info`.
+
+    Submissions which could not be downloaded are reported and left out, so
+    the others can be imported regardless.
+
+    Return the data directories mapped to the submission ids.
+    """
+    with import_profiler(args).phase('download_submissions'):
+        data_dirs, download_errors = download_submissions(
+            submission_info, INTERNAL_REPO / 'datasets',
+            workers=import_setting(
+                args, 'download_workers', DOWNLOAD_WORKERS, int),
+            timeout=import_setting(
+                args, 'download_timeout', DOWNLOAD_TIMEOUT, float),
+            retries=import_setting(
+                args, 'download_retries', DOWNLOAD_RETRIES, int))
+    for sid, error in download_errors.items():
+        print(f'{sid}: download failed: {error!r}')
+    if download_errors:
+        print('could not download:', ', '.join(download_errors))
+    return data_dirs
+
+
+def parse_datasets(args, data_dirs, fingerprints=None):
+    """Parse all submissions in `data_dirs`.
+
+    `fingerprints` are the fingerprints of submissions computed before.
+    """
+    print('parsing submissions ...')
+    use_cache = import_setting(args, 'record_cache', True, asbool)
+    submissions = parse_submissions(
+        data_dirs,
+        import_setting(args, 'parse_processes', PARSE_PROCESSES, int),
+        cache_dir=RECORD_CACHE if use_cache else None,
+        profiler=import_profiler(args),
+        reader=import_setting(args, 'reader', 'csvw'),
+        fingerprints=fingerprints)
+    print('... done')
+    return submissions
+
+
+def dictionary_fingerprint(fingerprint, sinfo):
+    """Return the fingerprint recorded for an imported dictionary.
+
+    This combines the `fingerprint` of the submission's files with its entry
+    in `contributions.json` (DOI, publication date, series, ...), which
+    goes into the data base as well.
+    """
+    checksum = hashlib.sha256(fingerprint.encode('utf-8'))
+    checksum.update(json.dumps(sinfo, sort_keys=True).encode('utf-8'))
+    return checksum.hexdigest()
+
+
+def changed_submissions(fingerprints, submission_info, dictionaries):
+    """Return the submissions that changed since their import.
+
+    `fingerprints` maps submission ids to the fingerprints of their files
+    (see `submission_fingerprint`) and `dictionaries` are the dictionaries
+    already in the data base.  Changes are detected by comparing the
+    fingerprint of the submission's files and its meta data in
+    `submission_info` with the one recorded during the last import.
+
+    Return the fingerprints of the changed submissions.
+    """
+    recorded = {d.id: d.jsondata.get('fingerprint') for d in dictionaries}
+    return {
+        sid: fingerprint
+        for sid, fingerprint in fingerprints.items()
+        if dictionary_fingerprint(fingerprint, submission_info[sid])
+        != recorded.get(sid)}
+
+
+def import_setting(args, name, default, type_=str):
+    """Return an import option from the app settings.
+
+    Options are read from the `dictionaria.<name>` keys of the ini file's
+    `[app:main]` section.
+    """
+    value = (getattr(args, 'settings', None) or {}).get(f'dictionaria.{name}')
+    return default if value is None else type_(value)
+
+
+def import_profiler(args):
+    """Return the profiler measuring the phases of the import.
+
+    The profiler is created on first use and kept in `args`, so `main` and
+    `prime_cache` share it.  Unless a report file is configured, nothing is
+    measured.
+    """
+    if getattr(args, 'profiler', None) is None:
+        if import_setting(args, 'profile', None):
+            args.profiler = ImportProfiler(
+                trace_memory=import_setting(args, 'profile_memory', True, asbool))
+        else:
+            args.profiler = NO_PROFILER
+    return args.profiler
+
+
+def write_profile(args):
+    """Write the measurements of the import to the configured report file."""
+    if (report_path := import_setting(args, 'profile', None)):
+        import_profiler(args).write_report(report_path)
+        print('import profile written to', report_path)
+
+
 def iter_gloss_abbrevs(leipzig_glossing_rules_abbrevs):
     """Return gloss abbreviations based on the Leipzig Glossing Rules."""
     return (
@@ -127,11 +506,11 @@ def iter_gloss_abbrevs(leipzig_glossing_rules_abbrevs):
         for id_, name in leipzig_glossing_rules_abbrevs.items())
 
 
-def make_comparison_meanings(concepticon):
-    """Return comparison meaning objects from Concepticon."""
+def make_comparison_meanings(conceptsets):
+    """Return comparison meaning objects from Concepticon concept sets."""
     # make sure there's only one comparison meaning per gloss
     concepts_by_gloss = {}
-    for conceptset in concepticon.conceptsets.values():
+    for conceptset in conceptsets:
         if conceptset.gloss not in concepts_by_gloss:
             concepts_by_gloss[conceptset.gloss] = conceptset
     return {
@@ -181,7 +560,7 @@ def make_dictionary(submission, sinfo, language):
         published=datetime.date(*map(int, date_published.split('-'))),
         doi=sinfo.get('doi'),
         git_repo=git_https,
-        jsondata=submission.props)
+        jsondata=dict(submission.props))
 
 
 def make_dictionaries(submissions, submission_info, languages):
@@ -249,35 +628,56 @@ def iter_dictionary_authors(dictionary_authors, contributors, dictionaries):
         for number, author in enumerate(authors, 1))
 
 
-def collect_link_labels(id_name_pairs):
-    """Map object ids to their names to use as labels in markdown links."""
-    labels = defaultdict(dict)
-    for id_, name in id_name_pairs:
-        obj_id, submission_id = id_.split('-', maxsplit=1)
-        labels[obj_id][submission_id] = name
-    return labels
-
+def resolve_links(dictionary, request, targets):
+    """Return URLs and labels for the entries and sources linked in an intro.
 
-def add_formatted_description(dictionary, request, entry_labels, source_labels):
-    """Render markdown descriptions *destructively* to HTML."""
+    All link targets are looked up with a single query.
+    """
+    ids = {
+        kind: [f'{dictionary.id}-{obj_id}' for obj_id in obj_ids]
+        for kind, obj_ids in targets.items()}
+    query = union_all(
+        select(literal('entry'), Word.id, Word.name).where(
+            Word.dictionary_pk == dictionary.pk, Word.id.in_(ids['entry'])),
+        select(
+            literal('source'), DictionarySource.id, DictionarySource.name,
+        ).where(
+            DictionarySource.dictionary_pk == dictionary.pk,
+            DictionarySource.id.in_(ids['source'])))
+    links = {kind: {} for kind in LINK_ROUTES}
+    for kind, id_, name in DBSession.execute(query):
+        links[kind][id_[len(dictionary.id) + 1:]] = [
+            request.route_path(LINK_ROUTES[kind], id=id_), name]
+    return links
+
+
+def add_formatted_description(dictionary, request, cache_dir=None):
+    """Render markdown descriptions *destructively* to HTML.
+
+    If `cache_dir` is given, the rendered description is cached in there and
+    only rendered again if the markdown or the linked entries and sources
+    change.
+    """
     if not dictionary.description:
         return
-    soup = BeautifulSoup(
-        markdown(dictionary.description, extensions=['tables']),
-        'html.parser')
-    for a in soup.find_all('a', href=True):
-        if a['href'] == 'entry':
-            if a.string in entry_labels[dictionary.id]:
-                a['class'] = 'lemma'
-                a['href'] = request.route_path(
-                    'unit', id=f'{dictionary.id}-{a.string}')
-                a.string = entry_labels[dictionary.id][a.string]
-        elif a['href'] == 'source':
-            if a.string in source_labels[dictionary.id]:
-                a['href'] = request.route_path(
-                    'source', id=f'{dictionary.id}-{a.string}')
-                a.string = source_labels[dictionary.id][a.string]
-    dictionary.description, dictionary.toc = toc(soup)
+    key = intro_key(dictionary.description)
+    cache_path = cache_dir / f'{dictionary.id}.json' if cache_dir else None
+    cached = load_cached_intro(cache_path, key) if cache_path else None
+    if cached:
+        links = resolve_links(dictionary, request, cached['targets'])
+        if links == cached['links']:
+            dictionary.description, dictionary.toc = \
+                cached['description'], cached['toc']
+            return
+
+    soup = parse_intro(dictionary.description)
+    targets = link_targets(soup)
+    links = resolve_links(dictionary, request, targets)
+    dictionary.description, dictionary.toc = format_intro(soup, links)
+    if cache_path:
+        save_cached_intro(
+            cache_path, key, targets, links,
+            dictionary.description, dictionary.toc)
 
 
 def main(args):
@@ -300,23 +700,20 @@ def main(args):
             print(f'{sid}: not selected')
             return False
 
-    with open(INTERNAL_REPO / 'contributions.json', encoding='utf-8') as f:
-        submission_info = json.load(f)
     submission_info = {
         sid: sinfo
-        for sid, sinfo in submission_info.items()
+        for sid, sinfo in read_submission_info().items()
         if sinfo['published'] == published and is_selected(sid)}
 
-    data_dirs = (
-        (sid, download_data(sid, sinfo, INTERNAL_REPO / 'datasets'))
-        for sid, sinfo in submission_info.items())
-    submissions = {
-        sid: Submission.from_cldfbench(sid, data_dir)
-        for sid, data_dir in data_dirs}
+    data_dirs = download_datasets(args, submission_info)
+    submissions = parse_datasets(args, data_dirs)
 
     # build data base
 
-    fts.index('fts_index', Word.fts, DBSession.bind)
+    profiler = import_profiler(args)
+    fts_mode = import_setting(args, 'fts', 'insert')
+    if fts_mode == 'insert':
+        fts.index('fts_index', Word.fts, DBSession.bind)
     DBSession.execute("CREATE EXTENSION IF NOT EXISTS unaccent WITH SCHEMA public;")
 
     dataset = common.Dataset(
@@ -338,8 +735,10 @@ def main(args):
     DBSession.add_all(iter_gloss_abbrevs(LGR_ABBRS))
 
     print('loading concepts ...')
-    concepticon = Concepticon(concepticon_path)
-    comparison_meanings = make_comparison_meanings(concepticon)
+    with profiler.phase('read_concepticon_conceptsets'):
+        conceptsets = read_concepticon_conceptsets(
+            concepticon_path, CATALOG_CACHE)
+    comparison_meanings = make_comparison_meanings(conceptsets)
     DBSession.add_all(comparison_meanings.values())
     print('... done')
 
@@ -367,103 +766,288 @@ def main(args):
 
     DBSession.flush()
 
-    for submission in submissions.values():
-        print('loading', submission.id, '...')
-        submission.add_to_database(
-            dictionaries[submission.id],
-            languages[submission.glottocode],
-            comparison_meanings)
-        print('... done')
+    with profiler.phase('load_families'):
+        load_families(
+            Data(),
+            [v for v in DBSession.query(Variety) if re.match('[a-z]{4}[0-9]{4}', v.id)],
+            glottolog_path,
+            CATALOG_CACHE)
+
+    failed = load_dictionaries(
+        args, submissions, submission_info, dictionaries, languages,
+        comparison_meanings)
+    if failed:
+        print('could not load:', ', '.join(failed))
+
+    if fts_mode == 'deferred':
+        with profiler.phase('fts_index'):
+            fts.index('fts_index', Word.fts, DBSession.bind)
 
-    load_families(
-        Data(),
-        [v for v in DBSession.query(Variety) if re.match('[a-z]{4}[0-9]{4}', v.id)],
-        glottolog_repos=glottolog_path)
+    with profiler.phase('flush'):
+        DBSession.flush()
 
-    source_labels = collect_link_labels(
-        DBSession.query(common.Source.id, common.Source.name))
-    entry_labels = collect_link_labels(
-        DBSession.query(common.Unit.id, common.Unit.name))
-    for d in DBSession.query(Dictionary):
-        add_formatted_description(
-            d, args.env['request'], entry_labels, source_labels)
 
+def finish_dictionary(
+    dictionary, submission, sinfo, request, fts='insert', profiler=NO_PROFILER,
+):
+    """Complete the import of a dictionary once its data is loaded.
+
+    Recording the fingerprint of the submission comes last: It marks the
+    dictionary as completely imported (see `changed_submissions`).
+    """
     DBSession.flush()
+    if fts == 'deferred':
+        with profiler.phase('update_fts', dictionary.id):
+            update_fts(dictionary.pk)
+    with profiler.phase('add_formatted_description', dictionary.id):
+        add_formatted_description(dictionary, request, INTRO_CACHE)
+    dictionary.update_jsondata(
+        fingerprint=dictionary_fingerprint(submission.fingerprint, sinfo))
+
+
+def load_dictionaries(
+    args, submissions, submission_info, dictionaries, languages,
+    comparison_meanings,
+):
+    """Load the data of all dictionaries into the data base.
+
+    Each dictionary is loaded in a savepoint of its own.  If loading fails,
+    the error is reported and the dictionary is removed again, but the other
+    dictionaries are loaded regardless.  With the `checkpoint` setting, each
+    completed dictionary is committed right away, so an aborted import can be
+    resumed using `dictionaria.scripts.reload`.
+
+    Return the exceptions raised for failed dictionaries mapped to their ids.
+    """
+    profiler = import_profiler(args)
+    request = args.env['request']
+    loader = import_setting(args, 'loader', 'orm')
+    fts_mode = import_setting(args, 'fts', 'insert')
+    chunk_size = import_setting(args, 'chunk_size', None, int)
+    load_processes = import_setting(args, 'load_processes', 1, int)
+    checkpoint = import_setting(args, 'checkpoint', False, asbool)
+    parallel = load_processes > 1 and len(submissions) > 1
+
+    def commit():
+        # committing closes the session, so all objects need to be queried
+        # again afterwards
+        transaction.commit()
+        return (
+            {d.id: d for d in DBSession.query(Dictionary)},
+            {lang.id: lang for lang in DBSession.query(Variety)},
+            {c.id: c for c in DBSession.query(ComparisonMeaning)})
+
+    failed = {}
+    if fts_mode == 'deferred':
+        create_fts_staging()
+    if parallel or checkpoint:
+        # the workers can only see what has been committed
+        dictionaries, languages, comparison_meanings = commit()
+    if parallel:
+        print('loading', ', '.join(submissions), '...')
+        failed.update(load_submissions(
+            submissions,
+            DBSession.get_bind().url,
+            load_processes,
+            loader=loader,
+            fts=fts_mode,
+            chunk_size=chunk_size,
+            profiler=profiler))
+
+    for sid, submission in submissions.items():
+        if sid in failed:
+            continue
+        dictionary = dictionaries[sid]
+        try:
+            with DBSession.begin_nested():
+                if not parallel:
+                    print('loading', sid, '...')
+                    submission.add_to_database(
+                        dictionary,
+                        languages[submission.glottocode],
+                        comparison_meanings,
+                        loader=loader,
+                        fts=fts_mode,
+                        chunk_size=chunk_size,
+                        profiler=profiler)
+                    print('... done')
+                finish_dictionary(
+                    dictionary, submission, submission_info[sid], request,
+                    fts_mode, profiler)
+        except Exception as e:
+            print(f'{sid}: loading failed: {e!r}')
+            failed[sid] = e
+            continue
+        if checkpoint:
+            dictionaries, languages, comparison_meanings = commit()
+
+    for sid in failed:
+        delete_dictionary(dictionaries[sid].pk)
+        DBSession.expunge(dictionaries[sid])
+    if fts_mode == 'deferred':
+        drop_fts_staging()
+    return failed
+
+
+def count_representation(concept_pks=None):
+    """Count the words associated with each comparison meaning.
+
+    Comparison meanings without any words are deactivated.  If `concept_pks`
+    is given, only the comparison meanings with these primary keys are
+    updated.
+    """
+    scope, params = '', {}
+    if concept_pks is not None:
+        scope = 'AND cm.pk = ANY(:concept_pks)'
+        params = {'concept_pks': list(concept_pks)}
+    DBSession.execute(
+        f"""
+        UPDATE comparisonmeaning AS cm
+          SET representation = s.c
+          FROM (
+            SELECT cm.pk, count(v.pk) AS c
+            FROM comparisonmeaning AS cm
+            LEFT JOIN valueset AS vs ON vs.parameter_pk = cm.pk
+            LEFT JOIN value AS v ON v.valueset_pk = vs.pk
+            WHERE TRUE {scope}
+            GROUP BY cm.pk
+          ) AS s
+          WHERE cm.pk = s.pk
+        """,
+        params)
+    DBSession.execute(
+        f"""
+        UPDATE parameter
+          SET active = cm.representation > 0
+          FROM comparisonmeaning AS cm
+          WHERE parameter.pk = cm.pk {scope}
+        """,
+        params)
+
+
+# Queries computing values for the dictionary table.  Each query returns the
+# primary key of a dictionary as its first column.  `{scope}` is replaced by a
+# condition restricting the results to a single dictionary, if needed.
+
+COUNT_WORDS = """
+SELECT w.dictionary_pk, count(*)
+FROM word AS w
+WHERE w.dictionary_pk IS NOT NULL {scope}
+GROUP BY w.dictionary_pk
+"""
+
+SEMANTIC_DOMAINS = """
+SELECT DISTINCT w.dictionary_pk, w.semantic_domain
+FROM word AS w
+WHERE w.semantic_domain IS NOT NULL {scope}
+"""
+
+COUNT_MEDIA_FILES = """
+SELECT
+  w.dictionary_pk,
+  count(*) FILTER (WHERE f.mime_type ILIKE 'audio/%'),
+  count(*) FILTER (WHERE f.mime_type ILIKE 'image/%')
+FROM (
+  SELECT uf.object_pk AS word_pk, uf.mime_type
+  FROM unit_files AS uf
+  UNION ALL
+  SELECT m.word_pk, mf.mime_type
+  FROM meaning_files AS mf, meaning AS m
+  WHERE mf.object_pk = m.pk
+) AS f, word AS w
+WHERE f.word_pk = w.pk {scope}
+GROUP BY w.dictionary_pk
+"""
+
+COUNT_EXAMPLE_AUDIO_FILES = """
+SELECT e.dictionary_pk, count(*)
+FROM sentence_files AS f, example AS e
+WHERE f.object_pk = e.pk AND f.mime_type ILIKE 'audio/%' {scope}
+GROUP BY e.dictionary_pk
+"""
+
+# distinct values of the custom fields of each dictionary, if there are less
+# than 40 of them
+CUSTOM_FIELD_CHOICES = """
+SELECT dictionary_pk, key, value
+FROM (
+  SELECT
+    dictionary_pk, key, value,
+    count(*) OVER (PARTITION BY dictionary_pk, key) AS n
+  FROM (
+    SELECT DISTINCT w.dictionary_pk, d.key, d.value
+    FROM unit_data AS d, word AS w
+    WHERE d.object_pk = w.pk AND d.key NOT LIKE 'lang-%' {scope}
+  ) AS v
+) AS c
+WHERE n < 40
+"""
+
+
+def query_dictionaries(sql, column, dictionary_pk=None):
+    """Return the rows of one of the queries for the dictionary table.
+
+    If `dictionary_pk` is given, only rows where `column` matches the primary
+    key are returned.
+    """
+    if dictionary_pk is None:
+        return DBSession.execute(sql.format(scope='')).fetchall()
+    return DBSession.execute(
+        sql.format(scope=f'AND {column} = :dictionary_pk'),
+        {'dictionary_pk': dictionary_pk}).fetchall()
 
 
-def count_unit_media_files(contrib, mtype):
-    """Return count of media files associated to entries."""
-    word_files = (
-        DBSession.query(common.Unit_files)
-        .join(Word, common.Unit_files.object_pk == Word.pk)
-        .filter(Word.dictionary_pk == contrib.pk)
-        .filter(common.Unit_files.mime_type.ilike(f'{mtype}/%')))
-    meaning_files = (
-        DBSession.query(Meaning_files)
-        .join(Meaning, Meaning_files.object_pk == Meaning.pk)
-        .join(Word, Meaning.word_pk == Word.pk)
-        .filter(Word.dictionary_pk == contrib.pk)
-        .filter(Meaning_files.mime_type.ilike(f'{mtype}/%')))
-    return word_files.count() + meaning_files.count()
-
-
-def count_unit_example_files(contrib):
-    """Return count of audio files associated to examples."""
-    example_files = (
-        DBSession.query(common.Sentence_files)
-        .join(common.Sentence, common.Sentence_files.object_pk == common.Sentence.pk)
-        .filter(Example.dictionary_pk == contrib.pk)
-        .filter(common.Sentence_files.mime_type.ilike('audio/%')))
-    return example_files.count()
-
-
-def prime_cache(_args):
-    """Denormalise data base.
+def denormalise_dictionaries(dictionary_pk=None):
+    """Store counts, semantic domains, etc. on the dictionary objects.
 
-    This procedure should be separate from the db initialization, because
-    it will have to be run periodically whenever data has been updated
-    (though to be completely honest, nobody ever does that).
+    Each value is computed for all dictionaries at once.  If `dictionary_pk`
+    is given, only the dictionary with that primary key is updated.
     """
-    print('counting comparison meanings ...')
-    for concept in DBSession.query(ComparisonMeaning).options(
-        joinedload(common.Parameter.valuesets).joinedload(common.ValueSet.values),
+    word_counts = dict(query_dictionaries(
+        COUNT_WORDS, 'w.dictionary_pk', dictionary_pk))
+    semantic_domains = defaultdict(set)
+    for pk, semantic_domain in query_dictionaries(
+        SEMANTIC_DOMAINS, 'w.dictionary_pk', dictionary_pk,
     ):
-        concept.representation = sum(len(vs.values) for vs in concept.valuesets)
-        if concept.representation == 0:
-            concept.active = False
-    print('... done')
+        semantic_domains[pk].update(split(semantic_domain))
+    media_counts = {
+        pk: (audio, image)
+        for pk, audio, image in query_dictionaries(
+            COUNT_MEDIA_FILES, 'w.dictionary_pk', dictionary_pk)}
+    example_audio_counts = dict(query_dictionaries(
+        COUNT_EXAMPLE_AUDIO_FILES, 'e.dictionary_pk', dictionary_pk))
+    field_values = defaultdict(lambda: defaultdict(list))
+    for pk, key, value in query_dictionaries(
+        CUSTOM_FIELD_CHOICES, 'w.dictionary_pk', dictionary_pk,
+    ):
+        field_values[pk][key].append(value)
+
+    dictionaries = DBSession.query(Dictionary)
+    if dictionary_pk is not None:
+        dictionaries = dictionaries.filter(Dictionary.pk == dictionary_pk)
+    for d in dictionaries:
+        d.count_words = word_counts.get(d.pk, 0)
+        d.semantic_domains = join(sorted(semantic_domains[d.pk]))
+        d.count_audio, d.count_image = media_counts.get(d.pk, (0, 0))
+        d.count_example_audio = example_audio_counts.get(d.pk, 0)
 
-    print('counting media files ...')
-    for d in DBSession.query(Dictionary):
-        q = DBSession.query(Word).filter(Word.dictionary_pk == d.pk)
-        d.count_words = q.count()
-        sds = set(chain.from_iterable(w.semantic_domain_list for w in q))
-        d.semantic_domains = join(sorted(sds))
-        d.count_audio = count_unit_media_files(d, 'audio')
-        d.count_example_audio = count_unit_example_files(d)
-        d.count_image = count_unit_media_files(d, 'image')
-
-        word_pks = [w.pk for w in d.words]
-        choices = {}
         custom_cols = chain(
             d.jsondata.get('custom_fields', ()),
             d.jsondata.get('second_tab', ()))
-        for col in custom_cols:
-            data_values = DBSession.query(common.Unit_data.value)\
-                .filter(common.Unit_data.object_pk.in_(word_pks))\
-                .filter(common.Unit_data.key == col)\
-                .filter(not_(common.Unit_data.key.like('lang-%')))\
-                .distinct()
-            values = [r[0] for r in data_values]
-            if values and len(values) < 40:
-                choices[col] = sorted(values)
+        choices = {
+            col: sorted(field_values[d.pk][col])
+            for col in custom_cols
+            if field_values[d.pk].get(col)}
         if choices:
             d.update_jsondata(choices=choices)
-    DBSession.flush()
-    print('... done')
 
-    print('counting examples ...')
-    DBSession.execute("""
+
+def count_examples(dictionary_pk=None):
+    """Store the number of examples on each word.
+
+    If `dictionary_pk` is given, only words of that dictionary are updated.
+    """
+    sql = """
     UPDATE word
       SET example_count = s.c
       FROM (
@@ -473,5 +1057,249 @@ def prime_cache(_args):
         GROUP BY m.word_pk
       ) AS s
       WHERE word.pk = s.wpk
-    """)
+    """
+    if dictionary_pk is None:
+        DBSession.execute(sql)
+    else:
+        DBSession.execute(
+            sql + '  AND word.dictionary_pk = :dictionary_pk',
+            {'dictionary_pk': dictionary_pk})
+
+
+def create_fts_staging():
+    """Create the table words loaded with deferred full-text search need."""
+    FTS_STAGING.create(DBSession.connection(), checkfirst=True)
+
+
+def drop_fts_staging():
+    """Drop the table with the text of words once their vectors are done."""
+    FTS_STAGING.drop(DBSession.connection(), checkfirst=True)
+
+
+def update_fts(dictionary_pk=None):
+    """Compute the full-text search vectors of words from their staged text.
+
+    This only affects words loaded with deferred full-text search, i.e. words
+    which have their text in `FTS_STAGING`.  Their text is removed from there
+    once the vectors are computed.  If `dictionary_pk` is given, only words of
+    that dictionary are updated.
+    """
+    scope, params = '', {}
+    if dictionary_pk is not None:
+        scope = 'AND w.dictionary_pk = :dictionary_pk'
+        params = {'dictionary_pk': dictionary_pk}
+    DBSession.execute(
+        f"""
+        UPDATE word AS w
+          SET fts = to_tsvector('english', s.text)
+          FROM {FTS_STAGING.name} AS s
+          WHERE s.word_pk = w.pk {scope}
+        """,
+        params)
+    DBSession.execute(
+        f"""
+        DELETE FROM {FTS_STAGING.name} AS s
+          USING word AS w
+          WHERE s.word_pk = w.pk {scope}
+        """,
+        params)
+
+
+def prime_cache(args):
+    """Denormalise data base.
+
+    This procedure should be separate from the db initialization, because
+    it will have to be run periodically whenever data has been updated
+    (though to be completely honest, nobody ever does that).
+    """
+    profiler = import_profiler(args)
+
+    print('counting comparison meanings ...')
+    with profiler.phase('count_representation'):
+        count_representation()
+    print('... done')
+
+    print('counting media files ...')
+    with profiler.phase('denormalise_dictionaries'):
+        denormalise_dictionaries()
+    with profiler.phase('flush'):
+        DBSession.flush()
+    print('... done')
+
+    print('counting examples ...')
+    with profiler.phase('count_examples'):
+        count_examples()
     print('done...')
+
+    write_profile(args)
+
+
+def prime_dictionary_cache(dictionary, concept_pks):
+    """Denormalise data base for a single dictionary.
+
+    `concept_pks` are the primary keys of all comparison meanings whose
+    representation might have changed.
+    """
+    count_representation(concept_pks)
+    denormalise_dictionaries(dictionary.pk)
+    DBSession.flush()
+    count_examples(dictionary.pk)
+
+
+# Statements removing a dictionary and everything depending on it, in an
+# order that keeps foreign key constraints happy.
+DELETE_DICTIONARY = [
+    """
+    WITH deleted AS (
+      DELETE FROM counterpart WHERE pk IN (
+        SELECT v.pk FROM value AS v, valueset AS vs
+        WHERE v.valueset_pk = vs.pk AND vs.contribution_pk = :pk)
+      RETURNING pk)
+    DELETE FROM value WHERE pk IN (SELECT pk FROM deleted)
+    """,
+    "DELETE FROM valueset WHERE contribution_pk = :pk",
+    *(
+        f"""
+        DELETE FROM {table} WHERE {column} IN (
+          SELECT m.pk FROM meaning AS m, word AS w
+          WHERE m.word_pk = w.pk AND w.dictionary_pk = :pk)
+        """
+        for table, column in [
+            ('meaningsentence', 'meaning_pk'),
+            ('nym', 'source_pk'),
+            ('meaning_data', 'object_pk'),
+            ('meaning_files', 'object_pk'),
+            ('meaningreference', 'meaning_pk'),
+            ('meaning', 'pk'),
+        ]
+    ),
+    *(
+        f"""
+        DELETE FROM {table} WHERE {column} IN (
+          SELECT pk FROM example WHERE dictionary_pk = :pk)
+        """
+        for table, column in [
+            ('sentence_data', 'object_pk'),
+            ('sentence_files', 'object_pk'),
+            ('sentencereference', 'sentence_pk'),
+        ]
+    ),
+    """
+    WITH deleted AS (
+      DELETE FROM example WHERE dictionary_pk = :pk RETURNING pk)
+    DELETE FROM sentence WHERE pk IN (SELECT pk FROM deleted)
+    """,
+    *(
+        f"""
+        DELETE FROM {table} WHERE {column} IN (
+          SELECT pk FROM word WHERE dictionary_pk = :pk)
+        """
+        for table, column in [
+            ('seealso', 'source_pk'),
+            ('seealso', 'target_pk'),
+            ('nym', 'target_pk'),
+            ('unit_data', 'object_pk'),
+            ('unit_files', 'object_pk'),
+            ('wordreference', 'word_pk'),
+        ]
+    ),
+    """
+    WITH deleted AS (
+      DELETE FROM word WHERE dictionary_pk = :pk RETURNING pk)
+    DELETE FROM unit WHERE pk IN (SELECT pk FROM deleted)
+    """,
+    """
+    WITH deleted AS (
+      DELETE FROM dictionarysource WHERE dictionary_pk = :pk RETURNING pk)
+    DELETE FROM source WHERE pk IN (SELECT pk FROM deleted)
+    """,
+    "DELETE FROM contributioncontributor WHERE contribution_pk = :pk",
+    """
+    WITH deleted AS (
+      DELETE FROM dictionary WHERE pk = :pk RETURNING pk)
+    DELETE FROM contribution WHERE pk IN (SELECT pk FROM deleted)
+    """,
+]
+
+
+def delete_dictionary(dictionary_pk):
+    """Remove a dictionary and all of its words, examples, etc."""
+    for sql in DELETE_DICTIONARY:
+        DBSession.execute(sql, {'pk': dictionary_pk})
+    # Plain SQL statements go unnoticed by the transaction manager, which
+    # rolls back transactions without any (other) changes.
+    mark_changed(DBSession())
+
+
+def reload_submission(
+    submission, sinfo, request, loader='orm', fts='insert', chunk_size=None,
+    glottolog_path=None, profiler=NO_PROFILER,
+):
+    """Replace a single dictionary in an existing data base.
+
+    The old version of the dictionary (if any) is removed along with all the
+    data depending on it.  Then the submission is loaded and the cached
+    values for that dictionary are recomputed.  Meant to be run inside a
+    transaction, so a failing reload doesn't leave a half-deleted dictionary.
+    """
+    concept_pks = set()
+    old_dictionary = DBSession.query(Dictionary)\
+        .filter(Dictionary.id == submission.id)\
+        .one_or_none()
+    if old_dictionary:
+        print('removing old version of', submission.id, '...')
+        concept_pks.update(
+            r[0] for r in DBSession.query(common.ValueSet.parameter_pk)
+            .filter(common.ValueSet.contribution_pk == old_dictionary.pk))
+        delete_dictionary(old_dictionary.pk)
+        DBSession.expunge_all()
+        print('... done')
+
+    language = DBSession.query(Variety)\
+        .filter(Variety.id == submission.glottocode)\
+        .one_or_none()
+    if not language:
+        language = make_languages({submission.id: submission})[submission.glottocode]
+        DBSession.add(language)
+        if glottolog_path:
+            load_families(Data(), [language], glottolog_path, CATALOG_CACHE)
+
+    contributors, dictionary_authors = make_contributors(
+        {submission.id: submission})
+    existing_contributors = {
+        contributor.id: contributor
+        for contributor in DBSession.query(common.Contributor)
+        .filter(common.Contributor.id.in_(list(contributors)))}
+    for contributor_id, contributor in contributors.items():
+        if contributor_id in existing_contributors:
+            contributors[contributor_id] = existing_contributors[contributor_id]
+        else:
+            DBSession.add(contributor)
+
+    DBSession.flush()
+
+    dictionary = make_dictionary(submission, sinfo, language)
+    DBSession.add(dictionary)
+    DBSession.flush()
+    DBSession.add_all(iter_dictionary_authors(
+        dictionary_authors, contributors, {submission.id: dictionary}))
+
+    comparison_meanings = {
+        concept.id: concept for concept in DBSession.query(ComparisonMeaning)}
+
+    print('loading', submission.id, '...')
+    if fts == 'deferred':
+        create_fts_staging()
+    submission.add_to_database(
+        dictionary, language, comparison_meanings, loader=loader, fts=fts,
+        chunk_size=chunk_size, profiler=profiler)
+    print('... done')
+    finish_dictionary(dictionary, submission, sinfo, request, fts, profiler)
+    if fts == 'deferred':
+        drop_fts_staging()
+
+    concept_pks.update(
+        r[0] for r in DBSession.query(common.ValueSet.parameter_pk)
+        .filter(common.ValueSet.contribution_pk == dictionary.pk))
+    prime_dictionary_cache(dictionary, concept_pks)
+    DBSession.flush()
@@ -0,0 +1,129 @@
+"""Build a new data base in a separate schema and swap it in atomically.
+
+Unlike `clld initdb`, this doesn't touch the live data while importing: All
+tables are created and filled (including `prime_cache`) in the schema
+`dictionaria_next` of the configured data base.  Only then, in a single
+transaction, the `public` schema is renamed to `dictionaria_old` and
+`dictionaria_next` to `public`.  So the web app keeps serving the old data
+until the new data is complete.
+
+    python -m dictionaria.scripts.publish development.ini
+
+The previous data is kept in `dictionaria_old` until the next run, so it can
+be swapped back in:
+
+    python -m dictionaria.scripts.publish development.ini --rollback
+"""
+
+import argparse
+
+import transaction
+from pyramid.paster import bootstrap, get_appsettings
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+
+from clld.cliutil import SessionContext
+
+from dictionaria.scripts import initializedb
+
+LIVE_SCHEMA = 'public'
+SHADOW_SCHEMA = 'dictionaria_next'
+BACKUP_SCHEMA = 'dictionaria_old'
+
+
+def schema_url(url, schema):
+    """Return data base URL whose connections only see tables in `schema`.
+
+    Other options the URL passes to the server are kept.
+    """
+    url = make_url(url)
+    options = url.query.get('options', ())
+    if isinstance(options, str):
+        options = (options,)
+    return url.update_query_dict(
+        {'options': ' '.join([*options, f'-csearch_path={schema}'])})
+
+
+def create_schema(connection, schema):
+    """Create an empty schema, dropping it first if it exists."""
+    connection.execute(text(f'DROP SCHEMA IF EXISTS {schema} CASCADE'))
+    connection.execute(text(f'CREATE SCHEMA {schema}'))
+    # like the default `public` schema, the new schema is usable by everybody
+    connection.execute(text(f'GRANT USAGE ON SCHEMA {schema} TO PUBLIC'))
+
+
+def swap_schemas(connection, schema, backup=BACKUP_SCHEMA):
+    """Make `schema` the live schema, keeping the live schema as `backup`.
+
+    The live schema is `public`.  Extensions installed in it (e.g. `unaccent`)
+    are moved to the new live schema.  An existing `backup` schema is dropped,
+    unless it is the one swapped in.  All of this happens in the transaction
+    of `connection`, so queries either see the old or the new schema.
+    """
+    extensions = connection.execute(text(
+        "SELECT e.extname FROM pg_extension AS e "
+        "JOIN pg_namespace AS n ON e.extnamespace = n.oid "
+        "WHERE n.nspname = :live"), {'live': LIVE_SCHEMA}).scalars().all()
+    if backup != schema:
+        connection.execute(text(f'DROP SCHEMA IF EXISTS {backup} CASCADE'))
+    for extension in extensions:
+        connection.execute(text(
+            f'ALTER EXTENSION {extension} SET SCHEMA {schema}'))
+    tmp_schema = f'{schema}_swap'
+    connection.execute(text(f'ALTER SCHEMA {LIVE_SCHEMA} RENAME TO {tmp_schema}'))
+    connection.execute(text(f'ALTER SCHEMA {schema} RENAME TO {LIVE_SCHEMA}'))
+    connection.execute(text(f'ALTER SCHEMA {tmp_schema} RENAME TO {backup}'))
+
+
+def build(args, url):
+    """Fill the shadow schema like `clld initdb` fills a fresh data base."""
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        create_schema(connection, SHADOW_SCHEMA)
+    engine.dispose()
+
+    args.settings = dict(
+        args.settings,
+        **{'sqlalchemy.url': schema_url(url, SHADOW_SCHEMA)})
+    with SessionContext(args.settings):
+        with transaction.manager:
+            initializedb.main(args)
+        with transaction.manager:
+            initializedb.prime_cache(args)
+
+
+def main(argv=None):
+    """Parse command line and build and publish a new data base."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('config_uri', help='ini file providing app config')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        '--rollback', action='store_true', default=False,
+        help='swap the previously published data back in')
+    mode.add_argument(
+        '--no-swap', action='store_true', default=False,
+        help=f'only build the new data base in schema {SHADOW_SCHEMA}')
+    args = parser.parse_args(argv)
+    args.settings = get_appsettings(args.config_uri)
+    args.env = bootstrap(args.config_uri)
+    url = args.settings['sqlalchemy.url']
+
+    if args.rollback:
+        schema = BACKUP_SCHEMA
+    else:
+        build(args, url)
+        schema = SHADOW_SCHEMA
+    if args.no_swap:
+        return
+
+    engine = create_engine(url)
+    with engine.begin() as connection:
+        swap_schemas(connection, schema)
+    engine.dispose()
+    print(f'published {schema}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""Reload individual dictionaries into an existing data base.
+
+Unlike `clld initdb` this leaves the rest of the data base alone, i.e.
+Concepticon concepts, Glottolog families and all other dictionaries are kept
+as they are.
+
+    python -m dictionaria.scripts.reload development.ini SID [SID ...]
+    python -m dictionaria.scripts.reload development.ini all
+
+Dictionaries whose files didn't change since they were last imported are
+skipped, unless `--force` is given.
+
+With `--dry-run`, the selected dictionaries are only checked: all data base
+objects are created, but nothing is written to (or read from) the data base.
+This reports the number of objects, references to missing entries and media
+files and the time it took.
+"""
+
+import argparse
+import time
+from collections import Counter
+
+import cldfcatalog
+import transaction
+from pyramid.paster import bootstrap, get_appsettings
+
+from clld.cliutil import SessionContext
+from clld.db.meta import DBSession
+
+from dictionaria.lib.cldf import dry_run_submission, submission_fingerprint
+from dictionaria.lib.profiling import ImportProfiler
+from dictionaria.models import Dictionary
+from dictionaria.scripts.initializedb import (
+    changed_submissions, download_datasets, import_profiler, import_setting,
+    parse_datasets, read_submission_info, reload_submission, write_profile,
+)
+
+
+def dry_run(args, submissions):
+    """Run the import of the submissions without a data base and report."""
+    for sid, submission in submissions.items():
+        print(f'checking {sid} ...')
+        profiler = ImportProfiler(trace_memory=False)
+        start = time.perf_counter()
+        missing = dry_run_submission(
+            submission,
+            fts=import_setting(args, 'fts', 'insert'),
+            chunk_size=import_setting(args, 'chunk_size', None, int),
+            profiler=profiler)
+        seconds = time.perf_counter() - start
+        import_profiler(args).merge(profiler.phases)
+
+        rows = Counter()
+        for phase in profiler.phases:
+            rows[phase.name] += phase.rows or 0
+        for name, count in rows.items():
+            if count:
+                print(f'  {name}: {count}')
+        print(
+            f'{sid}: {sum(rows.values())} objects in {seconds:.1f}s,',
+            f'{len(missing.entries)} missing entries,',
+            sum(len(md5s) for md5s in missing.media.values()),
+            'missing media files')
+
+
+def main(argv=None):
+    """Parse command line and reload the selected dictionaries."""
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('config_uri', help='ini file providing app config')
+    parser.add_argument(
+        'sids', metavar='SID', nargs='+',
+        help="dictionary id or 'all' for all dictionaries")
+    parser.add_argument(
+        '--internal', action='store_true', default=False,
+        help="with 'all': select the internal rather than the external datasets")
+    parser.add_argument(
+        '--force', action='store_true', default=False,
+        help='reload dictionaries even if their files did not change')
+    parser.add_argument(
+        '--dry-run', action='store_true', default=False,
+        help='only check the dictionaries without touching the data base')
+    args = parser.parse_args(argv)
+    args.settings = get_appsettings(args.config_uri)
+    args.env = bootstrap(args.config_uri)
+
+    all_submissions = read_submission_info()
+    if 'all' in args.sids:
+        submission_info = {
+            sid: sinfo
+            for sid, sinfo in all_submissions.items()
+            if sinfo['published'] != args.internal}
+    else:
+        unknown = [sid for sid in args.sids if sid not in all_submissions]
+        if unknown:
+            parser.error('unknown dictionaries: {}'.format(', '.join(unknown)))
+        submission_info = {sid: all_submissions[sid] for sid in args.sids}
+
+    glottolog_path = cldfcatalog.Config.from_file().get_clone('glottolog')
+    data_dirs = download_datasets(args, submission_info)
+
+    if args.dry_run:
+        dry_run(args, parse_datasets(args, data_dirs))
+        write_profile(args)
+        return
+
+    fingerprints = {
+        sid: submission_fingerprint(data_dir)
+        for sid, data_dir in data_dirs.items()}
+    with SessionContext(args.settings):
+        if not args.force:
+            with transaction.manager:
+                changed = changed_submissions(
+                    fingerprints, submission_info, DBSession.query(Dictionary))
+            for sid in data_dirs:
+                if sid not in changed:
+                    print(f'{sid}: unchanged')
+            data_dirs = {
+                sid: data_dir
+                for sid, data_dir in data_dirs.items()
+                if sid in changed}
+
+        submissions = parse_datasets(args, data_dirs, fingerprints)
+        for sid, submission in submissions.items():
+            with transaction.manager:
+                reload_submission(
+                    submission,
+                    submission_info[sid],
+                    args.env['request'],
+                    loader=import_setting(args, 'loader', 'orm'),
+                    fts=import_setting(args, 'fts', 'insert'),
+                    chunk_size=import_setting(args, 'chunk_size', None, int),
+                    glottolog_path=glottolog_path,
+                    profiler=import_profiler(args))
+
+    if submissions:
+        print('reloaded:', ', '.join(submissions))
+    else:
+        print('nothing to reload')
+    write_profile(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -32,6 +32,9 @@ setup(
         'waitress',
     ],
     extras_require={
+        'arrow': [
+            'pyarrow',
+        ],
         'dev': [
             'flake8',
             'tox',
@@ -1 +1,144 @@
-import pytest  # noqa
+import argparse
+import os
+
+import pytest
+import sqlalchemy
+from clld.db.meta import Base, DBSession
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.compiler import compiles
+
+from dictionaria.lib.cldf import get_sense_concepticon_ids
+from dictionaria.models import ComparisonMeaning
+from dictionaria.scripts import initializedb
+
+# URL of a throw-away data base, which is created and dropped by the tests.
+DB_URL = os.environ.get(
+    'DICTIONARIA_TEST_DB', 'postgresql://postgres@/dictionaria_test')
+
+
+class Request:
+    """Stand-in for the request `clld initdb` passes to the import."""
+
+    def route_path(self, route, id):
+        return f'/{route}s/{id}'
+
+
+@compiles(TSVECTOR, 'sqlite')
+def compile_tsvector(type_, compiler, **kw):
+    """Let pytest-clld's `db` fixture create the tables in SQLite."""
+    return 'TEXT'
+
+
+@pytest.fixture
+def engine():
+    url = make_url(DB_URL)
+    server = create_engine(
+        url.set(database='postgres'), isolation_level='AUTOCOMMIT')
+    try:
+        with server.connect() as connection:
+            connection.execute(text(f'DROP DATABASE IF EXISTS {url.database}'))
+            connection.execute(text(f'CREATE DATABASE {url.database}'))
+    except sqlalchemy.exc.OperationalError:
+        pytest.skip('needs a local PostgreSQL server')
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+    with server.connect() as connection:
+        connection.execute(text(f'DROP DATABASE {url.database}'))
+    server.dispose()
+
+
+@pytest.fixture
+def pg_db(engine, tmp_path, monkeypatch):
+    """Empty dictionaria data base `DBSession` is bound to."""
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(initializedb, 'INTRO_CACHE', tmp_path / 'intros')
+    DBSession.remove()
+    DBSession.configure(bind=engine)
+    yield engine
+    DBSession.remove()
+    engine.dispose()
+
+
+def import_args(**settings):
+    """Return arguments of the import as passed by `clld initdb`."""
+    return argparse.Namespace(
+        settings={f'dictionaria.{name}': value for name, value in settings.items()},
+        env={'request': Request()})
+
+
+def add_dictionaries(submissions, submission_info=None):
+    """Add everything the dictionaries of `submissions` depend on.
+
+    Like `initializedb.main`, minus the catalogs: comparison meanings are made
+    up for the Concepticon ids used in the submissions.
+
+    Return dictionaries, languages and comparison meanings.
+    """
+    concept_ids = set().union(*(
+        get_sense_concepticon_ids(sense)
+        for submission in submissions.values()
+        for sense in submission.records.senses))
+    comparison_meanings = {
+        concept_id: ComparisonMeaning(id=concept_id, name=f'concept {concept_id}')
+        for concept_id in concept_ids}
+    DBSession.add_all(comparison_meanings.values())
+    languages = initializedb.make_languages(submissions)
+    DBSession.add_all(languages.values())
+    contributors, dictionary_authors = initializedb.make_contributors(submissions)
+    DBSession.add_all(contributors.values())
+    DBSession.flush()
+    dictionaries = initializedb.make_dictionaries(
+        submissions,
+        submission_info or {sid: {} for sid in submissions},
+        languages)
+    DBSession.add_all(dictionaries.values())
+    DBSession.flush()
+    DBSession.add_all(initializedb.iter_dictionary_authors(
+        dictionary_authors, contributors, dictionaries))
+    DBSession.flush()
+    return dictionaries, languages, comparison_meanings
+
+
+def load_dictionaries(submissions, submission_info=None, **settings):
+    """Import `submissions` into an empty data base like `clld initdb`.
+
+    Return the exceptions of dictionaries that failed to load.
+    """
+    submission_info = submission_info or {sid: {} for sid in submissions}
+    return initializedb.load_dictionaries(
+        import_args(**settings),
+        submissions,
+        submission_info,
+        *add_dictionaries(submissions, submission_info))
+
+
+def snapshot():
+    """Return the rows of all tables, independent of primary keys.
+
+    Foreign keys are replaced by the ids of the rows they point to.
+    """
+    ids = {}
+    for table in Base.metadata.sorted_tables:
+        if 'id' in table.c and 'pk' in table.c:
+            ids[table] = dict(DBSession.execute(
+                sqlalchemy.select(table.c.pk, table.c.id)).fetchall())
+        elif 'pk' in table.c and table.c.pk.foreign_keys:
+            # joined table inheritance: the id is in the base table
+            ids[table] = ids[next(iter(table.c.pk.foreign_keys)).column.table]
+    rows = {}
+    for table in Base.metadata.sorted_tables:
+        columns = [
+            column for column in table.c
+            if column.name not in ('pk', 'created', 'updated')]
+        rows[table.name] = sorted((
+            tuple(
+                ids[next(iter(column.foreign_keys)).column.table].get(value)
+                if column.foreign_keys and value is not None
+                else value
+                for column, value in zip(columns, row))
+            for row in DBSession.execute(sqlalchemy.select(*columns))),
+            key=repr)
+    return rows
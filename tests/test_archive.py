@@ -0,0 +1,37 @@
+import zipfile
+
+from dictionaria.lib.archive import SubmissionArchive, is_archive
+from dictionaria.lib.cldf import parse_submission, records_cache_key
+from dictionaria.lib.synthetic import SyntheticDictionary
+
+
+def zip_submission(data_dir, path):
+    with zipfile.ZipFile(path, 'w') as zipf:
+        for file in sorted(data_dir.rglob('*')):
+            zipf.write(file, f'synth-v1.0/{file.relative_to(data_dir).as_posix()}')
+    return path
+
+
+def test_submission_from_archive(tmp_path):
+    SyntheticDictionary(sid='synth', entries=30).write(tmp_path / 'synth')
+    path = zip_submission(tmp_path / 'synth', tmp_path / 'synth.zip')
+    assert is_archive(path)
+    assert not is_archive(tmp_path / 'synth')
+
+    archive = SubmissionArchive(path)
+    assert archive.root == 'synth-v1.0/'
+    assert archive.exists('etc/md.json')
+    assert 'cldf/entries.csv' in archive.files('cldf')
+
+    expected = parse_submission('synth', tmp_path / 'synth')
+    submission = parse_submission('synth', path)
+    assert submission.archive is not None
+    assert submission.records == expected.records
+    assert submission.records.sources
+    assert submission.md == expected.md
+    assert submission.cdstar == expected.cdstar
+    assert submission.description == expected.description
+    # switching between archive and extracted files doesn't trigger reloads
+    assert submission.fingerprint == expected.fingerprint
+    assert records_cache_key(submission.fingerprint) == records_cache_key(
+        expected.fingerprint)
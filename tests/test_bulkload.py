@@ -0,0 +1,54 @@
+import pytest
+import transaction
+from clld.db.meta import Base, DBSession
+from clld.db.models import common
+from conftest import load_dictionaries, snapshot
+
+from dictionaria.lib.bulkload import LineReader, copy_objects, copy_value
+from dictionaria.lib.cldf import parse_submission
+from dictionaria.lib.synthetic import SyntheticDictionary
+
+
+def test_copy_value():
+    assert copy_value(None) == '\\N'
+    assert copy_value(True) == 't'
+    assert copy_value(False) == 'f'
+    assert copy_value(3) == '3'
+    assert copy_value('a\tb\nc\\d\re') == 'a\\tb\\nc\\\\d\\re'
+
+
+def test_line_reader():
+    lines = [f'{i}\tvalue {i}\n' for i in range(100)]
+    reader = LineReader(iter(lines))
+    chunks = []
+    while (chunk := reader.read(7)):
+        assert len(chunk) <= 7
+        chunks.append(chunk)
+    assert ''.join(chunks) == ''.join(lines)
+    assert LineReader(iter(lines)).read() == ''.join(lines)
+
+
+def load(engine, submissions, **settings):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with transaction.manager:
+        assert not load_dictionaries(submissions, **settings)
+    with transaction.manager:
+        return snapshot()
+
+
+def test_copy_loader(pg_db, tmp_path):
+    SyntheticDictionary(sid='synth', entries=60).write(tmp_path / 'synth')
+    submissions = {'synth': parse_submission('synth', tmp_path / 'synth')}
+    rows = load(pg_db, submissions, loader='orm')
+    assert rows['value'] and rows['meaningsentence'] and rows['seealso']
+    assert load(pg_db, submissions, loader='copy', chunk_size=25) == rows
+
+
+def test_copy_callable_default(pg_db):
+    Base.metadata.create_all(pg_db)
+    with transaction.manager:
+        # `Dataset.published` defaults to `date.today`, which COPY can't compute
+        with pytest.raises(ValueError, match='dataset.published'):
+            copy_objects([common.Dataset(id='d', name='d')])
+        assert DBSession.query(common.Dataset).count() == 0
@@ -0,0 +1,181 @@
+import git
+import pytest
+from clld.db.meta import DBSession
+from clld.cliutil import Data
+from clld_glottologfamily_plugin.models import Family
+
+from dictionaria.lib.catalogs import (
+    ConceptSet, Languoid, load_families, load_snapshot,
+    read_concepticon_conceptsets, read_glottolog_languoids, repo_commit,
+    save_snapshot,
+)
+from dictionaria.models import Variety
+
+LANGUOID_LEVELS = """\
+[family]
+ordinal = 1
+description = family
+
+[language]
+ordinal = 2
+description = language
+
+[dialect]
+ordinal = 3
+description = dialect
+"""
+
+MACROAREAS = """\
+[DEFAULT]
+description = macroarea
+reference_id = ref
+
+[pacific]
+name = Papunesia
+
+[africa]
+name = Africa
+"""
+
+
+def glottolog_clone(path, languoids):
+    """Create a tiny Glottolog clone with languoids `(path, md.ini)`."""
+    path.joinpath('references').mkdir(parents=True)
+    path.joinpath('config').mkdir()
+    path.joinpath('config', 'languoid_levels.ini').write_text(
+        LANGUOID_LEVELS, encoding='utf-8')
+    path.joinpath('config', 'macroareas.ini').write_text(
+        MACROAREAS, encoding='utf-8')
+    for languoid_path, md in languoids:
+        directory = path.joinpath('languoids', 'tree', languoid_path)
+        directory.mkdir(parents=True)
+        directory.joinpath('md.ini').write_text(md, encoding='utf-8')
+    repo = git.Repo.init(path)
+    repo.index.add(['config'])
+    repo.index.commit('initial')
+    return path
+
+
+def test_repo_commit(tmp_path):
+    assert repo_commit(tmp_path) is None
+    repo = git.Repo.init(tmp_path)
+    tmp_path.joinpath('README').write_text('x', encoding='utf-8')
+    repo.index.add(['README'])
+    commit = repo.index.commit('initial')
+    assert repo_commit(tmp_path) == commit.hexsha
+
+
+def test_snapshots(tmp_path):
+    save_snapshot(tmp_path, 'catalog', 'abc', [1, 2])
+    assert load_snapshot(tmp_path, 'catalog', 'abc') == [1, 2]
+    assert load_snapshot(tmp_path, 'catalog', 'def') is None
+    assert load_snapshot(tmp_path, 'catalog', None) is None
+
+    save_snapshot(tmp_path, 'catalog', 'def', [3])
+    assert load_snapshot(tmp_path, 'catalog', 'abc') is None
+    assert load_snapshot(tmp_path, 'catalog', 'def') == [3]
+
+
+def test_concepticon_snapshot(tmp_path):
+    # not an actual Concepticon clone, so this only works from the snapshot
+    clone = tmp_path / 'concepticon'
+    repo = git.Repo.init(clone)
+    repo.index.commit('initial')
+    cache_dir = tmp_path / 'cache'
+    save_snapshot(
+        cache_dir, 'concepticon', repo_commit(clone),
+        [['1277', 'HAND', 'The hand.'], ['1301', 'FOOT', 'The foot.']])
+
+    assert read_concepticon_conceptsets(clone, cache_dir) == [
+        ConceptSet('1277', 'HAND', 'The hand.'),
+        ConceptSet('1301', 'FOOT', 'The foot.'),
+    ]
+
+
+def test_glottolog_snapshot(tmp_path):
+    clone = tmp_path / 'glottolog'
+    repo = git.Repo.init(clone)
+    repo.index.commit('initial')
+    cache_dir = tmp_path / 'cache'
+    save_snapshot(cache_dir, 'glottolog', repo_commit(clone), {
+        'abcd1234': [
+            'abcd1234', 'abc', 'Abc', 1.5, 2.5, 'Papunesia',
+            'fami1234', 'Family'],
+    })
+
+    # only unknown glottocodes would be looked up in the clone itself
+    assert read_glottolog_languoids(clone, cache_dir, ['abcd1234']) == {
+        'abcd1234': Languoid(
+            'abcd1234', 'abc', 'Abc', 1.5, 2.5, 'Papunesia',
+            'fami1234', 'Family'),
+    }
+
+
+def test_glottolog_languoids(tmp_path):
+    clone = glottolog_clone(tmp_path / 'glottolog', [
+        ('fami1234', '[core]\nname = Family\nlevel = family\n'),
+        ('fami1234/abcd1234', (
+            '[core]\nname = Abc\nlevel = language\niso639-3 = abc\n'
+            'latitude = 1.5\nlongitude = 2.5\nmacroareas =\n\tPapunesia\n')),
+        ('isol1234', '[core]\nname = Isolate\nlevel = language\n'),
+    ])
+    cache_dir = tmp_path / 'cache'
+    expected = {
+        'abcd1234': Languoid(
+            'abcd1234', 'abc', 'Abc', 1.5, 2.5, 'Papunesia',
+            'fami1234', 'Family'),
+        'isol1234': Languoid(
+            'isol1234', None, 'Isolate', None, None, None, None, None),
+        'fami1234': Languoid(
+            'fami1234', None, 'Family', None, None, None,
+            'fami1234', 'Family'),
+    }
+    assert read_glottolog_languoids(
+        clone, cache_dir, ['abcd1234', 'isol1234', 'fami1234', 'none1234']) == expected
+    assert load_snapshot(cache_dir, 'glottolog', repo_commit(clone)) == {
+        glottocode: list(languoid) for glottocode, languoid in expected.items()}
+
+    # the snapshot is used even after the tree is gone
+    clone.joinpath('languoids', 'tree', 'isol1234', 'md.ini').unlink()
+    assert read_glottolog_languoids(clone, cache_dir, ['isol1234']) == {
+        'isol1234': expected['isol1234']}
+
+
+def test_load_families(pg_db, tmp_path):
+    clone = glottolog_clone(tmp_path / 'glottolog', [
+        ('fami1234', '[core]\nname = Family\nlevel = family\n'),
+        ('fami1234/abcd1234', (
+            '[core]\nname = Abc\nlevel = language\niso639-3 = abc\n'
+            'latitude = 1.5\nlongitude = 2.5\nmacroareas =\n\tPapunesia\n')),
+        ('fami1234/efgh1234', '[core]\nname = Efg\nlevel = language\n'),
+        ('othe1234', '[core]\nname = Other\nlevel = family\n'),
+        ('othe1234/ijkl1234', '[core]\nname = Ijk\nlevel = language\n'),
+        ('isol1234', '[core]\nname = Isolate\nlevel = language\n'),
+    ])
+    cache_dir = tmp_path / 'cache'
+
+    abc = Variety(id='abcd1234', name='Abc (dictionary)')
+    isolate = Variety(id='isol1234')
+    DBSession.add_all([abc, isolate])
+    load_families(Data(), [abc, isolate], clone, cache_dir)
+    DBSession.flush()
+    assert (abc.name, abc.latitude, abc.longitude, abc.macroarea) == (
+        'Abc (dictionary)', 1.5, 2.5, 'Papunesia')
+    assert abc.iso_code == 'abc'
+    assert abc.family.id == 'fami1234'
+    assert (isolate.name, isolate.family) == ('Isolate', None)
+
+    # later imports reuse families and don't hand out their icons again
+    efg = Variety(id='efgh1234')
+    ijk = Variety(id='ijkl1234')
+    DBSession.add_all([efg, ijk])
+    load_families(Data(), [efg, ijk], clone, cache_dir)
+    DBSession.flush()
+    assert efg.family is abc.family
+    assert ijk.family.id == 'othe1234'
+    assert ijk.family.jsondata['icon'] != abc.family.jsondata['icon']
+    assert DBSession.query(Family).count() == 2
+
+    with pytest.raises(KeyError):
+        load_families(Data(), [Variety(id='none1234')], clone, cache_dir)
+    load_families(Data(), [Variety(id='none1234')], clone, cache_dir, strict=False)
@@ -0,0 +1,79 @@
+import pathlib
+
+import pytest
+from pycldf import Dictionary
+
+from dictionaria.lib.cldf import parse_submission, read_table
+from dictionaria.lib.synthetic import SyntheticDictionary
+
+pytest.importorskip('pyarrow')
+
+TEOP = pathlib.Path(__file__).parent / 'data' / 'teop'
+
+from dictionaria.lib.columnar import read_table_columnar  # noqa: E402
+
+
+def test_read_table_columnar(tmp_path):
+    ds = Dictionary.in_dir(tmp_path)
+    ds.add_columns(
+        'EntryTable',
+        {'name': 'Variants', 'separator': ' ; '},
+        {'name': 'Frequency', 'datatype': 'integer'},
+        'Etymology')
+    ds.write(EntryTable=[
+        dict(
+            ID='e1', Language_ID='abcd1234', Headword='word',
+            Variants=['a', 'b'], Frequency=3,
+            Etymology='from "old"\nword, probably'),
+        dict(
+            ID='e2', Language_ID='abcd1234', Headword='other',
+            Variants=[], Frequency=None, Etymology=''),
+    ])
+
+    rows = list(read_table(ds, 'EntryTable', {'Etymology': 'Etym'}))
+    assert rows[0]['Etym'] == 'from "old"\nword, probably'
+    assert rows[0]['Variants'] == ['a', 'b']
+    assert 'Variants' not in rows[1]
+    assert list(read_table_columnar(ds, 'EntryTable', {'Etymology': 'Etym'})) == rows
+    assert list(read_table_columnar(ds, 'ExampleTable', {})) == []
+
+
+def test_null_and_default(tmp_path):
+    ds = Dictionary.in_dir(tmp_path)
+    ds.add_columns(
+        'EntryTable',
+        {'name': 'Variants', 'separator': ' ; ', 'null': ['?']},
+        {'name': 'Status', 'null': ['-', 'n/a']},
+        {'name': 'Register', 'default': 'neutral'},
+        {'name': 'Tags', 'separator': ',', 'default': 'none', 'null': ['x']})
+    ds.write(EntryTable=[
+        dict(ID='e1', Language_ID='abcd1234', Headword='a'),
+        dict(ID='e2', Language_ID='abcd1234', Headword='b'),
+        dict(ID='e3', Language_ID='abcd1234', Headword='c'),
+    ])
+    entries = tmp_path / 'entries.csv'
+    entries.write_text(
+        'ID,Language_ID,Headword,Part_Of_Speech,Variants,Status,Register,Tags\n'
+        'e1,abcd1234,a,,,,,\n'
+        'e2,abcd1234,b,,?,n/a,formal,x\n'
+        'e3,abcd1234,c,,u ; ? ; v,draft,,"t,,x"\n',
+        encoding='utf-8')
+
+    rows = list(read_table(ds, 'EntryTable', {}))
+    assert 'Variants' not in rows[0] and 'Variants' not in rows[1]
+    assert 'Status' not in rows[1] and rows[2]['Status'] == 'draft'
+    assert rows[0]['Register'] == 'neutral' and rows[1]['Register'] == 'formal'
+    assert rows[2]['Variants'] == ['u', None, 'v']
+    assert rows[2]['Tags'] == ['t', 'none', None]
+    assert list(read_table_columnar(ds, 'EntryTable', {})) == rows
+
+
+def test_arrow_reader(tmp_path):
+    SyntheticDictionary(sid='synth', entries=50).write(tmp_path / 'synth')
+    records = parse_submission('synth', tmp_path / 'synth').records
+    assert parse_submission('synth', tmp_path / 'synth', reader='arrow').records == records
+
+
+def test_arrow_reader_submission():
+    records = parse_submission('teop', TEOP).records
+    assert parse_submission('teop', TEOP, reader='arrow').records == records
@@ -0,0 +1,221 @@
+import io
+import json
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import git
+import pytest
+from conftest import import_args
+
+from dictionaria.scripts import initializedb
+from dictionaria.scripts.initializedb import download_datasets, download_submissions
+
+
+@pytest.fixture
+def work_repo(tmp_path):
+    work = git.Repo.init(tmp_path / 'work')
+    work.git.checkout('-b', 'main')
+    tmp_path.joinpath('work', 'cldf').mkdir()
+    tmp_path.joinpath('work', 'cldf', 'README').write_text('v1', encoding='utf-8')
+    work.index.add(['cldf/README'])
+    work.index.commit('v1')
+    work.git.clone('--bare', work.working_dir, str(tmp_path / 'origin.git'))
+    work.create_remote('origin', str(tmp_path / 'origin.git'))
+    return work
+
+
+def zip_archive(content):
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, 'w') as zipf:
+        zipf.writestr('dictionary-v1.0/cldf/README', content)
+    return data.getvalue()
+
+
+class ZenodoHandler(BaseHTTPRequestHandler):
+    """Stand-in for the DOI resolver and Zenodo.
+
+    DOIs of records resolve to the records' pages, whose meta data comes from
+    the API.  Downloading the archive of record 2 takes ages.
+    """
+
+    def record(self, recid):
+        base = f'http://{self.headers["Host"]}'
+        return {
+            'doi': f'10.5281/zenodo.{recid}',
+            'metadata': {
+                'title': 'A dictionary',
+                'access_right': 'open',
+                'creators': [{'name': 'Doe, Jane'}],
+                'publication_date': '2020-01-01',
+            },
+            'files': [
+                {'links': {'self': f'{base}/api/records/{recid}/files/README.md/content'}},
+                {'links': {
+                    'self': f'{base}/api/records/{recid}/files/dictionary-v1.0.zip/content'}},
+            ],
+        }
+
+    def respond(self, body, content_type='application/octet-stream'):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requested.append(self.path)
+        path = self.path.split('/')[1:]
+        if path[:2] == ['10.5281', 'zenodo.1'] or path[:2] == ['10.5281', 'zenodo.2']:
+            self.send_response(302)
+            self.send_header('Location', f'/records/{path[1].split(".")[1]}')
+            self.end_headers()
+        elif path[0] == 'records' and len(path) == 2:
+            self.respond(b'<html></html>', 'text/html')
+        elif path[:2] == ['api', 'records']:
+            self.respond(
+                json.dumps(self.record(path[2])).encode('utf-8'),
+                'application/json')
+        elif path[0] == 'records' and path[-1] == 'dictionary-v1.0.zip':
+            if path[1] == '2':
+                time.sleep(2)
+            self.respond(zip_archive(f'zenodo {path[1]}'))
+        else:
+            self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def doi_resolver(monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ZenodoHandler)
+    server.daemon_threads = True
+    server.requested = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        initializedb, 'DOI_RESOLVER', f'http://127.0.0.1:{server.server_port}')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fake_zenodo():
+    requested = []
+
+    def fetch_archive(url, path, timeout=None):
+        requested.append(url)
+        with zipfile.ZipFile(path, 'w') as zipf:
+            zipf.writestr('dictionary-v1.0/cldf/README', 'zenodo')
+
+    fetch_archive.requested = requested
+    return fetch_archive
+
+
+def test_download_submissions(tmp_path, work_repo, fake_zenodo):
+    cache_dir = tmp_path / 'datasets'
+    cache_dir.mkdir()
+    cache_dir.joinpath('local', 'cldf').mkdir(parents=True)
+    submission_info = {
+        'fromgit': {'repo': str(tmp_path / 'origin.git')},
+        'fromzenodo': {'doi': '10.5281/zenodo.1234'},
+        'local': {},
+    }
+
+    data_dirs, errors = download_submissions(
+        submission_info, cache_dir, fetch_archive=fake_zenodo)
+
+    assert not errors
+    assert list(data_dirs) == ['fromgit', 'fromzenodo', 'local']
+    assert data_dirs['fromgit'].joinpath('cldf', 'README').read_text() == 'v1'
+    assert data_dirs['fromzenodo'].name == 'fromzenodo-105281zenodo1234.zip'
+    with zipfile.ZipFile(data_dirs['fromzenodo']) as zipf:
+        assert zipf.read('dictionary-v1.0/cldf/README') == b'zenodo'
+    assert fake_zenodo.requested == ['https://doi.org/10.5281/zenodo.1234']
+
+    # re-running the download picks up new commits but doesn't re-download
+    # data from zenodo
+    tmp_path.joinpath('work', 'cldf', 'README').write_text('v2', encoding='utf-8')
+    work_repo.index.add(['cldf/README'])
+    work_repo.index.commit('v2')
+    work_repo.remotes.origin.push('main')
+
+    data_dirs, errors = download_submissions(
+        submission_info, cache_dir, fetch_archive=fake_zenodo)
+    assert not errors
+    assert data_dirs['fromgit'].joinpath('cldf', 'README').read_text() == 'v2'
+    assert len(fake_zenodo.requested) == 1
+
+
+def test_download_failures_are_reported_per_dictionary(tmp_path, fake_zenodo):
+    cache_dir = tmp_path / 'datasets'
+    cache_dir.mkdir()
+    attempts = []
+
+    def flaky_fetch(url, path, timeout=None):
+        attempts.append(url)
+        if len(attempts) == 1:
+            path.write_bytes(b'PK')
+            raise OSError('connection reset')
+        fake_zenodo(url, path)
+
+    data_dirs, errors = download_submissions(
+        {
+            'missing': {'repo': str(tmp_path / 'does-not-exist.git')},
+            'flaky': {'doi': '10.5281/zenodo.1234'},
+        },
+        cache_dir,
+        workers=2,
+        retries=1,
+        fetch_archive=flaky_fetch)
+
+    assert list(data_dirs) == ['flaky']
+    assert len(attempts) == 2
+    assert list(errors) == ['missing']
+    assert isinstance(errors['missing'], git.exc.GitCommandError)
+    assert not cache_dir.joinpath('missing').exists()
+
+
+def test_zenodo_download(tmp_path, doi_resolver):
+    cache_dir = tmp_path / 'datasets'
+    cache_dir.mkdir()
+
+    start = time.monotonic()
+    data_dirs, errors = download_submissions(
+        {
+            'fast': {'doi': '10.5281/zenodo.1'},
+            'slow': {'doi': '10.5281/zenodo.2'},
+            'unknown': {'doi': '10.5281/zenodo.3'},
+        },
+        cache_dir,
+        timeout=0.5,
+        retries=1)
+    # the slow download got half a second for both attempts
+    assert time.monotonic() - start < 1.5
+
+    assert list(data_dirs) == ['fast']
+    with zipfile.ZipFile(data_dirs['fast']) as zipf:
+        assert zipf.read('dictionary-v1.0/cldf/README') == b'zenodo 1'
+    assert '/records/1/files/dictionary-v1.0.zip' in doi_resolver.requested
+    assert isinstance(errors['slow'], TimeoutError)
+    assert doi_resolver.requested.count('/records/2/files/dictionary-v1.0.zip') == 1
+    assert errors['unknown'].code == 404
+    assert sorted(path.name for path in cache_dir.iterdir()) == [
+        'fast-105281zenodo1.zip']
+
+
+def test_download_datasets(tmp_path, monkeypatch, doi_resolver):
+    monkeypatch.setattr(initializedb, 'INTERNAL_REPO', tmp_path)
+    tmp_path.joinpath('datasets').mkdir()
+
+    # failed downloads don't keep the others from being imported
+    data_dirs = download_datasets(
+        import_args(download_retries='0'),
+        {
+            'fast': {'doi': '10.5281/zenodo.1'},
+            'unknown': {'doi': '10.5281/zenodo.3'},
+        })
+    assert list(data_dirs) == ['fast']
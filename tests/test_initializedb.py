@@ -0,0 +1,185 @@
+import pytest
+import sqlalchemy
+import transaction
+from clld.db.meta import Base, DBSession
+from conftest import Request, load_dictionaries, snapshot
+
+from dictionaria.lib.cldf import (
+    FTS_STAGING, parse_submission, submission_fingerprint,
+)
+from dictionaria.lib.synthetic import SyntheticDictionary
+from dictionaria.models import Dictionary, Word
+from dictionaria.scripts.initializedb import (
+    changed_submissions, dictionary_fingerprint, parse_submissions,
+    reload_submission,
+)
+
+
+def synthetic_submissions(path, *sids, entries=40):
+    for seed, sid in enumerate(sids, 1):
+        SyntheticDictionary(sid=sid, entries=entries, seed=seed).write(path / sid)
+    return {sid: parse_submission(sid, path / sid) for sid in sids}
+
+
+def fresh_snapshot(engine, submissions, **settings):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with transaction.manager:
+        assert not load_dictionaries(submissions, **settings)
+    with transaction.manager:
+        return snapshot()
+
+
+def test_parse_processes(tmp_path):
+    synthetic_submissions(tmp_path, 'one', 'two')
+    data_dirs = {sid: tmp_path / sid for sid in ('one', 'two')}
+    expected = parse_submissions(data_dirs, processes=1)
+    # submissions parsed in worker processes come back pickled
+    submissions = parse_submissions(data_dirs, processes=2)
+    assert list(submissions) == ['one', 'two']
+    for sid, submission in submissions.items():
+        assert submission.cldf is None
+        assert expected[sid].cldf is not None
+        state = submission.__getstate__()
+        expected_state = expected[sid].__getstate__()
+        del state['phases'], expected_state['phases']
+        assert state == expected_state
+
+
+def test_load_processes(pg_db, tmp_path):
+    submissions = synthetic_submissions(tmp_path, 'one', 'two')
+    with transaction.manager:
+        assert not load_dictionaries(submissions, load_processes=2)
+    with transaction.manager:
+        rows = snapshot()
+        assert all(
+            d.jsondata['fingerprint']
+            == dictionary_fingerprint(submissions[d.id].fingerprint, {})
+            for d in DBSession.query(Dictionary))
+
+    assert fresh_snapshot(pg_db, submissions) == rows
+
+
+@pytest.mark.parametrize('checkpoint', ['false', 'true'])
+def test_failing_dictionary(pg_db, tmp_path, monkeypatch, checkpoint):
+    submissions = synthetic_submissions(tmp_path, 'one', 'bad', 'two')
+    add_to_database = submissions['bad'].add_to_database
+
+    def fail(*args, **kwargs):
+        add_to_database(*args, **kwargs)
+        raise ValueError('invalid submission')
+
+    # all of the dictionary is written before the import fails
+    monkeypatch.setattr(submissions['bad'], 'add_to_database', fail)
+    with transaction.manager:
+        failed = load_dictionaries(
+            submissions, checkpoint=checkpoint, chunk_size='25')
+    assert list(failed) == ['bad']
+    with transaction.manager:
+        rows = snapshot()
+        assert {
+            d.id: d.jsondata['fingerprint'] for d in DBSession.query(Dictionary)
+        } == {
+            sid: dictionary_fingerprint(submissions[sid].fingerprint, {})
+            for sid in ['one', 'two']}
+        fingerprints = {
+            sid: submission.fingerprint for sid, submission in submissions.items()}
+        submission_info = {sid: {} for sid in submissions}
+        assert changed_submissions(
+            fingerprints, submission_info, DBSession.query(Dictionary),
+        ) == {'bad': fingerprints['bad']}
+
+    # so reloading all dictionaries picks it up
+    with transaction.manager:
+        reload_submission(
+            parse_submission('bad', tmp_path / 'bad'), {}, Request())
+    with transaction.manager:
+        assert not changed_submissions(
+            fingerprints, submission_info, DBSession.query(Dictionary))
+
+    # the failed dictionary left nothing behind
+    del submissions['bad']
+    assert fresh_snapshot(pg_db, submissions) == rows
+
+
+def dictionary_rows(rows, sid):
+    """Return the rows referring to the dictionary `sid` (or its objects)."""
+    return {
+        table: [
+            row for row in table_rows
+            if any(
+                isinstance(value, str) and (value == sid or value.startswith(f'{sid}-'))
+                for value in row)]
+        for table, table_rows in rows.items()}
+
+
+def test_reload_submission(pg_db, tmp_path):
+    submissions = synthetic_submissions(tmp_path, 'one', 'two')
+    with transaction.manager:
+        assert not load_dictionaries(submissions)
+    with transaction.manager:
+        two = dictionary_rows(snapshot(), 'two')
+
+    SyntheticDictionary(sid='one', entries=25, seed=3).write(tmp_path / 'new')
+    submissions['one'] = parse_submission('one', tmp_path / 'new')
+    with transaction.manager:
+        reload_submission(submissions['one'], {}, Request())
+    with transaction.manager:
+        rows = snapshot()
+    assert dictionary_rows(rows, 'two') == two
+
+    # nothing of the old version is left over
+    fresh = fresh_snapshot(pg_db, submissions)
+    assert {table: len(table_rows) for table, table_rows in rows.items()} \
+        == {table: len(table_rows) for table, table_rows in fresh.items()}
+
+
+@pytest.mark.parametrize('load_processes', ['1', '2'])
+def test_deferred_fts(pg_db, tmp_path, load_processes):
+    submissions = synthetic_submissions(tmp_path, 'one', 'two')
+    with transaction.manager:
+        assert not load_dictionaries(
+            submissions, fts='deferred', load_processes=load_processes)
+    with transaction.manager:
+        rows = snapshot()
+        assert all(fts for fts, in DBSession.query(Word.fts))
+    # the staging table is gone, along with the text
+    assert not sqlalchemy.inspect(pg_db).has_table(FTS_STAGING.name)
+
+    with transaction.manager:
+        reload_submission(submissions['one'], {}, Request(), fts='deferred')
+    assert not sqlalchemy.inspect(pg_db).has_table(FTS_STAGING.name)
+    with transaction.manager:
+        assert {
+            table: len(table_rows) for table, table_rows in snapshot().items()
+        } == {table: len(table_rows) for table, table_rows in rows.items()}
+
+    assert fresh_snapshot(pg_db, submissions, fts='insert') == rows
+
+
+def test_changed_submissions(tmp_path):
+    SyntheticDictionary(sid='synth', entries=5).write(tmp_path / 'synth')
+    fingerprints = {'synth': submission_fingerprint(tmp_path / 'synth')}
+    sinfo = {
+        'doi': '10.5281/zenodo.1234',
+        'published': True,
+        'authors': ['Jane Roe'],
+        'series': 'Dictionaria',
+    }
+    dictionary = Dictionary(id='synth', jsondata={'fingerprint': dictionary_fingerprint(
+        fingerprints['synth'], sinfo)})
+    assert not changed_submissions(fingerprints, {'synth': sinfo}, [dictionary])
+    assert changed_submissions(fingerprints, {'synth': {}}, [dictionary]) == fingerprints
+    assert changed_submissions(
+        fingerprints, {'synth': dict(sinfo, doi='10.5281/zenodo.5678')}, [dictionary],
+    ) == fingerprints
+    assert changed_submissions(
+        fingerprints, {'synth': dict(sinfo, authors=['Jane Roe', 'John Doe'])}, [dictionary],
+    ) == fingerprints
+    assert changed_submissions(fingerprints, {'synth': sinfo}, []) == fingerprints
+
+    md = tmp_path / 'synth' / 'etc' / 'md.json'
+    md.write_text(md.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    fingerprints = {'synth': submission_fingerprint(tmp_path / 'synth')}
+    assert changed_submissions(
+        fingerprints, {'synth': sinfo}, [dictionary]) == fingerprints
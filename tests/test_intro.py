@@ -0,0 +1,71 @@
+from bs4 import BeautifulSoup
+
+from dictionaria.lib.intro import (
+    format_intro, intro_key, link_targets, load_cached_intro, parse_intro,
+    save_cached_intro,
+)
+
+INTRO = """\
+# Introduction
+
+The word [e2](entry) is borrowed, unlike [e1](entry) and [e1](entry).
+See [Doe2000](source) and [the web](https://example.org).
+
+## Sources
+
+Also [Roe1999](source), [e9](entry) and [e3](elsewhere).
+"""
+
+LINKS = {
+    'entry': {'e1': ['/units/dict-e1', 'ahiki'], 'e2': ['/units/dict-e2', 'bua']},
+    'source': {'Doe2000': ['/sources/dict-Doe2000', 'Doe 2000']},
+}
+
+
+def test_cached_intro(tmp_path):
+    path = tmp_path / 'cache' / 'dict.json'
+    key = intro_key('# Intro\n\nSee [e1](entry).')
+    assert key != intro_key('# Intro\n\nSee [e2](entry).')
+
+    assert load_cached_intro(path, key) is None
+    links = {'entry': {'e1': ['/unit/dict-e1', 'word']}, 'source': {}}
+    save_cached_intro(
+        path, key, {'entry': ['e1'], 'source': []}, links, '<h1>Intro</h1>',
+        '<ul></ul>')
+    cached = load_cached_intro(path, key)
+    assert cached['links'] == links
+    assert cached['targets'] == {'entry': ['e1'], 'source': []}
+    assert cached['description'] == '<h1>Intro</h1>'
+    assert load_cached_intro(path, intro_key('other')) is None
+
+    path.write_text('garbage', encoding='utf-8')
+    assert load_cached_intro(path, key) is None
+
+
+def test_link_targets():
+    assert link_targets(parse_intro(INTRO)) == {
+        'entry': ['e1', 'e2', 'e9'],
+        'source': ['Doe2000', 'Roe1999'],
+    }
+    assert link_targets(parse_intro('No links.')) == {'entry': [], 'source': []}
+
+
+def test_format_intro():
+    description, toc_ = format_intro(parse_intro(INTRO), LINKS)
+    links = [
+        (a['href'], a.get('class'), a.string)
+        for a in BeautifulSoup(description, 'html.parser').find_all('a', href=True)
+        if not a['href'].startswith('#')]
+    assert links == [
+        # entries are labelled with their headword
+        ('/units/dict-e2', ['lemma'], 'bua'),
+        ('/units/dict-e1', ['lemma'], 'ahiki'),
+        ('/units/dict-e1', ['lemma'], 'ahiki'),
+        ('/sources/dict-Doe2000', None, 'Doe 2000'),
+        ('https://example.org', None, 'the web'),
+        # links to unknown ids are left alone
+        ('source', None, 'Roe1999'),
+        ('entry', None, 'e9'),
+        ('elsewhere', None, 'e3'),
+    ]
+    assert 'Introduction' in toc_ and 'Sources' in toc_
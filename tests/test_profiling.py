@@ -0,0 +1,29 @@
+import json
+
+from dictionaria.lib.profiling import NO_PROFILER, ImportProfiler
+
+
+def test_import_profiler(tmp_path):
+    profiler = ImportProfiler()
+    with profiler.phase('make_things', 'dict1') as phase:
+        things = list(phase.count(str(i) * 1000 for i in range(10)))
+    assert len(things) == 10
+
+    child = profiler.child()
+    with child.phase('read_things', 'dict2') as phase:
+        phase.rows = 5
+    profiler.merge(child.phases)
+
+    profiler.write_report(tmp_path / 'report.json')
+    report = json.loads(tmp_path.joinpath('report.json').read_text())
+    assert [p['phase'] for p in report['phases']] == ['make_things', 'read_things']
+    assert [p['rows'] for p in report['phases']] == [10, 5]
+    assert report['phases'][0]['peak_memory'] > 10000
+    assert set(report['dictionaries']) == {'dict1', 'dict2'}
+
+
+def test_no_profiler():
+    objects = [1, 2, 3]
+    with NO_PROFILER.phase('make_things') as phase:
+        assert phase.count(objects) is objects
+    assert not NO_PROFILER.phases
@@ -0,0 +1,57 @@
+from sqlalchemy import create_engine, text
+
+from dictionaria.scripts.publish import (
+    BACKUP_SCHEMA, SHADOW_SCHEMA, create_schema, schema_url, swap_schemas,
+)
+
+
+def word(engine):
+    with engine.connect() as connection:
+        return connection.execute(text('SELECT name FROM word')).scalar()
+
+
+def test_swap_schemas(engine):
+    with engine.begin() as connection:
+        unaccent = connection.execute(text(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'unaccent'",
+        )).scalar()
+        if unaccent:
+            connection.execute(text('CREATE EXTENSION unaccent'))
+        connection.execute(text("CREATE TABLE word AS SELECT 'old' AS name"))
+        create_schema(connection, SHADOW_SCHEMA)
+
+    shadow = create_engine(schema_url(engine.url, SHADOW_SCHEMA))
+    with shadow.begin() as connection:
+        connection.execute(text("CREATE TABLE word AS SELECT 'new' AS name"))
+    shadow.dispose()
+    assert word(engine) == 'old'
+
+    with engine.begin() as connection:
+        swap_schemas(connection, SHADOW_SCHEMA)
+    assert word(engine) == 'new'
+    with engine.connect() as connection:
+        if unaccent:
+            assert connection.execute(
+                text("SELECT unaccent('é')")).scalar() == 'e'
+        assert connection.execute(
+            text(f'SELECT name FROM {BACKUP_SCHEMA}.word')).scalar() == 'old'
+
+    # rolling back swaps the old data in again
+    with engine.begin() as connection:
+        swap_schemas(connection, BACKUP_SCHEMA)
+    assert word(engine) == 'old'
+    with engine.connect() as connection:
+        assert connection.execute(
+            text(f'SELECT name FROM {BACKUP_SCHEMA}.word')).scalar() == 'new'
+
+
+def test_schema_url(engine):
+    url = engine.url.update_query_dict({'options': '-c statement_timeout=1234'})
+    assert schema_url(url, SHADOW_SCHEMA).query['options'] \
+        == f'-c statement_timeout=1234 -csearch_path={SHADOW_SCHEMA}'
+
+    shadow = create_engine(schema_url(url, SHADOW_SCHEMA))
+    with shadow.connect() as connection:
+        assert connection.execute(text('SHOW search_path')).scalar() == SHADOW_SCHEMA
+        assert connection.execute(text('SHOW statement_timeout')).scalar() == '1234ms'
+    shadow.dispose()
@@ -0,0 +1,59 @@
+from dictionaria.lib import cldf
+from dictionaria.lib.cldf import (
+    RECORD_CACHE_VERSION, load_cached_records, make_cldf_record,
+    parse_submission, records_cache_key, save_cached_records,
+    submission_fingerprint,
+)
+from dictionaria.lib.synthetic import SyntheticDictionary
+
+
+def test_records_cache_key(tmp_path):
+    tmp_path.joinpath('cldf').mkdir()
+    tmp_path.joinpath('etc').mkdir()
+    tmp_path.joinpath('cldf', 'entries.csv').write_text('ID\n1\n', encoding='utf-8')
+    tmp_path.joinpath('etc', 'md.json').write_text(
+        '{"entry_map": {"a": "b"}}', encoding='utf-8')
+    key = records_cache_key(submission_fingerprint(tmp_path))
+    assert key.startswith(f'{RECORD_CACHE_VERSION}-')
+
+    tmp_path.joinpath('etc', 'md.json').write_text(
+        '{"entry_map": {"a": "c"}}', encoding='utf-8')
+    assert key != records_cache_key(submission_fingerprint(tmp_path))
+    tmp_path.joinpath('etc', 'md.json').write_text(
+        '{"entry_map": {"a": "b"}}', encoding='utf-8')
+    assert key == records_cache_key(submission_fingerprint(tmp_path))
+
+    tmp_path.joinpath('cldf', 'entries.csv').write_text('ID\n2\n', encoding='utf-8')
+    assert key != records_cache_key(submission_fingerprint(tmp_path))
+
+
+def test_cached_records(tmp_path):
+    path = tmp_path / 'cache' / 'dict.pickle'
+    records = [make_cldf_record({'id': '1', 'extra': 'x'}, {'id'}, None)]
+
+    assert load_cached_records(path, 'key') is None
+    save_cached_records(path, 'key', records)
+    cached = load_cached_records(path, 'key')
+    assert cached == records
+    assert cached[0].std == {'id': '1'}
+    assert cached[0].free == {'extra': 'x'}
+    assert load_cached_records(path, 'other-key') is None
+
+    path.write_bytes(b'garbage')
+    assert load_cached_records(path, 'key') is None
+
+
+def test_fingerprint_is_computed_once(tmp_path, monkeypatch):
+    SyntheticDictionary(sid='synth', entries=5).write(tmp_path / 'synth')
+    fingerprint = submission_fingerprint(tmp_path / 'synth')
+
+    def fail(data_dir):
+        raise AssertionError('files hashed again')
+
+    monkeypatch.setattr(cldf, 'submission_fingerprint', fail)
+    submission = parse_submission(
+        'synth', tmp_path / 'synth', tmp_path / 'cache', fingerprint=fingerprint)
+    assert submission.fingerprint == fingerprint
+    assert load_cached_records(
+        tmp_path / 'cache' / 'synth.pickle', records_cache_key(fingerprint),
+    ) == submission.records
@@ -0,0 +1,42 @@
+from dictionaria.lib.cldf import column_order, make_cldf_records
+
+
+def test_make_cldf_records():
+    rows = [
+        {'id': '1', 'Dialect': 'north', 'headword': 'ka', 'Etymology': 'x'},
+        {'id': '2', 'headword': 'po', 'Etymology': 'y'},
+        {'id': '3', 'Dialect': 'south', 'headword': 'li', 'Etymology': 'z'},
+    ]
+    records = make_cldf_records(rows, {'id', 'headword'}, ['Etymology'])
+
+    assert all(record.schema is records[0].schema for record in records)
+    assert list(records[0].std.items()) == [('id', '1'), ('headword', 'ka')]
+    assert list(records[0].free.items()) == [
+        ('Etymology', 'x'), ('Dialect', 'north')]
+    assert records[1].free == {'Etymology': 'y'}
+    assert records[1].std['headword'] == 'po'
+    assert records[1].free.get('Dialect', '') == ''
+    assert 'Dialect' not in records[1].free
+    assert list(records[1].free) == ['Etymology']
+    assert 'Dialect' in records[2].free
+    assert records[0].std is records[0].std
+
+    assert records[0] == make_cldf_records(rows[:1], {'id', 'headword'}, ['Etymology'])[0]
+    assert records[0] != records[2]
+    assert records[0] != 'record'
+
+
+def test_column_order():
+    rows = [
+        {'id': '1', 'headword': 'ka', 'Note': 'n'},
+        {'id': '2', 'headword': 'po', 'Dialect': 'south', 'Note': 'n'},
+        {'id': '3', 'Usage': 'u', 'Note': 'n'},
+    ]
+    order = column_order([tuple(row) for row in rows])
+    assert sorted(order) == sorted({field for row in rows for field in row})
+    # Dialect and Usage never appear together, so their order doesn't matter
+    for row in rows:
+        assert sorted(row, key=order.index) == list(row)
+    records = make_cldf_records(rows, {'id', 'headword'}, None)
+    assert list(records[1].free.items()) == [('Dialect', 'south'), ('Note', 'n')]
+    assert list(records[2].free.items()) == [('Usage', 'u'), ('Note', 'n')]
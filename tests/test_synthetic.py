@@ -0,0 +1,92 @@
+import types
+
+from pycldf import Dataset
+
+from dictionaria.lib.cldf import (
+    HomonymCounter, SubmissionIndex, dry_run_submission, entry_chunk_records,
+    iter_chunks, make_entries, parse_submission,
+)
+from dictionaria.lib.profiling import ImportProfiler
+from dictionaria.lib.synthetic import SyntheticDictionary, media_id
+
+
+def test_synthetic_dictionary(tmp_path):
+    SyntheticDictionary(sid='synth', entries=100).write(tmp_path / 'synth')
+    cldf = Dataset.from_metadata(
+        tmp_path / 'synth' / 'cldf' / 'Dictionary-metadata.json')
+    assert cldf.validate()
+
+    submission = parse_submission('synth', tmp_path / 'synth')
+    records = submission.records
+    assert len(records.entries) == 100
+    assert len(records.senses) == 200
+    assert len(records.examples) == 100
+    assert set(records.media) == set(submission.cdstar)
+    assert submission.props['metalanguages'] == {'gxx': 'Spanish', 'gxy': 'French'}
+
+    index = SubmissionIndex(records)
+    assert index.entry_crossrefs
+    assert index.sense_crossrefs
+    assert any(index.entry_media.values())
+
+
+def test_chunked_entries(tmp_path):
+    SyntheticDictionary(sid='synth', entries=50).write(tmp_path / 'synth')
+    records = parse_submission('synth', tmp_path / 'synth').records
+    index = SubmissionIndex(records)
+    language = types.SimpleNamespace(pk=1)
+    dictionary = types.SimpleNamespace(pk=1, id='synth')
+
+    def entries(chunk, cldf_senses, cldf_examples, homonyms=None):
+        fts_texts = {}
+        words = make_entries(
+            chunk, cldf_senses, cldf_examples, index, language, dictionary,
+            ['Etymology'], ['Dialect'], {},
+            fts_texts=fts_texts, homonyms=homonyms)
+        return {
+            eid: (word.number, word.description, fts_texts[eid])
+            for eid, word in words.items()}
+
+    expected = entries(records.entries, records.senses, records.examples)
+    homonyms = HomonymCounter(e.std['headword'] for e in records.entries)
+    chunked = {}
+    for _, chunk in iter_chunks(records.entries, 7):
+        chunked.update(entries(
+            chunk,
+            *entry_chunk_records(chunk, records.examples, index),
+            homonyms=homonyms))
+    assert chunked == expected
+
+
+def test_dry_run(tmp_path):
+    SyntheticDictionary(sid='synth', entries=50).write(tmp_path / 'synth')
+    submission = parse_submission('synth', tmp_path / 'synth')
+    del submission.cdstar[media_id('entry5.wav')]
+    profiler = ImportProfiler(trace_memory=False)
+
+    missing = dry_run_submission(submission, chunk_size=20, profiler=profiler)
+    assert dict(missing.media) == {'Entry': {media_id('entry5.wav'): 1}}
+    assert not missing.entries
+    rows = {}
+    for phase in profiler.phases:
+        rows[phase.name] = rows.get(phase.name, 0) + (phase.rows or 0)
+    assert rows['make_entries'] == 50
+    assert rows['make_meanings'] == 100
+    assert rows['iter_entry_files'] == 9
+
+
+def test_synthetic_options(tmp_path):
+    SyntheticDictionary(
+        sid='synth', entries=30, media_every=0, crossref_every=0,
+        custom_fields=['Dialect', 'German'], metalanguages=['German'],
+    ).write(tmp_path / 'synth')
+    submission = parse_submission('synth', tmp_path / 'synth')
+    assert submission.props['metalanguages'] == {'gxx': 'German'}
+    assert submission.props['custom_fields'] == ['Dialect', 'lang-German']
+    assert not submission.cdstar and not submission.records.media
+    assert submission.records.senses[0].std['alt_translation1'] == 'german 1.1'
+    assert not any('alt_translation2' in s.std for s in submission.records.senses)
+
+    index = SubmissionIndex(submission.records)
+    assert not any(index.entry_crossrefs.values())
+    assert not any(index.sense_crossrefs.values())